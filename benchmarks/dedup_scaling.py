@@ -0,0 +1,89 @@
+"""
+Scaling benchmark for near-duplicate search in `dedupe_frames`.
+
+Compares the previous linear scan over every kept hash with the multi-index
+hash table on synthetic, clustered 64-bit perceptual hashes (a slowly drifting
+static camera with bursts of near-identical frames). A roughly flat `us/frame`
+column means the index scales linearly with the number of frames.
+
+    poetry run python benchmarks/dedup_scaling.py --sizes 1000,10000,100000,800000
+"""
+
+import random
+import time
+from typing import List
+import typer
+from pipeline.core.preprocess.hash_index import MultiIndexHashIndex, hamming
+
+
+def synthetic_hashes(n: int, seed: int = 0) -> List[int]:
+    """Timelapse-like hashes: scenes drift by a few bits, frames jitter around them."""
+    rng = random.Random(seed)
+    scene = rng.getrandbits(64)
+    hashes = []
+    for i in range(n):
+        if i % 50 == 0:
+            for _ in range(rng.randint(2, 10)):
+                scene ^= 1 << rng.randrange(64)
+        h = scene
+        for _ in range(rng.randint(0, 6)):
+            h ^= 1 << rng.randrange(64)
+        hashes.append(h)
+    return hashes
+
+
+def dedupe_linear(hashes: List[int], threshold: int) -> List[bool]:
+    seen: List[int] = []
+    keep = []
+    for h in hashes:
+        duplicate = any(hamming(h, s) <= threshold for s in seen)
+        if not duplicate:
+            seen.append(h)
+        keep.append(not duplicate)
+    return keep
+
+
+def dedupe_indexed(hashes: List[int], threshold: int) -> List[bool]:
+    index = MultiIndexHashIndex(64, threshold)
+    keep = []
+    for h in hashes:
+        duplicate = index.contains_within(h)
+        if not duplicate:
+            index.add(h)
+        keep.append(not duplicate)
+    return keep
+
+
+def main(
+    sizes: str = typer.Option("1000,5000,20000,100000,200000,400000,800000"),
+    threshold: int = typer.Option(5),
+    linear_limit: int = typer.Option(
+        20000, help="Skip the linear scan above this many frames."
+    ),
+):
+    typer.echo(
+        f"{'frames':>8} {'kept':>8} {'linear (s)':>12} {'indexed (s)':>12}"
+        f" {'us/frame':>10}"
+    )
+    for n in (int(s) for s in sizes.split(",")):
+        hashes = synthetic_hashes(n)
+
+        t0 = time.perf_counter()
+        keep = dedupe_indexed(hashes, threshold)
+        indexed_time = time.perf_counter() - t0
+
+        linear = "skipped"
+        if n <= linear_limit:
+            t0 = time.perf_counter()
+            expected = dedupe_linear(hashes, threshold)
+            linear = f"{time.perf_counter() - t0:.2f}"
+            assert keep == expected, "Index decisions differ from linear scan"
+
+        typer.echo(
+            f"{n:>8} {sum(keep):>8} {linear:>12} {indexed_time:>12.2f}"
+            f" {indexed_time / n * 1e6:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    typer.run(main)
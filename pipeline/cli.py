@@ -1,16 +1,30 @@
 import typer
 import logging
+from functools import partial
 from pathlib import Path
 import os
 
 from pipeline.validation.validator import validate_video, ValidationError
 from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.extract.parallel import extract_frames_parallel
+from pipeline.core.detect.cache import DETECTION_CACHE_NAME, DetectionCache
 from pipeline.core.detect.detector import run_detection_to_coco
-from pipeline.core.report.reporter import generate_report
+from pipeline.core.detect.sharded import run_sharded_detection_to_coco
+from pipeline.core.report.reporter import generate_batch_report, generate_report
+from pipeline.core.batch.scheduler import BatchSettings, discover_videos, run_batch
+from pipeline.core.preprocess.feature_cache import FEATURE_CACHE_NAME, FeatureCache
+from pipeline.core.preprocess.sweep import (
+    parse_grid,
+    run_threshold_sweep,
+    save_sweep_csv,
+)
 from pipeline.core.preprocess.runner import VideoPreprocessor as Preprocessor
-from pipeline.models.yolo import YOLOv8Runner
+from pipeline.core.stream.streamer import run_streaming_pipeline
+from pipeline.models.factory import build_model_runner
+from pipeline.models.onnx import ONNXRunner
 from pipeline.utils.helpers import load_config
-from pipeline.utils.paths import ensure_dir
+from pipeline.utils.image import parse_resolution
+from pipeline.utils.paths import ensure_dir, list_frames
 from pipeline.utils.paths import ensure_parent_dir
 from pipeline.core.report.comet_logger import CometLogger
 
@@ -33,17 +47,107 @@ def run(
         False, help="Run YOLOv8 pre-tagging and save COCO output."
     ),
     skip: int = typer.Option(1, help="Save every nth frame."),
+    every_seconds: float = typer.Option(
+        None, help="Save one frame every N seconds of video (overrides --skip)."
+    ),
+    max_frames: int = typer.Option(
+        None,
+        help="Save exactly this many frames, spread evenly (overrides --skip "
+        "and --every-seconds).",
+    ),
+    scene_threshold: float = typer.Option(
+        None,
+        help="Keep a sampled frame only if its mean thumbnail difference from "
+        "the last kept frame reaches this value (0-255).",
+    ),
+    max_gap: int = typer.Option(
+        None, help="With --scene-threshold, keep at least one frame every N frames."
+    ),
+    workers: int = typer.Option(
+        1, help="Number of processes decoding video segments in parallel."
+    ),
+    writer_threads: int = typer.Option(
+        4, help="Threads encoding and writing frames during extraction (0 = inline)."
+    ),
+    max_side: int = typer.Option(
+        None, help="Downscale extracted frames so their longest side fits."
+    ),
+    resolution: str = typer.Option(
+        None, help="Resize extracted frames to WIDTHxHEIGHT (overrides --max-side)."
+    ),
+    analysis_side: int = typer.Option(
+        None,
+        help="Longest side of the in-memory copy used for blur and hashing "
+        "in --stream mode.",
+    ),
+    resume: bool = typer.Option(
+        False,
+        help="Resume an interrupted extraction from its checkpoint manifest.",
+    ),
     blur_detection: bool = typer.Option(
         False, help="Remove blurry frames before deduplication."
     ),
     clean_threshold: float = typer.Option(
         100.0, help="Blurriness threshold for frame cleaning."
     ),
+    blur_reduction: int = typer.Option(
+        1,
+        help="Decode frames at 1/N size (1, 2, 4 or 8) for blur scoring; "
+        "tune --clean-threshold accordingly.",
+    ),
     dedup_detection: bool = typer.Option(False, help="Remove duplicate frames."),
     hash_size: int = typer.Option(8, help="Hash size for deduplication."),
     dedub_threshold: int = typer.Option(
         5, help="Hamming distance threshold for duplicates."
     ),
+    dedup_window: int = typer.Option(
+        None,
+        help="Compare each frame only against the last N kept frames "
+        "instead of all of them.",
+    ),
+    dedup_window_seconds: float = typer.Option(
+        None,
+        help="Compare each frame only against frames kept within the last "
+        "N seconds of video.",
+    ),
+    fused_preprocessing: bool = typer.Option(
+        False,
+        help="Decode each frame once for both blur detection and deduplication.",
+    ),
+    transfer: str = typer.Option(
+        "link",
+        help="How preprocessing hands frames on: link (hardlink, copy as "
+        "fallback), copy, or manifest (write a selection list, no files).",
+    ),
+    feature_cache: bool = typer.Option(
+        True,
+        help="Cache blur scores and hashes in <output>/feature_cache.sqlite so "
+        "reruns with other thresholds skip decoding (not used with --stream).",
+    ),
+    detection_cache: bool = typer.Option(
+        True,
+        help="Cache raw detections in <output>/detection_cache.sqlite so "
+        "reruns and confidence threshold changes skip inference (not used "
+        "with --stream).",
+    ),
+    detection_shards: int = typer.Option(
+        1,
+        help="Pre-tag with this many worker processes, each with its own model.",
+    ),
+    threads_per_shard: int = typer.Option(
+        None,
+        help="Cap on inference threads per shard (default: CPUs / shards).",
+    ),
+    hash_store: str = typer.Option(
+        None,
+        help="Directory of a persistent hash store; frames near frames kept "
+        "by earlier runs are dropped as duplicates.",
+    ),
+    hash_partition: str = typer.Option(
+        None,
+        help="Hash store partition, e.g. a camera or site id "
+        "(default: the video file name).",
+    ),
     report_dir: str = typer.Option(
         ..., "--reports_output", "-ro", help="Path to save Markdown report."
     ),
@@ -59,6 +163,11 @@ def run(
     dry_run: bool = typer.Option(
         False, help="Preview pipeline steps without executing."
     ),
+    stream: bool = typer.Option(
+        False,
+        help="Stream decoded frames through preprocessing and detection in memory, "
+        "writing only the surviving frames.",
+    ),
 ):
     """
     Run the full dataset generation pipeline step-by-step:
@@ -83,14 +192,56 @@ def run(
         typer.echo(f"Report Dir: {report_dir}")
         typer.echo(f"Pretag: {pretag}")
         typer.echo(f"Skip: {skip}")
+        typer.echo(f"Every Seconds: {every_seconds}")
+        typer.echo(f"Max Frames: {max_frames}")
+        typer.echo(f"Scene Threshold: {scene_threshold} (Max Gap: {max_gap})")
+        typer.echo(f"Workers: {workers}")
+        typer.echo(f"Writer Threads: {writer_threads}")
+        typer.echo(f"Resume: {resume}")
+        typer.echo(f"Max Side: {max_side}, Resolution: {resolution}")
         typer.echo(f"Blur Detection: {blur_detection} (Threshold: {clean_threshold})")
         typer.echo(
             f"Deduplication: {dedup_detection} (Hash Size: {hash_size}, Threshold: {dedub_threshold})"
         )
+        typer.echo(
+            f"Dedup Window: {dedup_window} frames, {dedup_window_seconds} seconds"
+        )
+        typer.echo(f"Fused Preprocessing: {fused_preprocessing}")
+        typer.echo(f"Transfer: {transfer}")
+        typer.echo(f"Feature Cache: {feature_cache}")
+        typer.echo(f"Detection Cache: {detection_cache}")
+        typer.echo(
+            f"Detection Shards: {detection_shards} (Threads: {threads_per_shard})"
+        )
+        typer.echo(f"Hash Store: {hash_store} (Partition: {hash_partition})")
+        typer.echo(f"Streaming: {stream}")
         typer.echo(f"Config Path: {config or 'default'}")
         typer.echo(f"Environment: {env}")
         raise typer.Exit()
 
+    if stream:
+        # The in-memory pass has no frame files, checkpoints or stage caches
+        unsupported = [
+            flag
+            for flag, used in (
+                ("--workers", workers > 1),
+                ("--resume", resume),
+                ("--blur-reduction", blur_reduction != 1),
+                ("--fused-preprocessing", fused_preprocessing),
+                ("--transfer", transfer != "link"),
+                ("--hash-store", hash_store is not None),
+                ("--detection-shards", detection_shards > 1),
+                ("--threads-per-shard", threads_per_shard is not None),
+            )
+            if used
+        ]
+        if unsupported:
+            typer.secho(
+                f"--stream cannot be combined with {', '.join(unsupported)}",
+                fg=typer.colors.RED,
+            )
+            raise typer.Exit(code=1)
+
     typer.secho("Starting dataset generation pipeline...", fg=typer.colors.BRIGHT_CYAN)
     comet_logger = CometLogger(
         project_name="protex-ai",
@@ -114,12 +265,22 @@ def run(
         {
             "config/video": video,
             "config/skip": str(skip),
+            "config/every_seconds": str(every_seconds),
+            "config/max_frames": str(max_frames),
+            "config/scene_threshold": str(scene_threshold),
+            "config/workers": str(workers),
             "config/blur_detection": str(blur_detection),
             "config/edup_detection": str(dedup_detection),
             "env": env,
         }
     )
 
+    try:
+        size = parse_resolution(resolution)
+    except ValueError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
     try:
         cap, metadata = validate_video(video)
     except ValidationError as e:
@@ -132,31 +293,6 @@ def run(
 
     timings = {}
 
-    # Frame extraction
-    typer.secho("\nExtracting frames...", fg=typer.colors.BRIGHT_CYAN)
-    extracted_count, extraction_time = extract_frames(cap, output_dir_path, skip)
-    cap.release()
-    typer.secho(
-        f"Saved {extracted_count} frames to {output_dir_path}", fg=typer.colors.GREEN
-    )
-    timings.update(extraction_time)
-
-    # Preprocessing
-    pre = Preprocessor(
-        enable_blur_detection=blur_detection,
-        enable_deduplication=dedup_detection,
-        blur_threshold=clean_threshold,
-        dedub_threshold=dedub_threshold,
-        hash_size=hash_size,
-    )
-    tag_input_dir = pre.run(input_dir=output_dir_path, output_dir=preprocessed_dir)
-    timings.update(pre.blur_detection_timing)
-    timings.update(pre.dedup_removal_timing)
-    typer.secho(
-        f"Preprocessing complete: {pre.cleaned} blurry frames removed, "
-        f"{pre.deduped} duplicate frames removed.",
-        fg=typer.colors.GREEN,
-    )
     # Load config
     if config:
         typer.secho(
@@ -169,22 +305,220 @@ def run(
         )
 
     cfg = load_config(config_path=config, env=env)
-    model_path = cfg.get("model", {}).get("path", "yolov8n.pt")
+    model_cfg = cfg.get("model", {})
     conf_threshold = cfg.get("model", {}).get("confidence_threshold", 0.25)
+    batch_size = cfg.get("model", {}).get("batch_size", 1)
+    prefetch_depth = cfg.get("model", {}).get("prefetch_depth", 0)
+    letterbox_size = cfg.get("model", {}).get("letterbox_size")
+    if stream and model_cfg.get("quantize") == "static":
+        # Static INT8 calibrates on preprocessed frame files, which --stream never writes
+        typer.secho(
+            "--stream cannot calibrate model.quantize: static; "
+            "use model.quantize: dynamic or run without --stream",
+            fg=typer.colors.RED,
+        )
+        raise typer.Exit(code=1)
+
+    ann_count = 0
+    cache_hits = 0
+    write_errors = 0
+    if stream:
+        # Extraction, preprocessing and pre-tagging in a single in-memory pass
+        typer.secho(
+            "\nStreaming frames through preprocessing...", fg=typer.colors.BRIGHT_CYAN
+        )
+        model = build_model_runner(model_cfg) if pretag else None
+        stats, stream_time = run_streaming_pipeline(
+            cap,
+            output_dir_path,
+            skip_frequency=skip,
+            every_seconds=every_seconds,
+            max_frames=max_frames,
+            max_side=max_side,
+            size=size,
+            analysis_side=analysis_side,
+            scene_threshold=scene_threshold,
+            max_gap=max_gap,
+            blur_threshold=clean_threshold if blur_detection else None,
+            dedup_threshold=dedub_threshold if dedup_detection else None,
+            hash_size=hash_size,
+            dedup_window=dedup_window,
+            dedup_window_seconds=dedup_window_seconds,
+            model=model,
+            coco_output_path=coco_output_path if pretag else None,
+            conf_threshold=conf_threshold,
+            batch_size=batch_size,
+        )
+        cap.release()
+        timings.update(stream_time)
+        extracted_count = stats.extracted
+        cleaned_count = stats.blurry
+        deduped_count = stats.duplicates
+        ann_count = stats.annotations
+        write_errors = stats.write_errors
+        typer.secho(
+            f"Decoded {extracted_count} frames: {cleaned_count} blurry and "
+            f"{deduped_count} duplicate frames removed, "
+            f"{stats.saved} saved to {output_dir_path}",
+            fg=typer.colors.GREEN,
+        )
+        if write_errors:
+            typer.secho(
+                f"{write_errors} frames could not be written",
+                fg=typer.colors.BRIGHT_YELLOW,
+            )
+        if pretag:
+            typer.secho(
+                f"Tagged {stats.images_tagged} images with {ann_count} annotations → {coco_output_path}",
+                fg=typer.colors.GREEN,
+            )
+    else:
+        # Frame extraction
+        typer.secho("\nExtracting frames...", fg=typer.colors.BRIGHT_CYAN)
+        if workers > 1:
+            cap.release()
+            extracted_count, write_errors, extraction_time = extract_frames_parallel(
+                video,
+                output_dir_path,
+                metadata,
+                workers,
+                skip,
+                every_seconds=every_seconds,
+                max_frames=max_frames,
+                resume=resume,
+                max_side=max_side,
+                size=size,
+                scene_threshold=scene_threshold,
+                max_gap=max_gap,
+                writer_threads=writer_threads,
+            )
+        else:
+            extracted_count, write_errors, extraction_time = extract_frames(
+                cap,
+                output_dir_path,
+                skip,
+                every_seconds=every_seconds,
+                max_frames=max_frames,
+                writer_threads=writer_threads,
+                resume=resume,
+                max_side=max_side,
+                size=size,
+                scene_threshold=scene_threshold,
+                max_gap=max_gap,
+            )
+            cap.release()
+        typer.secho(
+            f"Saved {extracted_count} frames to {output_dir_path}",
+            fg=typer.colors.GREEN,
+        )
+        if write_errors:
+            typer.secho(
+                f"{write_errors} frames could not be written",
+                fg=typer.colors.BRIGHT_YELLOW,
+            )
+        timings.update(extraction_time)
 
-    # Pre-tagging (optional)
-    if pretag:
-        typer.secho("\nRunning YOLOv8 pre-tagging...", fg=typer.colors.BRIGHT_CYAN)
-        model = YOLOv8Runner(model_path)
-        img_count, ann_count, detection_time = run_detection_to_coco(
-            model, tag_input_dir, coco_output_path, conf_threshold
+        # Preprocessing
+        pre = Preprocessor(
+            enable_blur_detection=blur_detection,
+            enable_deduplication=dedup_detection,
+            blur_threshold=clean_threshold,
+            dedub_threshold=dedub_threshold,
+            hash_size=hash_size,
+            blur_reduction=blur_reduction,
+            dedup_window=dedup_window,
+            dedup_window_seconds=dedup_window_seconds,
+            fps=metadata["fps"],
+            fused=fused_preprocessing,
+            transfer=transfer,
+            feature_cache=(
+                output_dir_path / FEATURE_CACHE_NAME if feature_cache else None
+            ),
+            hash_store=Path(hash_store) if hash_store else None,
+            hash_partition=hash_partition or Path(video).stem,
+            hash_source=str(Path(video).resolve()),
         )
-        timings.update(detection_time)
+        tag_input_dir = pre.run(input_dir=output_dir_path, output_dir=preprocessed_dir)
+        timings.update(pre.blur_detection_timing)
+        timings.update(pre.dedup_removal_timing)
+        cleaned_count = pre.cleaned
+        deduped_count = pre.deduped
         typer.secho(
-            f"Tagged {img_count} images with {ann_count} annotations → {coco_output_path}",
+            f"Preprocessing complete: {cleaned_count} blurry frames removed, "
+            f"{deduped_count} duplicate frames removed.",
             fg=typer.colors.GREEN,
         )
 
+        # Pre-tagging (optional)
+        if pretag:
+            typer.secho("\nRunning YOLOv8 pre-tagging...", fg=typer.colors.BRIGHT_CYAN)
+            model = None
+            if detection_shards <= 1 or model_cfg.get("backend") == "onnx":
+                # With shards, the ONNX export and quantization happen here
+                # once instead of concurrently in every worker
+                model = build_model_runner(
+                    model_cfg, calibration_frames=list_frames(Path(tag_input_dir))
+                )
+                report = getattr(model, "quantization_report", None)
+                if report:
+                    typer.secho(
+                        f"INT8 ({report['mode']}) vs FP32 on {report['images']} frames: "
+                        f"precision {report['precision']:.3f}, recall {report['recall']:.3f}, "
+                        f"{report['speedup']:.2f}x faster",
+                        fg=typer.colors.BRIGHT_YELLOW,
+                    )
+            det_cache = (
+                DetectionCache(output_dir_path / DETECTION_CACHE_NAME)
+                if detection_cache
+                else None
+            )
+            try:
+                if detection_shards > 1:
+                    shard_cfg = model_cfg
+                    if isinstance(model, ONNXRunner):
+                        shard_cfg = {
+                            **model_cfg,
+                            "path": str(model.model_path),
+                            "quantize": None,
+                        }
+                    img_count, ann_count, cache_hits, detection_time = (
+                        run_sharded_detection_to_coco(
+                            partial(build_model_runner, shard_cfg),
+                            tag_input_dir,
+                            coco_output_path,
+                            conf_threshold,
+                            shards=detection_shards,
+                            threads_per_shard=threads_per_shard,
+                            batch_size=batch_size,
+                            prefetch_depth=prefetch_depth,
+                            letterbox_size=letterbox_size,
+                            cache=det_cache,
+                        )
+                    )
+                else:
+                    img_count, ann_count, cache_hits, detection_time = (
+                        run_detection_to_coco(
+                            model,
+                            tag_input_dir,
+                            coco_output_path,
+                            conf_threshold,
+                            batch_size=batch_size,
+                            prefetch_depth=prefetch_depth,
+                            letterbox_size=letterbox_size,
+                            cache=det_cache,
+                        )
+                    )
+            finally:
+                if det_cache is not None:
+                    det_cache.close()
+            timings.update(detection_time)
+            typer.secho(
+                f"Tagged {img_count} images with {ann_count} annotations → {coco_output_path}",
+                fg=typer.colors.GREEN,
+            )
+            if det_cache is not None:
+                typer.echo(f"Reused cached detections for {cache_hits} images")
+
     # Generate report
     typer.secho("\nGenerating report...", fg=typer.colors.BRIGHT_CYAN)
     generate_report(
@@ -194,8 +528,9 @@ def run(
         coco_path=coco_output_path,
         out_path=f"{report_path}/report_sample.md",
         timings=timings,
-        cleaned_frames=pre.cleaned,
-        deduped_frames=pre.deduped,
+        cleaned_frames=cleaned_count,
+        deduped_frames=deduped_count,
+        write_errors=write_errors,
         comet_logger=comet_logger,
     )
     typer.secho(f"✅ Report saved to {report_path}", fg=typer.colors.GREEN)
@@ -203,9 +538,11 @@ def run(
     comet_logger.log_metrics(
         {
             "frames/frames_extracted": extracted_count,
-            "frames/blurry_removed": pre.cleaned,
-            "frames/duplicates_removed": pre.deduped,
-            "detection/total_detections": ann_count if pretag else 0,
+            "frames/write_errors": write_errors,
+            "frames/blurry_removed": cleaned_count,
+            "frames/duplicates_removed": deduped_count,
+            "detection/total_detections": ann_count,
+            "detection/cache_hits": cache_hits,
             **{f"timing/{k}": v for k, v in timings.items()},
         }
     )
@@ -214,5 +551,201 @@ def run(
     typer.secho("Pipeline completed successfully!", fg=typer.colors.GREEN)
 
 
+@app.command()
+def batch(
+    videos: str = typer.Option(
+        ...,
+        "--videos",
+        help="Directory of videos, or a manifest file with one video path per line.",
+    ),
+    output_root: str = typer.Option(
+        ..., "--output", "-o", help="Root directory for per-video outputs."
+    ),
+    workers: int = typer.Option(2, help="Number of videos processed in parallel."),
+    threads_per_worker: int = typer.Option(
+        None, help="Cap on OpenCV/torch threads in each worker process."
+    ),
+    pretag: bool = typer.Option(
+        False, help="Run YOLOv8 pre-tagging and save COCO output."
+    ),
+    skip: int = typer.Option(1, help="Save every nth frame."),
+    writer_threads: int = typer.Option(
+        4, help="Threads encoding and writing frames during extraction (0 = inline)."
+    ),
+    resume: bool = typer.Option(
+        False, help="Resume interrupted extractions from their checkpoint manifests."
+    ),
+    blur_detection: bool = typer.Option(
+        False, help="Remove blurry frames before deduplication."
+    ),
+    clean_threshold: float = typer.Option(
+        100.0, help="Blurriness threshold for frame cleaning."
+    ),
+    dedup_detection: bool = typer.Option(False, help="Remove duplicate frames."),
+    hash_size: int = typer.Option(8, help="Hash size for deduplication."),
+    dedub_threshold: int = typer.Option(
+        5, help="Hamming distance threshold for duplicates."
+    ),
+    detection_cache: bool = typer.Option(
+        True,
+        help="Cache raw detections in each video's output directory so "
+        "reruns skip inference.",
+    ),
+    config: str = typer.Option(None, help="Path to detection model config YAML file."),
+    env: str = typer.Option("dev", help="Environment to use (dev/test/prod)"),
+):
+    """
+    Run the pipeline over many videos on a pool of worker processes.
+
+    Each video gets its own output namespace (<output>/<video name>/) with
+    frames, COCO annotations and a report; an aggregated batch_report.md is
+    written to the output root. Each worker loads the model only once.
+    """
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s:%(message)s", level=logging.INFO
+    )
+    source = Path(videos)
+    if not source.exists():
+        typer.secho(f"Video source does not exist: {videos}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    video_paths = discover_videos(source)
+    if not video_paths:
+        typer.secho(f"No videos found in {videos}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    cfg = load_config(config_path=config, env=env)
+    model_cfg = cfg.get("model", {})
+    conf_threshold = cfg.get("model", {}).get("confidence_threshold", 0.25)
+    batch_size = cfg.get("model", {}).get("batch_size", 1)
+    prefetch_depth = cfg.get("model", {}).get("prefetch_depth", 0)
+    letterbox_size = cfg.get("model", {}).get("letterbox_size")
+
+    settings = BatchSettings(
+        pretag=pretag,
+        skip_frequency=skip,
+        writer_threads=writer_threads,
+        blur_detection=blur_detection,
+        clean_threshold=clean_threshold,
+        dedup_detection=dedup_detection,
+        hash_size=hash_size,
+        dedub_threshold=dedub_threshold,
+        conf_threshold=conf_threshold,
+        batch_size=batch_size,
+        prefetch_depth=prefetch_depth,
+        letterbox_size=letterbox_size,
+        detection_cache=detection_cache,
+        resume=resume,
+    )
+
+    typer.secho(
+        f"Processing {len(video_paths)} videos on {workers} workers...",
+        fg=typer.colors.BRIGHT_CYAN,
+    )
+    output_root_path = ensure_dir(Path(output_root))
+    results, batch_time = run_batch(
+        video_paths,
+        output_root_path,
+        settings,
+        workers=workers,
+        model_config=model_cfg,
+        threads_per_worker=threads_per_worker,
+    )
+
+    report_path = output_root_path / "batch_report.md"
+    generate_batch_report(results, out_path=str(report_path), timings=batch_time)
+
+    failed = [r for r in results if r["status"] != "ok"]
+    for r in failed:
+        typer.secho(f"❌ {r['video']}: {r['error']}", fg=typer.colors.RED)
+    typer.secho(
+        f"✅ {len(results) - len(failed)}/{len(results)} videos processed. "
+        f"Report saved to {report_path}",
+        fg=typer.colors.GREEN,
+    )
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def sweep(
+    frames_dir: str = typer.Option(
+        ..., "--frames", "-f", help="Directory of extracted frames."
+    ),
+    clean_thresholds: str = typer.Option(
+        "50,100,150,200",
+        help="Blur thresholds to evaluate: comma-separated or start:stop:step.",
+    ),
+    dedub_thresholds: str = typer.Option(
+        "0,2,5,8,10",
+        help="Hamming distance thresholds: comma-separated or start:stop:step.",
+    ),
+    hash_size: int = typer.Option(8, help="Hash size for deduplication."),
+    blur_reduction: int = typer.Option(
+        1, help="Decode frames at 1/N size (1, 2, 4 or 8) for blur scoring."
+    ),
+    workers: int = typer.Option(None, help="Threads used to analyze frames."),
+    feature_cache: bool = typer.Option(
+        True,
+        help="Read and store features in <frames>/feature_cache.sqlite, shared "
+        "with `run`.",
+    ),
+    csv_output: str = typer.Option(None, help="Optional path to save results as CSV."),
+):
+    """
+    Report how many frames each blur/dedup threshold combination keeps.
+
+    Blur scores and hashes are computed once (or read from the feature
+    cache); every combination is then evaluated on those features, without
+    re-running the pipeline.
+    """
+    logging.basicConfig(
+        format="%(asctime)s %(levelname)s:%(message)s", level=logging.INFO
+    )
+    frames_path = Path(frames_dir)
+    frames = sorted(frames_path.glob("*.jpg"))
+    if not frames:
+        typer.secho(f"No frames found in {frames_dir}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    try:
+        blur_grid = parse_grid(clean_thresholds)
+        dedup_grid = [int(t) for t in parse_grid(dedub_thresholds)]
+    except ValueError as e:
+        typer.secho(str(e), fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    cache = FeatureCache(frames_path / FEATURE_CACHE_NAME) if feature_cache else None
+    try:
+        rows, sweep_time = run_threshold_sweep(
+            frames,
+            blur_grid,
+            dedup_grid,
+            hash_size=hash_size,
+            reduction=blur_reduction,
+            workers=workers,
+            cache=cache,
+        )
+    finally:
+        if cache is not None:
+            cache.close()
+
+    typer.echo(
+        f"{'clean':>10} {'dedub':>6} {'blurry':>8} {'duplicates':>11} {'kept':>8}"
+    )
+    for row in rows:
+        typer.echo(
+            f"{row['clean_threshold']:>10g} {row['dedub_threshold']:>6} "
+            f"{row['blurry']:>8} {row['duplicates']:>11} {row['kept']:>8}"
+        )
+    typer.secho(
+        f"Evaluated {len(rows)} combinations on {len(frames)} frames in "
+        f"{sweep_time['threshold_sweep']:.2f} sec",
+        fg=typer.colors.GREEN,
+    )
+    if csv_output:
+        save_sweep_csv(rows, ensure_parent_dir(Path(csv_output)))
+        typer.secho(f"✅ Sweep saved to {csv_output}", fg=typer.colors.GREEN)
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,269 @@
+import os
+import logging
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, List, Optional
+from pipeline.constants import VALID_EXTENSIONS
+from pipeline.core.detect.cache import DETECTION_CACHE_NAME, DetectionCache
+from pipeline.core.detect.detector import run_detection_to_coco
+from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.preprocess.runner import VideoPreprocessor
+from pipeline.core.report.reporter import generate_report
+from pipeline.models.base import BaseModelRunner
+from pipeline.utils.paths import ensure_dir
+from pipeline.utils.timing import timed_step
+from pipeline.validation.validator import validate_video
+
+# Model loaded once per worker process by `_init_worker`, or why it failed
+_worker_model: Optional[BaseModelRunner] = None
+_worker_error: Optional[str] = None
+
+
+class BatchSettings:
+    """Per-video pipeline options shared by every job in a batch."""
+
+    def __init__(
+        self,
+        pretag: bool = False,
+        skip_frequency: int = 1,
+        writer_threads: int = 0,
+        blur_detection: bool = False,
+        clean_threshold: float = 100.0,
+        dedup_detection: bool = False,
+        hash_size: int = 8,
+        dedub_threshold: int = 5,
+        conf_threshold: float = 0.25,
+        batch_size: int = 1,
+        prefetch_depth: int = 0,
+        letterbox_size: Optional[int] = None,
+        detection_cache: bool = False,
+        resume: bool = False,
+    ):
+        self.pretag = pretag
+        self.skip_frequency = skip_frequency
+        self.writer_threads = writer_threads
+        self.blur_detection = blur_detection
+        self.clean_threshold = clean_threshold
+        self.dedup_detection = dedup_detection
+        self.hash_size = hash_size
+        self.dedub_threshold = dedub_threshold
+        self.conf_threshold = conf_threshold
+        self.batch_size = batch_size
+        self.prefetch_depth = prefetch_depth
+        self.letterbox_size = letterbox_size
+        self.detection_cache = detection_cache
+        self.resume = resume
+
+
+def discover_videos(source: Path) -> List[Path]:
+    """
+    List the videos of a batch.
+
+    Args:
+        source: Directory scanned for supported video files, or a manifest
+            file with one video path per line (blank lines and `#` comments
+            are ignored; relative paths are resolved against the manifest).
+
+    Returns:
+        Video paths in a deterministic order.
+    """
+    if source.is_dir():
+        return sorted(
+            f
+            for f in source.iterdir()
+            if f.is_file() and f.suffix.lower() in VALID_EXTENSIONS
+        )
+
+    videos = []
+    for line in source.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        path = Path(line)
+        videos.append(path if path.is_absolute() else source.parent / path)
+    return videos
+
+
+def assign_namespaces(videos: List[Path]) -> List[str]:
+    """Give each video a unique output directory name derived from its stem."""
+    seen: Dict[str, int] = {}
+    names = []
+    for video in videos:
+        count = seen.get(video.stem, 0) + 1
+        seen[video.stem] = count
+        names.append(video.stem if count == 1 else f"{video.stem}_{count}")
+    return names
+
+
+def _init_worker(model_config: Optional[Dict], threads: Optional[int]) -> None:
+    """
+    Load the detection model once for every job this worker will run.
+
+    A load failure is recorded instead of raised, which would break the
+    pool; every job of the worker then reports it as its failure.
+    """
+    global _worker_model, _worker_error
+    if threads:
+        import cv2
+
+        cv2.setNumThreads(threads)
+    if model_config is not None:
+        from pipeline.models.factory import build_model_runner
+
+        try:
+            _worker_model = build_model_runner(model_config, threads=threads)
+        except Exception as e:
+            logging.error(f"Model load failed: {e}\n{traceback.format_exc()}")
+            _worker_error = f"model load failed: {e}"
+
+
+def process_video(video: Path, output_dir: Path, settings: BatchSettings) -> Dict:
+    """
+    Run validation, extraction, preprocessing, pre-tagging and reporting for
+    one video of a batch, writing everything under `output_dir`.
+
+    Returns:
+        Summary dict for the batch report. Failures are caught and reported
+        with `status` set to "failed" so one bad video does not stop the batch.
+    """
+    summary: Dict = {"video": str(video), "output": str(output_dir), "pid": os.getpid()}
+    try:
+        if settings.pretag and _worker_model is None:
+            raise RuntimeError(_worker_error or "pre-tagging requested but no model")
+        frames_dir = ensure_dir(output_dir / "frames")
+        preprocessed_dir = ensure_dir(output_dir / "preprocessed_frames")
+        coco_path = output_dir / "annotations.coco.json"
+
+        cap, metadata = validate_video(str(video))
+        try:
+            extracted, write_errors, extraction_time = extract_frames(
+                cap,
+                str(frames_dir),
+                settings.skip_frequency,
+                writer_threads=settings.writer_threads,
+                resume=settings.resume,
+            )
+        finally:
+            cap.release()
+        timings = dict(extraction_time)
+
+        pre = VideoPreprocessor(
+            enable_blur_detection=settings.blur_detection,
+            enable_deduplication=settings.dedup_detection,
+            blur_threshold=settings.clean_threshold,
+            dedub_threshold=settings.dedub_threshold,
+            hash_size=settings.hash_size,
+        )
+        tag_input_dir = pre.run(input_dir=frames_dir, output_dir=preprocessed_dir)
+        timings.update(pre.blur_detection_timing)
+        timings.update(pre.dedup_removal_timing)
+
+        images_tagged = annotations = 0
+        if settings.pretag and _worker_model is not None:
+            cache = None
+            if settings.detection_cache:
+                cache = DetectionCache(output_dir / DETECTION_CACHE_NAME)
+            try:
+                images_tagged, annotations, _, detection_time = run_detection_to_coco(
+                    _worker_model,
+                    tag_input_dir,
+                    str(coco_path),
+                    settings.conf_threshold,
+                    batch_size=settings.batch_size,
+                    prefetch_depth=settings.prefetch_depth,
+                    letterbox_size=settings.letterbox_size,
+                    cache=cache,
+                )
+            finally:
+                if cache is not None:
+                    cache.close()
+            timings.update(detection_time)
+
+        generate_report(
+            video_path=str(video),
+            extracted_frame_count=extracted,
+            total_frames=metadata["frame_count"],
+            coco_path=coco_path,
+            out_path=str(output_dir / "report.md"),
+            timings=timings,
+            cleaned_frames=pre.cleaned,
+            deduped_frames=pre.deduped,
+            write_errors=write_errors,
+        )
+        summary.update(
+            status="ok",
+            total_frames=metadata["frame_count"],
+            extracted=extracted,
+            write_errors=write_errors,
+            cleaned=pre.cleaned,
+            deduped=pre.deduped,
+            images_tagged=images_tagged,
+            annotations=annotations,
+            timings=timings,
+        )
+    except Exception as e:
+        logging.error(f"Batch job failed for {video}: {e}\n{traceback.format_exc()}")
+        summary.update(status="failed", error=str(e))
+    return summary
+
+
+@timed_step("batch", flat=False)
+def run_batch(
+    videos: List[Path],
+    output_root: Path,
+    settings: BatchSettings,
+    workers: int = 1,
+    model_config: Optional[Dict] = None,
+    threads_per_worker: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Process many videos on a pool of worker processes.
+
+    Each worker loads the detection model once in its initializer and reuses
+    it for every video it is given. Every video writes to its own namespace
+    under `output_root`.
+
+    Args:
+        videos: Videos to process.
+        output_root: Root directory for per-video outputs.
+        settings: Pipeline options applied to every video.
+        workers: Number of worker processes.
+        model_config: `model` section of the config, loaded with
+            `build_model_runner` when `settings.pretag` is set.
+        threads_per_worker: Optional cap on OpenCV/torch threads per worker.
+
+    Returns:
+        Per-video summary dicts, in the order of `videos`. Videos whose
+        worker could not load the model or died are reported as failed.
+    """
+    ensure_dir(output_root)
+    namespaces = assign_namespaces(videos)
+    logging.info(f"Starting batch of {len(videos)} videos on {workers} workers")
+
+    with ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        initializer=_init_worker,
+        initargs=(model_config if settings.pretag else None, threads_per_worker),
+    ) as pool:
+        futures = [
+            pool.submit(process_video, video, output_root / name, settings)
+            for video, name in zip(videos, namespaces)
+        ]
+        results = []
+        for video, name, future in zip(videos, namespaces, futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool as e:
+                # A worker died (e.g. killed for memory); its jobs and every
+                # job still queued are lost
+                results.append(
+                    {
+                        "video": str(video),
+                        "output": str(output_root / name),
+                        "status": "failed",
+                        "error": f"worker process died: {e}",
+                    }
+                )
+        return results
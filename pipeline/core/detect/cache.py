@@ -0,0 +1,71 @@
+import json
+from typing import Dict, Iterable, Tuple
+from pipeline.models.base import DetectionResult
+from pipeline.utils.digest_cache import DigestCache
+
+DETECTION_CACHE_NAME = "detection_cache.sqlite"
+
+# Bump when the stored result format or key changes so stale entries are dropped
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS detections (
+    digest TEXT NOT NULL,
+    model_key TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (digest, model_key)
+);
+"""
+
+
+class DetectionCache(DigestCache):
+    """
+    Persistent SQLite store of detection results.
+
+    Results are stored before the run's confidence threshold is applied,
+    cut only at the runner's own `min_confidence`. They are keyed by the
+    content digest of the image plus a model key built from the runner's
+    `cache_key` (weights and inference settings), its `min_confidence` and
+    the input transform, so reruns with any confidence threshold at or
+    above that floor skip inference for images already seen by the same
+    model. Digests are memoized as described in `DigestCache`.
+    """
+
+    kind = "detection cache"
+    schema_version = SCHEMA_VERSION
+    schema = _SCHEMA
+    tables = ("detections",)
+
+    def get(self, digests: Iterable[str], model_key: str) -> Dict[str, DetectionResult]:
+        """Cached results of `model_key` for the given digests, by digest."""
+        rows = self._select(
+            "SELECT digest, result FROM detections WHERE model_key = ? AND digest IN",
+            list(digests),
+            params=[model_key],
+        )
+        return {digest: _decode(result) for digest, result in rows}
+
+    def put(self, items: Iterable[Tuple[str, DetectionResult]], model_key: str) -> None:
+        """Store (digest, result) pairs produced by `model_key`."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO detections VALUES (?, ?, ?)",
+            [(digest, model_key, _encode(result)) for digest, result in items],
+        )
+        self._conn.commit()
+
+
+def _encode(result: DetectionResult) -> str:
+    return json.dumps(
+        {
+            "xyxy": result.xyxy.tolist(),
+            "conf": result.conf.tolist(),
+            "class_ids": result.class_ids.tolist(),
+            "labels": result.labels.tolist(),
+            "width": result.width,
+            "height": result.height,
+        }
+    )
+
+
+def _decode(data: str) -> DetectionResult:
+    return DetectionResult.from_arrays(**json.loads(data))
@@ -1,85 +1,265 @@
 import json
 import logging
-from typing import Tuple, Dict
+from typing import Iterator, List, Optional, Tuple, Dict
 from pathlib import Path
 from tqdm import tqdm
-from pipeline.models.base import BaseModelRunner
-from pipeline.utils.timing import timed_step
+from pipeline.core.detect.cache import DetectionCache
+from pipeline.core.detect.loader import PrefetchLoader, restore_boxes
+from pipeline.models.base import BaseModelRunner, DetectionResult
+from pipeline.utils.paths import list_frames
+from pipeline.utils.timing import StepMetrics, timed_step
 
 
-@timed_step("run_detection_to_coco", flat=True)
-def run_detection_to_coco(
-    model: BaseModelRunner,
-    image_dir: Path,
-    output_path: str,
-    conf_threshold: float = 0.25,
-) -> Tuple[int, int]:
+class CocoBuilder:
     """
-    Run YOLO pre-tagging on images and output COCO-format JSON.
-
-    Args:
-        model: YOLO model.
-        image_dir: Path to image directory.
-        output_path: Path to write COCO-format JSON.
-        conf_threshold: Confidence threshold.
+    Incrementally assemble a COCO-format annotation file.
 
-    Returns:
-        Tuple of (image count, annotation count).
+    Images, annotations and categories receive sequential ids in the order
+    they are added, so feeding the same results in the same order always
+    produces the same file.
     """
-    image_files = sorted([f for f in image_dir.glob("*.jpg")])
 
-    coco_output: Dict = {"images": [], "annotations": [], "categories": []}
-    category_map = {}
-    next_image_id = 1
-    next_ann_id = 1
-    next_category_id = 1
+    def __init__(self, conf_threshold: float = 0.25):
+        self.conf_threshold = conf_threshold
+        self.coco_output: Dict = {"images": [], "annotations": [], "categories": []}
+        self.category_map: Dict[str, int] = {}
+        self.next_image_id = 1
+        self.next_ann_id = 1
+        self.next_category_id = 1
+
+    @property
+    def image_count(self) -> int:
+        return self.next_image_id - 1
 
-    for image_file in tqdm(image_files, desc="Pretagging"):
-        result = model.predict(image_file)
+    @property
+    def annotation_count(self) -> int:
+        return self.next_ann_id - 1
 
-        coco_output["images"].append(
+    def add(self, file_name: str, result: DetectionResult) -> None:
+        """
+        Append one image and its detections above the confidence threshold.
+
+        Args:
+            file_name: Image file name recorded in the COCO `images` entry.
+            result: Detection result for that image.
+        """
+        self.coco_output["images"].append(
             {
-                "id": next_image_id,
-                "file_name": image_file.name,
+                "id": self.next_image_id,
+                "file_name": file_name,
                 "height": result.height,
                 "width": result.width,
             }
         )
 
-        for box in result.boxes:
-            if box["conf"] < conf_threshold:
-                continue
-
-            label = box["label"]
-
-            if label not in category_map:
-                category_map[label] = next_category_id
-                coco_output["categories"].append(
-                    {"id": next_category_id, "name": label}
+        kept = result.above(self.conf_threshold)
+        for label, bbox, area in zip(
+            kept.labels.tolist(), kept.xywh.tolist(), kept.areas.tolist()
+        ):
+            if label not in self.category_map:
+                self.category_map[label] = self.next_category_id
+                self.coco_output["categories"].append(
+                    {"id": self.next_category_id, "name": label}
                 )
-                next_category_id += 1
+                self.next_category_id += 1
 
-            coco_output["annotations"].append(
+            self.coco_output["annotations"].append(
                 {
-                    "id": next_ann_id,
-                    "image_id": next_image_id,
-                    "category_id": category_map[label],
-                    "bbox": [
-                        box["x1"],
-                        box["y1"],
-                        box["x2"] - box["x1"],
-                        box["y2"] - box["y1"],
-                    ],
-                    "area": (box["x2"] - box["x1"]) * (box["y2"] - box["y1"]),
+                    "id": self.next_ann_id,
+                    "image_id": self.next_image_id,
+                    "category_id": self.category_map[label],
+                    "bbox": bbox,
+                    "area": area,
                     "iscrowd": 0,
                 }
             )
-            next_ann_id += 1
+            self.next_ann_id += 1
+
+        self.next_image_id += 1
+
+    def save(self, output_path: str) -> None:
+        """Write the accumulated COCO annotations as JSON."""
+        with open(output_path, "w") as f:
+            json.dump(self.coco_output, f, indent=2)
+
+        logging.info(f"Saved COCO annotations to {output_path}")
+
+
+def predict_files(
+    model: BaseModelRunner,
+    image_files: List[Path],
+    batch_size: int,
+    prefetch_depth: int,
+    loader_workers: Optional[int],
+    letterbox_size: Optional[int],
+    metrics: StepMetrics,
+) -> Iterator[List[Tuple[Path, DetectionResult]]]:
+    """Run inference batch by batch, yielding (path, result) pairs in order."""
+    if prefetch_depth <= 0:
+        for i in range(0, len(image_files), batch_size):
+            batch = image_files[i : i + batch_size]
+            yield list(zip(batch, model.predict_batch(batch, batch_size)))
+        return
+
+    loader = PrefetchLoader(
+        image_files,
+        batch_size=batch_size,
+        depth=prefetch_depth,
+        workers=loader_workers,
+        letterbox_size=letterbox_size,
+    )
+    for loaded in loader:
+        results = model.predict_batch([item.image for item in loaded], batch_size)
+        yield [
+            (item.path, restore_boxes(result, item))
+            for item, result in zip(loaded, results)
+        ]
+    metrics["detection_input_wait"] = loader.wait_seconds
+    logging.info(f"Inference waited {loader.wait_seconds:.2f}s on image decoding")
+
+
+def detection_cache_key(model: BaseModelRunner) -> Optional[str]:
+    """
+    Key detections of `model` are cached under: its `cache_key` plus the
+    `min_confidence` its results are cut at, or None if it is not cacheable.
+    """
+    if model.cache_key is None:
+        return None
+    return f"{model.cache_key}:min_conf={model.min_confidence}"
+
+
+def lookup_cached_detections(
+    cache: Optional[DetectionCache],
+    model_key: Optional[str],
+    image_files: List[Path],
+    prefetch_depth: int,
+    letterbox_size: Optional[int],
+) -> Tuple[Dict[Path, DetectionResult], Dict[Path, str], Optional[str]]:
+    """
+    Look up cached detections for `image_files`.
+
+    Args:
+        model_key: The model's `detection_cache_key`.
+
+    Returns:
+        Tuple of (cached results by path, content digests by path, the full
+        cache key to store new results under, or None when not caching).
+    """
+    if cache is None:
+        return {}, {}, None
+    if model_key is None:
+        logging.warning("Model has no cache key; detections will not be cached")
+        return {}, {}, None
+
+    # Letterboxing changes the model input, and with it the results
+    model_key += f":letterbox={letterbox_size if prefetch_depth > 0 else None}"
+    digests = dict(zip(image_files, cache.digests(image_files)))
+    cached = cache.get(digests.values(), model_key)
+    results = {f: cached[d] for f, d in digests.items() if d in cached}
+    logging.info(f"Found cached detections for {len(results)} images")
+    return results, digests, model_key
+
+
+def check_min_confidence(model_min_confidence: float, conf_threshold: float) -> None:
+    """Warn when the model drops detections the threshold would keep."""
+    if conf_threshold < model_min_confidence:
+        logging.warning(
+            f"Confidence threshold {conf_threshold} is below the model's "
+            f"min_confidence {model_min_confidence}; detections scoring "
+            "between them are never produced"
+        )
+
+
+def write_coco(
+    image_files: List[Path],
+    results: Dict[Path, DetectionResult],
+    conf_threshold: float,
+    output_path: str,
+) -> Tuple[int, int]:
+    """
+    Assemble and save COCO annotations in the order of `image_files`.
+
+    Images without a result (unreadable ones) are left out.
+
+    Returns:
+        Tuple of (image count, annotation count).
+    """
+    coco = CocoBuilder(conf_threshold)
+    for image_file in image_files:
+        if image_file in results:
+            coco.add(image_file.name, results[image_file])
+    coco.save(output_path)
+    return coco.image_count, coco.annotation_count
+
+
+@timed_step("run_detection_to_coco", flat=True)
+def run_detection_to_coco(
+    model: BaseModelRunner,
+    image_dir: Path,
+    output_path: str,
+    conf_threshold: float = 0.25,
+    batch_size: int = 1,
+    prefetch_depth: int = 0,
+    loader_workers: Optional[int] = None,
+    letterbox_size: Optional[int] = None,
+    cache: Optional[DetectionCache] = None,
+) -> Tuple[int, int, int, StepMetrics]:
+    """
+    Run YOLO pre-tagging on images and output COCO-format JSON.
+
+    Args:
+        model: YOLO model.
+        image_dir: Path to image directory, or a selection manifest listing
+            the images (see `VideoPreprocessor`).
+        output_path: Path to write COCO-format JSON.
+        conf_threshold: Confidence threshold.
+        batch_size: Number of images per forward pass (`predict_batch`).
+        prefetch_depth: With a positive depth, images are decoded by a
+            `PrefetchLoader` this many batches ahead of inference and passed
+            to the model as BGR arrays; 0 lets the model read the files.
+        loader_workers: Decoding threads of the prefetching loader.
+        letterbox_size: Letterbox prefetched images to this square size;
+            boxes are mapped back to the original image.
+        cache: Detection cache; images it holds results for under the
+            model's `detection_cache_key` skip inference. `conf_threshold`
+            is applied after the lookup, so changing it does not invalidate
+            the cache.
+
+    Returns:
+        Tuple of (image count, annotation count, images served from the
+        cache). With prefetching, the timing dict also reports
+        `detection_input_wait`, the time inference waited on decoding.
+    """
+    image_files = list_frames(Path(image_dir))
+    batch_size = max(1, batch_size)
+    metrics = StepMetrics()
+    check_min_confidence(model.min_confidence, conf_threshold)
 
-        next_image_id += 1
+    model_key = detection_cache_key(model) if cache is not None else None
+    results, digests, model_key = lookup_cached_detections(
+        cache, model_key, image_files, prefetch_depth, letterbox_size
+    )
+    cache_hits = len(results)
 
-    with open(output_path, "w") as f:
-        json.dump(coco_output, f, indent=2)
+    misses = [f for f in image_files if f not in results]
+    with tqdm(
+        total=len(image_files), initial=len(results), desc="Pretagging"
+    ) as progress:
+        for batch in predict_files(
+            model,
+            misses,
+            batch_size,
+            prefetch_depth,
+            loader_workers,
+            letterbox_size,
+            metrics,
+        ):
+            results.update(batch)
+            if cache is not None and model_key is not None:
+                cache.put([(digests[f], r) for f, r in batch], model_key)
+            progress.update(len(batch))
 
-    logging.info(f"Saved COCO annotations to {output_path}")
-    return next_image_id - 1, next_ann_id - 1
+    image_count, annotation_count = write_coco(
+        image_files, results, conf_threshold, output_path
+    )
+    return image_count, annotation_count, cache_hits, metrics
@@ -0,0 +1,125 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Generator, Iterator, List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from pipeline.models.base import DetectionResult
+from pipeline.utils.image import letterbox
+from pipeline.utils.queues import prefetch
+
+
+class LoadedImage:
+    """
+    A decoded BGR image ready for inference, with the transform applied to it.
+
+    `width` and `height` are those of the file on disk; `scale` and `pad`
+    describe the letterbox, if any, so detections can be mapped back.
+    """
+
+    __slots__ = ("path", "image", "width", "height", "scale", "pad")
+
+    def __init__(
+        self,
+        path: Path,
+        image: np.ndarray,
+        width: int,
+        height: int,
+        scale: float = 1.0,
+        pad: Tuple[int, int] = (0, 0),
+    ):
+        self.path = path
+        self.image = image
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self.pad = pad
+
+
+def load_image(
+    path: Path, letterbox_size: Optional[int] = None
+) -> Optional[LoadedImage]:
+    """
+    Decode an image file, optionally letterboxing it to a square input.
+
+    Returns:
+        The loaded image, or None (with a warning) if it cannot be read.
+    """
+    image = cv2.imread(str(path))
+    if image is None:
+        logging.warning(f"Skipping {path.name}: cannot read image")
+        return None
+    height, width = image.shape[:2]
+    if letterbox_size is None:
+        return LoadedImage(path, image, width, height)
+    boxed, scale, pad = letterbox(image, letterbox_size)
+    return LoadedImage(path, boxed, width, height, scale, pad)
+
+
+def restore_boxes(result: DetectionResult, item: LoadedImage) -> DetectionResult:
+    """Map detections on a loaded image back to the original image frame."""
+    xyxy = result.xyxy
+    if item.scale != 1.0 or item.pad != (0, 0):
+        pad = np.array(item.pad * 2, dtype=np.float64)
+        limit = np.array([item.width, item.height] * 2, dtype=np.float64)
+        xyxy = ((xyxy - pad) / item.scale).clip(0.0, limit)
+    return DetectionResult.from_arrays(
+        xyxy,
+        result.conf,
+        result.class_ids,
+        result.labels,
+        width=item.width,
+        height=item.height,
+    )
+
+
+class PrefetchLoader:
+    """
+    Decode batches of images ahead of inference.
+
+    A background thread decodes (and optionally letterboxes) the next
+    batches on a thread pool while the current batch runs through the
+    model, buffering at most `depth` batches. `wait_seconds` accumulates
+    the time the consumer spent blocked waiting for input; when it is a
+    large share of detection time, pre-tagging is I/O-bound.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[Path],
+        batch_size: int = 8,
+        depth: int = 2,
+        workers: Optional[int] = None,
+        letterbox_size: Optional[int] = None,
+    ):
+        self.paths = list(paths)
+        self.batch_size = max(1, batch_size)
+        self.depth = max(1, depth)
+        self.workers = workers
+        self.letterbox_size = letterbox_size
+        self.wait_seconds = 0.0
+
+    def _decode_batches(self) -> Iterator[List[LoadedImage]]:
+        load = partial(load_image, letterbox_size=self.letterbox_size)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for i in range(0, len(self.paths), self.batch_size):
+                batch = pool.map(load, self.paths[i : i + self.batch_size])
+                yield [item for item in batch if item is not None]
+
+    def __iter__(self) -> Iterator[List[LoadedImage]]:
+        batches: Generator[List[LoadedImage], None, None] = prefetch(
+            self._decode_batches(), depth=self.depth
+        )
+        try:
+            while True:
+                t0 = time.perf_counter()
+                batch = next(batches, None)
+                self.wait_seconds += time.perf_counter() - t0
+                if batch is None:
+                    return
+                if batch:
+                    yield batch
+        finally:
+            batches.close()
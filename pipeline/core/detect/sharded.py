@@ -0,0 +1,166 @@
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from tqdm import tqdm
+from pipeline.core.detect.cache import DetectionCache
+from pipeline.core.detect.detector import (
+    check_min_confidence,
+    detection_cache_key,
+    lookup_cached_detections,
+    predict_files,
+    write_coco,
+)
+from pipeline.models.base import BaseModelRunner, DetectionResult
+from pipeline.utils.paths import list_frames
+from pipeline.utils.timing import StepMetrics, timed_step
+
+# Model loaded once per shard worker process by `_init_shard_worker`
+_shard_model: Optional[BaseModelRunner] = None
+
+
+def split_shards(items: List[Path], shards: int) -> List[List[Path]]:
+    """Split a list into at most `shards` contiguous, near-equal parts."""
+    shards = max(1, min(shards, len(items)))
+    bounds = [len(items) * i // shards for i in range(shards + 1)]
+    return [items[bounds[i] : bounds[i + 1]] for i in range(shards)]
+
+
+def _init_shard_worker(
+    model_factory: Callable[[Optional[int]], BaseModelRunner], threads: Optional[int]
+) -> None:
+    """Cap decoding threads and load this worker's model once, capped too."""
+    global _shard_model
+    if threads:
+        import cv2
+
+        cv2.setNumThreads(threads)
+    _shard_model = model_factory(threads)
+
+
+def _shard_model_info() -> Tuple[Optional[str], float]:
+    """The worker model's `detection_cache_key` and `min_confidence`."""
+    assert _shard_model is not None
+    return detection_cache_key(_shard_model), _shard_model.min_confidence
+
+
+def _detect_shard(
+    image_files: List[Path],
+    batch_size: int,
+    prefetch_depth: int,
+    loader_workers: Optional[int],
+    letterbox_size: Optional[int],
+) -> Tuple[List[Tuple[Path, DetectionResult]], float]:
+    """Run one shard through the worker's model."""
+    assert _shard_model is not None
+    metrics = StepMetrics()
+    pairs: List[Tuple[Path, DetectionResult]] = []
+    for batch in predict_files(
+        _shard_model,
+        image_files,
+        batch_size,
+        prefetch_depth,
+        loader_workers,
+        letterbox_size,
+        metrics,
+    ):
+        pairs.extend(batch)
+    return pairs, metrics.get("detection_input_wait", 0.0)
+
+
+@timed_step("run_detection_to_coco", flat=True)
+def run_sharded_detection_to_coco(
+    model_factory: Callable[[Optional[int]], BaseModelRunner],
+    image_dir: Path,
+    output_path: str,
+    conf_threshold: float = 0.25,
+    shards: int = 2,
+    threads_per_shard: Optional[int] = None,
+    batch_size: int = 1,
+    prefetch_depth: int = 0,
+    letterbox_size: Optional[int] = None,
+    cache: Optional[DetectionCache] = None,
+) -> Tuple[int, int, int, StepMetrics]:
+    """
+    Run pre-tagging on a pool of processes, each with its own model.
+
+    The sorted image list is split into `shards` contiguous shards, one per
+    worker process. Results are merged in shard order and written with
+    `write_coco`, so the COCO file has the same ids and ordering as a
+    serial `run_detection_to_coco` run. Cached detections are looked up in
+    the parent process; only cache misses are sharded.
+
+    Args:
+        model_factory: Picklable callable taking the worker's inference
+            thread cap and returning a model runner, called once in every
+            worker (e.g. `partial(build_model_runner, cfg)`).
+        image_dir: Path to image directory, or a selection manifest.
+        output_path: Path to write COCO-format JSON.
+        conf_threshold: Confidence threshold.
+        shards: Number of worker processes.
+        threads_per_shard: Intra-op thread cap per worker (OpenCV and the
+            model's backend); defaults to an even split of the CPU count.
+        batch_size: Number of images per forward pass.
+        prefetch_depth: Prefetching loader depth in each worker (0 disables).
+        letterbox_size: Letterbox prefetched images to this square size.
+        cache: Detection cache.
+
+    Returns:
+        Tuple of (image count, annotation count, images served from the
+        cache). The timing dict also reports `detection_input_wait` summed
+        over shards when prefetching.
+    """
+    image_files = list_frames(Path(image_dir))
+    batch_size = max(1, batch_size)
+    shards = max(1, shards)
+    threads = threads_per_shard or max(1, (os.cpu_count() or 1) // shards)
+    metrics = StepMetrics()
+    logging.info(
+        f"Sharding {len(image_files)} images over {shards} workers "
+        f"with {threads} threads each"
+    )
+
+    with ProcessPoolExecutor(
+        max_workers=shards,
+        initializer=_init_shard_worker,
+        initargs=(model_factory, threads),
+    ) as pool:
+        model_key, min_confidence = pool.submit(_shard_model_info).result()
+        check_min_confidence(min_confidence, conf_threshold)
+        results, digests, model_key = lookup_cached_detections(
+            cache, model_key, image_files, prefetch_depth, letterbox_size
+        )
+        cache_hits = len(results)
+
+        misses = [f for f in image_files if f not in results]
+        parts = split_shards(misses, shards)
+        futures = [
+            pool.submit(
+                _detect_shard,
+                shard,
+                batch_size,
+                prefetch_depth,
+                threads,
+                letterbox_size,
+            )
+            for shard in parts
+        ]
+        wait = 0.0
+        with tqdm(
+            total=len(image_files), initial=len(results), desc="Pretagging"
+        ) as progress:
+            for future, shard in zip(futures, parts):
+                pairs, shard_wait = future.result()
+                results.update(pairs)
+                if cache is not None and model_key is not None:
+                    cache.put([(digests[f], r) for f, r in pairs], model_key)
+                wait += shard_wait
+                progress.update(len(shard))
+    if prefetch_depth > 0:
+        metrics["detection_input_wait"] = wait
+
+    image_count, annotation_count = write_coco(
+        image_files, results, conf_threshold, output_path
+    )
+    return image_count, annotation_count, cache_hits, metrics
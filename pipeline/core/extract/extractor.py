@@ -1,41 +1,343 @@
 import os
+import re
 import logging
-from datetime import datetime
+import itertools
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 import cv2
+import numpy as np
+from pipeline.core.extract.manifest import ExtractionManifest
+from pipeline.core.extract.scene import SceneChangeSelector
+from pipeline.core.extract.writer import FrameWriterPool
+from pipeline.utils.image import downscale
 from pipeline.utils.timing import timed_step
 
 
+def frame_filename(frame_idx: int) -> str:
+    """Build the deterministic on-disk file name for an extracted frame."""
+    return f"frame_{frame_idx:06d}.jpg"
+
+
+def frame_index(path: Path) -> int:
+    """Recover the frame index from a file named by `frame_filename`."""
+    match = re.fullmatch(r"frame_(\d+)\.jpg", Path(path).name)
+    if match is None:
+        raise ValueError(f"Not an extracted frame file name: {Path(path).name}")
+    return int(match.group(1))
+
+
+def sampling_params(
+    cap: cv2.VideoCapture,
+    skip_frequency: int = 1,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None,
+    scene_threshold: Optional[float] = None,
+    max_gap: Optional[int] = None,
+) -> dict:
+    """Describe an extraction run; a checkpoint is only resumed if these match."""
+    return {
+        "frame_count": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+        "skip_frequency": skip_frequency,
+        "every_seconds": every_seconds,
+        "max_frames": max_frames,
+        "max_side": max_side,
+        "size": list(size) if size is not None else None,
+        "scene_threshold": scene_threshold,
+        "max_gap": max_gap,
+    }
+
+
+def committed_on_disk(
+    manifest: ExtractionManifest, output_dir: str, resume: bool
+) -> AbstractSet[int]:
+    """Start `manifest` and return the committed frames whose files still exist."""
+    committed = manifest.start(resume=resume)
+    return {
+        idx
+        for idx in committed
+        if os.path.exists(os.path.join(output_dir, frame_filename(idx)))
+    }
+
+
+def sample_indices(
+    frame_count: int,
+    fps: float,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+) -> List[int]:
+    """
+    Compute the frame indices to keep for time-based or budget-based sampling.
+
+    Args:
+        frame_count: Total number of frames in the video.
+        fps: Video frame rate.
+        every_seconds: Keep one frame every N seconds of video.
+        max_frames: Keep exactly this many frames, spread evenly over the video.
+            Takes precedence over `every_seconds`.
+
+    Returns:
+        Sorted, unique frame indices.
+    """
+    if frame_count <= 0:
+        return []
+    if max_frames is not None:
+        if max_frames <= 0:
+            raise ValueError(f"max_frames must be positive, got {max_frames}")
+        picks = np.linspace(0, frame_count - 1, num=min(max_frames, frame_count))
+        return sorted(set(int(round(i)) for i in picks))
+    if every_seconds is not None:
+        if every_seconds <= 0 or fps <= 0:
+            raise ValueError(
+                f"every_seconds and fps must be positive, got {every_seconds}, {fps}"
+            )
+        step = every_seconds * fps
+        count = int((frame_count - 1) // step) + 1
+        return sorted(set(int(round(k * step)) for k in range(count)))
+    raise ValueError("Either every_seconds or max_frames must be given")
+
+
+def decode_indices(
+    cap: cv2.VideoCapture,
+    targets: Iterable[int],
+    seek_threshold: Optional[int] = 300,
+    start: int = 0,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode only the requested frames from an open VideoCapture.
+
+    Frames between targets are skipped with `grab()`, which advances the
+    stream without the colour conversion and copy done by `retrieve()`.
+    Gaps longer than `seek_threshold` frames are skipped by seeking instead,
+    which lets the decoder jump to the nearest keyframe.
+
+    Args:
+        cap: OpenCV VideoCapture instance (already opened).
+        targets: Increasing frame indices to decode.
+        seek_threshold: Gap length above which to seek; None never seeks.
+        start: Index of the next frame `cap` will return.
+
+    Yields:
+        Tuples of (frame index, BGR frame).
+    """
+    pos = start
+    for target in targets:
+        if target < pos:
+            continue
+        if seek_threshold is not None and target - pos > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+            pos = target
+        while pos < target:
+            if not cap.grab():
+                return
+            pos += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        yield target, frame
+        pos += 1
+
+
+def decode_selected(
+    cap: cv2.VideoCapture,
+    targets: Iterable[int],
+    exclude: AbstractSet[int] = frozenset(),
+    select: Optional[SceneChangeSelector] = None,
+    seek_threshold: Optional[int] = 300,
+    start: int = 0,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode the targets not in `exclude` and keep those `select` accepts.
+
+    Scene selection depends on every earlier decision, so when resuming
+    with a selector, targets before the last excluded (already saved) frame
+    are not reconsidered: that frame is decoded once to seed the selector
+    and decoding continues after it, as in an uninterrupted run.
+
+    Args:
+        cap: OpenCV VideoCapture instance (already opened).
+        targets: Increasing frame indices to decode.
+        exclude: Frame indices already saved.
+        select: Optional scene-change selector.
+        seek_threshold: Gap length above which to seek instead of grabbing.
+        start: Index of the next frame `cap` will return.
+
+    Yields:
+        Tuples of (frame index, BGR frame).
+    """
+    seed = max(exclude) if select is not None and exclude else None
+    if seed is not None:
+        targets = (t for t in targets if t == seed or (t > seed and t not in exclude))
+    elif exclude:
+        targets = (t for t in targets if t not in exclude)
+    for frame_idx, frame in decode_indices(
+        cap, targets, seek_threshold=seek_threshold, start=start
+    ):
+        if select is None:
+            yield frame_idx, frame
+        elif frame_idx == seed:
+            select.seed(frame_idx, frame)
+        elif select(frame_idx, frame):
+            yield frame_idx, frame
+
+
+def iter_frames(
+    cap: cv2.VideoCapture,
+    skip_frequency: int = 1,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+    seek_threshold: Optional[int] = 300,
+    exclude: AbstractSet[int] = frozenset(),
+    select: Optional[SceneChangeSelector] = None,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Decode sampled frames from an open VideoCapture.
+
+    `max_frames` takes precedence over `every_seconds`, which takes
+    precedence over `skip_frequency`.
+
+    Args:
+        cap: OpenCV VideoCapture instance (already opened).
+        skip_frequency: Yield every nth frame. Default is 1 (every frame).
+        every_seconds: Yield one frame every N seconds of video.
+        max_frames: Yield exactly this many frames, spread evenly.
+        seek_threshold: Gap length above which to seek instead of grabbing.
+        exclude: Sampled frame indices to skip without decoding.
+        select: Optional scene-change selector deciding whether a decoded
+            frame is yielded; see `decode_selected` for how it resumes.
+
+    Yields:
+        Tuples of (frame index, BGR frame).
+    """
+    targets: Iterable[int]
+    if every_seconds is not None or max_frames is not None:
+        targets = sample_indices(
+            int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            cap.get(cv2.CAP_PROP_FPS),
+            every_seconds=every_seconds,
+            max_frames=max_frames,
+        )
+    else:
+        if skip_frequency <= 0:
+            raise ValueError(f"skip_frequency must be positive, got {skip_frequency}")
+        targets = itertools.count(0, skip_frequency)
+    yield from decode_selected(
+        cap, targets, exclude, select, seek_threshold=seek_threshold
+    )
+
+
 @timed_step("frame_extraction", flat=True)
 def extract_frames(
-    cap: cv2.VideoCapture, output_dir: str, skip_frequency: int = 1
-) -> int:
+    cap: cv2.VideoCapture,
+    output_dir: str,
+    skip_frequency: int = 1,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+    seek_threshold: Optional[int] = 300,
+    writer_threads: int = 0,
+    max_pending: int = 64,
+    resume: bool = False,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None,
+    scene_threshold: Optional[float] = None,
+    max_gap: Optional[int] = None,
+) -> Tuple[int, int]:
     """
     Extract frames from the given open VideoCapture and save as JPEG images.
 
+    With `writer_threads` > 0, JPEG encoding and file writes run on a
+    `FrameWriterPool` so decoding continues while earlier frames are flushed.
+    Frames that fail to write are not counted as saved; their number is
+    returned separately.
+
+    Every written frame is recorded in an `ExtractionManifest` in
+    `output_dir`. With `resume`, frames committed by an earlier run with the
+    same parameters are kept on disk and not decoded again.
+
+    `max_side` / `size` downscale frames with area interpolation before they
+    are encoded, which shrinks every later decode as well.
+
+    With `scene_threshold`, sampled frames are only saved when a
+    `SceneChangeSelector` sees enough change since the last saved frame.
+
     Args:
         cap: OpenCV VideoCapture instance (already opened).
         output_dir: Directory where extracted frames will be saved.
         skip_frequency: Save every nth frame. Default is 1 (every frame).
+        every_seconds: Save one frame every N seconds of video.
+        max_frames: Save exactly this many frames, spread evenly over the video.
+        seek_threshold: Gap length above which to seek instead of grabbing.
+        writer_threads: Number of background writer threads; 0 writes inline.
+        max_pending: Maximum number of decoded frames waiting to be written.
+        resume: Skip frames already committed by an interrupted earlier run.
+        max_side: Maximum length of the longest side of saved frames.
+        size: Exact (width, height) of saved frames; overrides `max_side`.
+        scene_threshold: Minimum mean thumbnail difference (0-255) to keep a
+            frame; None keeps every sampled frame.
+        max_gap: With `scene_threshold`, keep at least one frame every
+            `max_gap` frames.
 
     Returns:
-        total_frames_saved: Number of frames written.
+        Tuple of (number of frames on disk, including resumed ones, number of
+        frames that failed to write).
     """
     logging.info("Starting frame extraction")
     os.makedirs(output_dir, exist_ok=True)
 
-    frame_idx = 0
-    saved_count = 0
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if frame_idx % skip_frequency == 0:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-            filename = f"frame_{frame_idx:06d}_{timestamp}.jpg"
-            filepath = os.path.join(output_dir, filename)
-            cv2.imwrite(filepath, frame)
-            saved_count += 1
-        frame_idx += 1
+    params = sampling_params(
+        cap,
+        skip_frequency,
+        every_seconds,
+        max_frames,
+        max_side,
+        size,
+        scene_threshold,
+        max_gap,
+    )
+    select = None
+    if scene_threshold is not None:
+        select = SceneChangeSelector(scene_threshold, max_gap=max_gap)
+    with ExtractionManifest(output_dir, params) as manifest:
+        committed = committed_on_disk(manifest, output_dir, resume)
+        frames = iter_frames(
+            cap,
+            skip_frequency,
+            every_seconds=every_seconds,
+            max_frames=max_frames,
+            seek_threshold=seek_threshold,
+            exclude=committed,
+            select=select,
+        )
+        if writer_threads > 0:
+            with FrameWriterPool(
+                writer_threads, max_pending, on_written=manifest.commit
+            ) as writer:
+                for frame_idx, frame in frames:
+                    filepath = os.path.join(output_dir, frame_filename(frame_idx))
+                    frame = downscale(frame, max_side, size)
+                    writer.submit(filepath, frame, frame_idx)
+            saved_count = writer.written
+            write_errors = len(writer.errors)
+        else:
+            saved_count = 0
+            write_errors = 0
+            for frame_idx, frame in frames:
+                filepath = os.path.join(output_dir, frame_filename(frame_idx))
+                if cv2.imwrite(filepath, downscale(frame, max_side, size)):
+                    manifest.commit(frame_idx)
+                    saved_count += 1
+                else:
+                    logging.warning(f"Failed to write frame {filepath}")
+                    write_errors += 1
+        saved_count += len(committed)
 
     logging.info(f"Extracted {saved_count} frames to {output_dir}")
-    return saved_count
+    return saved_count, write_errors
@@ -0,0 +1,104 @@
+import os
+import json
+import logging
+from pathlib import Path
+from typing import Optional, Set
+
+MANIFEST_NAME = "extraction_manifest.jsonl"
+
+
+class ExtractionManifest:
+    """
+    Append-only checkpoint of the frames an extraction run has committed.
+
+    The first line records the extraction parameters; every following line
+    records one frame index, appended only after its JPEG is fully written.
+    Appends go through a single O_APPEND write per line, so several worker
+    processes can share the same manifest.
+    """
+
+    def __init__(self, output_dir: str, params: dict):
+        self.path = Path(output_dir) / MANIFEST_NAME
+        self.params = params
+        self._fd: Optional[int] = None
+        self._torn_tail = False
+
+    def _read_committed(self) -> Optional[Set[int]]:
+        """Return committed frame indices, or None if the manifest does not match."""
+        with self.path.open() as f:
+            content = f.read()
+        self._torn_tail = bool(content) and not content.endswith("\n")
+        lines = content.splitlines()
+        if not lines:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return None
+        if header.get("params") != self.params:
+            return None
+
+        committed = set()
+        for line in lines[1:]:
+            try:
+                committed.add(int(json.loads(line)["frame"]))
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                # A torn final line from an interrupted append
+                continue
+        return committed
+
+    def start(self, resume: bool = True) -> Set[int]:
+        """
+        Open the manifest for appending, resuming from it when possible.
+
+        Args:
+            resume: Reuse frames recorded by a previous run with the same
+                parameters. Otherwise the manifest is started afresh.
+
+        Returns:
+            Indices of frames already committed by a previous run.
+        """
+        committed: Optional[Set[int]] = None
+        if resume and self.path.exists():
+            committed = self._read_committed()
+            if committed is None:
+                logging.warning(
+                    f"Ignoring {self.path}: written with different extraction parameters"
+                )
+
+        if committed is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps({"params": self.params}) + "\n")
+            committed = set()
+        else:
+            logging.info(f"Resuming extraction: {len(committed)} frames committed")
+
+        self.attach()
+        if self._torn_tail:
+            self._append("")
+        return committed
+
+    def attach(self) -> None:
+        """Open an existing manifest for appending (e.g. from a worker process)."""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+
+    def commit(self, frame_idx: int) -> None:
+        """Record that a frame has been fully written."""
+        self._append(json.dumps({"frame": frame_idx}))
+
+    def _append(self, line: str) -> None:
+        if self._fd is None:
+            raise RuntimeError("Manifest is not open; call start() or attach()")
+        os.write(self._fd, (line + "\n").encode())
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "ExtractionManifest":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,246 @@
+import os
+import logging
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import AbstractSet, Iterable, List, Optional, Tuple
+import cv2
+from pipeline.core.extract.extractor import (
+    committed_on_disk,
+    decode_selected,
+    frame_filename,
+    sample_indices,
+    sampling_params,
+)
+from pipeline.core.extract.manifest import ExtractionManifest
+from pipeline.core.extract.scene import SceneChangeSelector
+from pipeline.core.extract.writer import FrameWriterPool
+from pipeline.utils.image import downscale
+from pipeline.utils.timing import timed_step
+
+
+def split_segments(frame_count: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Split the frame range [0, frame_count) into contiguous, near-equal segments.
+
+    Args:
+        frame_count: Total number of frames in the video.
+        workers: Number of segments to produce.
+
+    Returns:
+        List of (start, end) frame index pairs, end exclusive.
+    """
+    workers = max(1, min(workers, frame_count))
+    bounds = [frame_count * i // workers for i in range(workers + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(workers)]
+
+
+def _segment_targets(
+    start: int,
+    end: Optional[int],
+    skip_frequency: int,
+    sampled: Optional[List[int]],
+) -> Iterable[int]:
+    if sampled is not None:
+        return [i for i in sampled if i >= start and (end is None or i < end)]
+    first = -(-start // skip_frequency) * skip_frequency
+    if end is None:
+        return itertools.count(first, skip_frequency)
+    return range(first, end, skip_frequency)
+
+
+def _extract_segment(
+    video_path: str,
+    output_dir: str,
+    start: int,
+    end: Optional[int],
+    skip_frequency: int,
+    sampled: Optional[List[int]],
+    seek_threshold: Optional[int],
+    params: dict,
+    committed: AbstractSet[int],
+    max_side: Optional[int],
+    size: Optional[Tuple[int, int]],
+    scene_threshold: Optional[float],
+    max_gap: Optional[int],
+    writer_threads: int,
+) -> Tuple[List[int], int]:
+    """
+    Decode one segment in a worker process.
+
+    Returns:
+        Tuple of (frame indices on disk, number of frames that failed to write).
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Worker cannot open video: {video_path}")
+
+    targets = _segment_targets(start, end, skip_frequency, sampled)
+    done = [idx for idx in committed if idx >= start and (end is None or idx < end)]
+
+    select = None
+    if scene_threshold is not None:
+        select = SceneChangeSelector(scene_threshold, max_gap=max_gap)
+
+    written: List[int] = []
+    write_errors = 0
+    manifest = ExtractionManifest(output_dir, params)
+    manifest.attach()
+
+    def commit(frame_idx: int) -> None:
+        manifest.commit(frame_idx)
+        written.append(frame_idx)
+
+    try:
+        if start > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        frames = decode_selected(
+            cap, targets, set(done), select, seek_threshold=seek_threshold, start=start
+        )
+        if writer_threads > 0:
+            with FrameWriterPool(writer_threads, on_written=commit) as writer:
+                for frame_idx, frame in frames:
+                    filepath = os.path.join(output_dir, frame_filename(frame_idx))
+                    writer.submit(filepath, downscale(frame, max_side, size), frame_idx)
+            write_errors = len(writer.errors)
+        else:
+            for frame_idx, frame in frames:
+                filepath = os.path.join(output_dir, frame_filename(frame_idx))
+                if cv2.imwrite(filepath, downscale(frame, max_side, size)):
+                    commit(frame_idx)
+                else:
+                    logging.warning(f"Failed to write frame {filepath}")
+                    write_errors += 1
+    finally:
+        manifest.close()
+        cap.release()
+    return sorted(done + written), write_errors
+
+
+@timed_step("frame_extraction", flat=True)
+def extract_frames_parallel(
+    video_path: str,
+    output_dir: str,
+    metadata: dict,
+    workers: int,
+    skip_frequency: int = 1,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+    seek_threshold: Optional[int] = 300,
+    resume: bool = False,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None,
+    scene_threshold: Optional[float] = None,
+    max_gap: Optional[int] = None,
+    writer_threads: int = 0,
+) -> Tuple[int, int]:
+    """
+    Extract frames with one VideoCapture per worker process.
+
+    The frame range reported by `validate_video` is split into contiguous
+    segments; each worker seeks to its segment start and decodes the sampled
+    frames inside it. Frames are named by their global index, so the merged
+    output is the same sequence a serial `extract_frames` run would write.
+    All workers append to the same `ExtractionManifest`, so an interrupted
+    run can be resumed with `resume`, serially or in parallel.
+
+    With `scene_threshold`, each worker runs its own `SceneChangeSelector`,
+    so the first sampled frame of every segment is always kept.
+
+    Args:
+        video_path: Path to the input video file.
+        output_dir: Directory where extracted frames will be saved.
+        metadata: Video metadata from `validate_video` (frame_count, fps).
+        workers: Number of worker processes.
+        skip_frequency: Save every nth frame. Default is 1 (every frame).
+        every_seconds: Save one frame every N seconds of video.
+        max_frames: Save exactly this many frames, spread evenly over the video.
+        seek_threshold: Gap length above which to seek instead of grabbing.
+        resume: Skip frames already committed by an interrupted earlier run.
+        max_side: Maximum length of the longest side of saved frames.
+        size: Exact (width, height) of saved frames; overrides `max_side`.
+        scene_threshold: Minimum mean thumbnail difference (0-255) to keep a
+            frame; None keeps every sampled frame.
+        max_gap: With `scene_threshold`, keep at least one frame every
+            `max_gap` frames.
+        writer_threads: Number of background writer threads in each worker,
+            as in `extract_frames`; 0 writes inline.
+
+    Returns:
+        Tuple of (number of frames on disk, including resumed ones, number of
+        frames that failed to write, summed over workers).
+    """
+    if skip_frequency <= 0:
+        raise ValueError(f"skip_frequency must be positive, got {skip_frequency}")
+    frame_count = metadata["frame_count"]
+    segments = split_segments(frame_count, workers)
+    logging.info(
+        f"Starting parallel frame extraction: {len(segments)} segments "
+        f"over {frame_count} frames"
+    )
+    os.makedirs(output_dir, exist_ok=True)
+
+    sampled = None
+    if every_seconds is not None or max_frames is not None:
+        sampled = sample_indices(
+            frame_count,
+            metadata["fps"],
+            every_seconds=every_seconds,
+            max_frames=max_frames,
+        )
+
+    cap = cv2.VideoCapture(video_path)
+    params = sampling_params(
+        cap,
+        skip_frequency,
+        every_seconds,
+        max_frames,
+        max_side,
+        size,
+        scene_threshold,
+        max_gap,
+    )
+    cap.release()
+    with ExtractionManifest(output_dir, params) as manifest:
+        committed = committed_on_disk(manifest, output_dir, resume)
+
+    with ProcessPoolExecutor(max_workers=len(segments)) as pool:
+        futures = []
+        for i, (start, end) in enumerate(segments):
+            # The container frame count is an estimate, so the last worker
+            # keeps decoding until the stream actually ends.
+            last = i == len(segments) - 1
+            futures.append(
+                pool.submit(
+                    _extract_segment,
+                    video_path,
+                    str(output_dir),
+                    start,
+                    None if last else end,
+                    skip_frequency,
+                    sampled,
+                    seek_threshold,
+                    params,
+                    committed,
+                    max_side,
+                    size,
+                    scene_threshold,
+                    max_gap,
+                    writer_threads,
+                )
+            )
+        written, errors = zip(*(future.result() for future in futures))
+
+    checked = segments[:-1] if scene_threshold is None else []
+    for (start, end), indices in zip(checked, written):
+        expected = list(_segment_targets(start, end, skip_frequency, sampled))
+        if indices != expected:
+            missing = sorted(set(expected) - set(indices))
+            logging.warning(
+                f"Segment [{start}, {end}) is missing {len(missing)} frames: "
+                f"{missing[:10]}"
+            )
+    saved_count = sum(len(indices) for indices in written)
+    write_errors = sum(errors)
+
+    logging.info(f"Extracted {saved_count} frames to {output_dir}")
+    return saved_count, write_errors
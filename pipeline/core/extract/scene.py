@@ -0,0 +1,57 @@
+from typing import Optional
+import cv2
+import numpy as np
+from pipeline.utils.image import downscale
+
+
+class SceneChangeSelector:
+    """
+    Keep a frame only when its content has changed enough since the last kept one.
+
+    The change signal is the mean absolute difference between small grayscale
+    thumbnails (0-255 scale), which is cheap enough to compute on every
+    decoded frame. `max_gap` guarantees a frame is kept at least every
+    `max_gap` frames, even on a perfectly static scene.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 8.0,
+        max_gap: Optional[int] = None,
+        thumb_side: int = 64,
+    ):
+        self.threshold = threshold
+        self.max_gap = max_gap
+        self.thumb_side = thumb_side
+        self.last_thumb: Optional[np.ndarray] = None
+        self.last_kept: Optional[int] = None
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        small = downscale(frame, max_side=self.thumb_side)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small
+
+    def change(self, thumb: np.ndarray) -> float:
+        """Mean absolute difference between `thumb` and the last kept thumbnail."""
+        if self.last_thumb is None:
+            return float("inf")
+        return float(cv2.absdiff(thumb, self.last_thumb).mean())
+
+    def seed(self, frame_idx: int, frame: np.ndarray) -> None:
+        """Take `frame` as the last kept frame, e.g. the last one saved by an
+        interrupted run that is being resumed."""
+        self.last_thumb = self._thumbnail(frame)
+        self.last_kept = frame_idx
+
+    def __call__(self, frame_idx: int, frame: np.ndarray) -> bool:
+        thumb = self._thumbnail(frame)
+        keep = self.change(thumb) >= self.threshold or (
+            self.max_gap is not None
+            and self.last_kept is not None
+            and frame_idx - self.last_kept >= self.max_gap
+        )
+        if keep:
+            self.last_thumb = thumb
+            self.last_kept = frame_idx
+        return keep
@@ -0,0 +1,95 @@
+import queue
+import logging
+import threading
+from typing import Callable, List, Optional, Tuple
+import cv2
+import numpy as np
+
+_STOP = None
+
+
+class FrameWriterPool:
+    """
+    Encode and write frames on a pool of threads behind a bounded queue.
+
+    `submit` blocks once `max_pending` frames are waiting, so a fast decoder
+    cannot run ahead of the writers by more than that many frames. OpenCV
+    releases the GIL while encoding, so the writers overlap with decoding.
+    `on_written` is called with the frame index of every successful write;
+    if it raises, the frame is reported in `errors` instead of `written`.
+    """
+
+    def __init__(
+        self,
+        threads: int = 4,
+        max_pending: int = 64,
+        on_written: Optional[Callable[[int], None]] = None,
+    ):
+        self.on_written = on_written
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+        self.errors: List[Tuple[str, str]] = []
+        self.written = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True)
+            for _ in range(max(1, threads))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _work(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            path, frame, frame_idx = item
+            error: Optional[str] = None
+            try:
+                if not cv2.imwrite(path, frame):
+                    error = "cv2.imwrite returned False"
+            except Exception as e:
+                error = str(e)
+            with self._lock:
+                if error is None and self.on_written is not None:
+                    # A failing callback must not kill the thread, or
+                    # `submit` blocks forever once the queue fills up
+                    try:
+                        if frame_idx is not None:
+                            self.on_written(frame_idx)
+                    except Exception as e:
+                        error = f"on_written failed: {e}"
+                if error is None:
+                    self.written += 1
+                else:
+                    self.errors.append((path, error))
+            if error is not None:
+                logging.warning(f"Failed to write frame {path}: {error}")
+
+    def submit(
+        self, path: str, frame: np.ndarray, frame_idx: Optional[int] = None
+    ) -> None:
+        """Queue a frame for writing, blocking while the queue is full."""
+        self.queue.put((path, frame, frame_idx))
+
+    def close(self) -> List[Tuple[str, str]]:
+        """
+        Wait for all queued frames to be written and stop the threads.
+
+        Returns:
+            List of (path, error message) for frames that failed to write.
+        """
+        if self._closed:
+            return self.errors
+        self._closed = True
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for t in self._threads:
+            t.join()
+        return self.errors
+
+    def __enter__(self) -> "FrameWriterPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,48 +1,152 @@
-import shutil
+import os
 import logging
-from typing import List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 from pathlib import Path
 import cv2
+import numpy as np
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.utils.paths import transfer_file
 from pipeline.utils.timing import timed_step
 
+# Grayscale decode flags; reduced variants let libjpeg decode at 1/2, 1/4 or 1/8 size
+_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
 
 def variance_of_laplacian(image):
     """Compute the Laplacian variance (blurriness metric)."""
     return cv2.Laplacian(image, cv2.CV_64F).var()
 
 
+def blur_score(image: np.ndarray) -> float:
+    """Compute the Laplacian variance of an in-memory BGR or grayscale frame."""
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    return variance_of_laplacian(image)
+
+
+def _score_chunk(paths: Sequence[Path], flag: int) -> np.ndarray:
+    scores = np.full(len(paths), np.nan)
+    for i, path in enumerate(paths):
+        gray = cv2.imread(str(path), flag)
+        if gray is not None:
+            scores[i] = variance_of_laplacian(gray)
+    return scores
+
+
+def compute_blur_scores(
+    frames: Sequence[Path],
+    reduction: int = 1,
+    chunk_size: int = 64,
+    workers: Optional[int] = None,
+    cache: Optional[FeatureCache] = None,
+) -> np.ndarray:
+    """
+    Compute Laplacian variance for many images on a thread pool.
+
+    Images are decoded straight to grayscale, optionally at reduced size,
+    and scored in chunks. OpenCV releases the GIL while decoding and
+    filtering, so the threads run on all cores.
+
+    Args:
+        frames: Image file paths.
+        reduction: Decode at 1/reduction size (1, 2, 4 or 8). Laplacian variance
+            depends on resolution, so thresholds must be tuned per reduction.
+        chunk_size: Number of images scored per task.
+        workers: Number of threads; defaults to the CPU count.
+        cache: Feature cache; only frames without a cached score are decoded.
+
+    Returns:
+        Array of scores indexed like `frames`; NaN for unreadable images.
+    """
+    if reduction not in _GRAYSCALE_FLAGS:
+        raise ValueError(
+            f"reduction must be one of {sorted(_GRAYSCALE_FLAGS)}, got {reduction}"
+        )
+    if not frames:
+        return np.empty(0)
+
+    if cache is not None:
+        digests = cache.digests(frames)
+        known = cache.get_blur_scores(digests, reduction)
+        missing = [i for i, digest in enumerate(digests) if digest not in known]
+        logging.info(f"Blur score cache: {len(frames) - len(missing)} hits")
+        scores = np.array([known.get(digest, np.nan) for digest in digests])
+        if missing:
+            computed = compute_blur_scores(
+                [frames[i] for i in missing], reduction, chunk_size, workers
+            )
+            scores[missing] = computed
+            cache.put_blur_scores(
+                [
+                    (digests[i], score)
+                    for i, score in zip(missing, computed)
+                    if not np.isnan(score)
+                ],
+                reduction,
+            )
+        return scores
+
+    flag = _GRAYSCALE_FLAGS[reduction]
+    chunks = [frames[i : i + chunk_size] for i in range(0, len(frames), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(lambda chunk: _score_chunk(chunk, flag), chunks))
+    return np.concatenate(results)
+
+
 @timed_step("blur_detection", flat=True)
 def clean_blurry_frames(
-    frames: List[Path], output_dir: Path, threshold: float = 100.0
+    frames: List[Path],
+    output_dir: Path,
+    threshold: float = 100.0,
+    reduction: int = 1,
+    chunk_size: int = 64,
+    workers: Optional[int] = None,
+    transfer: str = "link",
+    cache: Optional[FeatureCache] = None,
 ) -> Tuple[List[Path], int]:
     """
-    Filter out blurry frames and copy non-blurry frames to output_dir.
+    Filter out blurry frames and link non-blurry frames into output_dir.
 
     Args:
         frames: List of input image file paths.
         output_dir: Directory where non-blurry images will be saved.
         threshold: Laplacian variance threshold below which images are considered blurry.
+        reduction: Decode at 1/reduction size before scoring (1, 2, 4 or 8).
+        chunk_size: Number of images scored per worker task.
+        workers: Number of scoring threads; defaults to the CPU count.
+        transfer: How non-blurry frames are handed on: "link" (hardlink, copy
+            as fallback), "copy" or "manifest" (left in place).
+        cache: Feature cache for blur scores.
 
     Returns:
-        List of non-blurry image paths in output_dir.
+        List of non-blurry image paths.
     """
     logging.info(f"Starting Blur detection on {len(frames)} frames")
 
+    scores = compute_blur_scores(
+        frames,
+        reduction=reduction,
+        chunk_size=chunk_size,
+        workers=workers,
+        cache=cache,
+    )
+
     cleaned = []
     blur_frames_count = 0
 
-    for image_path in frames:
-        img = cv2.imread(str(image_path))
-        if img is None:
+    for image_path, var in zip(frames, scores):
+        if np.isnan(var):
             logging.warning(f"Unreadable image: {image_path}")
             continue
 
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        var = variance_of_laplacian(gray)
-
         if var >= threshold:
-            dest = output_dir / image_path.name
-            shutil.copy2(image_path, dest)
+            dest = transfer_file(image_path, output_dir, transfer)
             cleaned.append(dest)
         else:
             logging.info(f"Skipping blurry frame: {image_path.name} (score={var:.2f})")
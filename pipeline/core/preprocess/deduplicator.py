@@ -1,53 +1,236 @@
-import shutil
 import logging
+import itertools
 from pathlib import Path
-from typing import List, Tuple, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
 from PIL import Image
-import imagehash
 
+from pipeline.core.extract.extractor import frame_index
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.core.preprocess.hash_store import HashStore
+from pipeline.core.preprocess.hash_index import (
+    MultiIndexHashIndex,
+    RecentHashWindow,
+    hash_bits,
+)
+from pipeline.core.preprocess.phash import batch_phash, packed_to_int, phash_input
+from pipeline.utils.paths import transfer_file
 from pipeline.utils.timing import timed_step
 
 
+def iter_file_hashes(
+    frames: Iterable[Path],
+    hash_size: int = 8,
+    batch_size: int = 256,
+    cache: Optional[FeatureCache] = None,
+) -> Iterator[Tuple[Path, int]]:
+    """
+    Hash image files in batches with `batch_phash`.
+
+    Images are decoded and shrunk with PIL exactly like `imagehash.phash`,
+    so hashes, and duplicate decisions, match it bit for bit; unreadable
+    images are logged and skipped. `frames` is consumed
+    lazily, one batch at a time. With a `cache`, only frames without a
+    cached hash are decoded.
+
+    Yields:
+        Tuples of (path, packed hash) in the order of `frames`.
+    """
+    frames = iter(frames)
+    while True:
+        batch = list(itertools.islice(frames, batch_size))
+        if not batch:
+            return
+        known: Dict[int, int] = {}
+        digests: List[str] = []
+        if cache is not None:
+            digests = cache.digests(batch)
+            cached = cache.get_hashes(digests, hash_size)
+            known = {i: cached[d] for i, d in enumerate(digests) if d in cached}
+
+        positions, inputs = [], []
+        for i, img_file in enumerate(batch):
+            if i in known:
+                continue
+            try:
+                with Image.open(img_file) as img:
+                    inputs.append(phash_input(img, hash_size))
+            except OSError as e:
+                logging.warning(f"Skipping {img_file.name}: cannot compute hash ({e})")
+                continue
+            positions.append(i)
+        if inputs:
+            packed = batch_phash(np.stack(inputs), hash_size)
+            computed = {i: packed_to_int(row) for i, row in zip(positions, packed)}
+            known.update(computed)
+            if cache is not None:
+                cache.put_hashes(
+                    [(digests[i], h) for i, h in computed.items()], hash_size
+                )
+
+        for i, img_file in enumerate(batch):
+            if i in known:
+                yield img_file, known[i]
+
+
+def duplicate_filter(
+    hash_size: int = 8,
+    threshold: int = 5,
+    window: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    store: Optional[HashStore] = None,
+) -> Callable[[int, float], bool]:
+    """
+    Build a stateful `is_duplicate(hash, seconds)` check for frames in order.
+
+    Hashes that are not duplicates are remembered for later calls. Without
+    a window every earlier kept frame is compared against (global mode);
+    with `window` and/or `window_seconds` only the last kept frames, or
+    those kept within that many seconds, are.
+
+    With a `store`, frames close to a hash kept by an earlier run are
+    duplicates too, and newly kept hashes are added to the store.
+
+    Args:
+        hash_size: Size of perceptual hash.
+        threshold: Hamming distance threshold for duplicates.
+        window: Compare against at most this many recently kept frames.
+        window_seconds: Compare against frames kept at most this many
+            seconds of video earlier.
+        store: Persistent cross-run index, opened with radius >= `threshold`.
+
+    Returns:
+        Callable taking a packed hash and the frame time in seconds.
+    """
+    if store is not None and store.radius < threshold:
+        raise ValueError(
+            f"Hash store radius {store.radius} is below the threshold {threshold}"
+        )
+
+    if window is None and window_seconds is None:
+        index = MultiIndexHashIndex(hash_bits(hash_size), threshold)
+
+        def seen(packed: int, seconds: float) -> bool:
+            if index.contains_within(packed):
+                return True
+            index.add(packed)
+            return False
+
+    else:
+        recent = RecentHashWindow(threshold, max_items=window, max_age=window_seconds)
+
+        def seen(packed: int, seconds: float) -> bool:
+            if recent.contains_within(packed, at=seconds):
+                return True
+            recent.add(packed, at=seconds)
+            return False
+
+    if store is None:
+        return seen
+
+    def is_duplicate(packed: int, seconds: float) -> bool:
+        if store.contains_within(packed, pending=False) or seen(packed, seconds):
+            return True
+        store.add(packed)
+        return False
+
+    return is_duplicate
+
+
+def iter_unique_frames(
+    frames: Iterable[Path],
+    hash_size: int = 8,
+    threshold: int = 5,
+    window: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    fps: Optional[float] = None,
+    batch_size: int = 256,
+    cache: Optional[FeatureCache] = None,
+    store: Optional[HashStore] = None,
+) -> Iterator[Tuple[Path, bool]]:
+    """
+    Classify frames as they arrive, without needing the full list up front.
+
+    Args:
+        frames: Image file paths in temporal order; may be a generator.
+        hash_size: Size of perceptual hash.
+        threshold: Hamming distance threshold for duplicates.
+        window: Compare against at most this many recently kept frames.
+        window_seconds: Compare against frames kept at most this many seconds
+            earlier; frame times come from `frame_index` and `fps`.
+        fps: Video frame rate, required with `window_seconds`.
+        batch_size: Number of images hashed per batch.
+        cache: Feature cache for perceptual hashes.
+        store: Persistent hash store of frames kept by earlier runs.
+
+    Yields:
+        Tuples of (path, is_duplicate); unreadable images are skipped.
+    """
+    if window_seconds is not None and not fps:
+        raise ValueError("fps is required with window_seconds")
+
+    frame_seconds = 1.0 / fps if window_seconds is not None and fps else 0.0
+    is_duplicate = duplicate_filter(
+        hash_size, threshold, window, window_seconds, store=store
+    )
+    for img_file, packed in iter_file_hashes(
+        frames, hash_size, batch_size, cache=cache
+    ):
+        seconds = frame_index(img_file) * frame_seconds if frame_seconds else 0.0
+        yield img_file, is_duplicate(packed, seconds)
+
+
 @timed_step("dedublication", flat=True)
 def dedupe_frames(
     frames: List[Path],
     output_dir: Path,
     hash_size: int = 8,
     threshold: int = 5,
+    window: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    fps: Optional[float] = None,
+    transfer: str = "link",
+    cache: Optional[FeatureCache] = None,
+    store: Optional[HashStore] = None,
 ) -> Tuple[List[Any], Any]:
     """
-    Deduplicate a list of image paths, copying unique ones to output_dir.
+    Deduplicate a list of image paths, linking unique ones into output_dir.
 
     Args:
         frames: List of image file paths to deduplicate.
         output_dir: Directory where unique frames will be saved.
         hash_size: Size of perceptual hash.
         threshold: Hamming distance threshold for duplicates.
+        window: Only compare against this many recently kept frames.
+        window_seconds: Only compare against frames kept within this many
+            seconds of video.
+        fps: Video frame rate, required with `window_seconds`.
+        transfer: How unique frames are handed on: "link" (hardlink, copy as
+            fallback), "copy" or "manifest" (left in place).
+        cache: Feature cache for perceptual hashes.
+        store: Persistent hash store; frames near a hash kept by an earlier
+            run count as duplicates.
 
     Returns:
-        List of paths to the unique frames in output_dir.
+        List of paths to the unique frames.
     """
     logging.info(f"Starting deduplication on {len(frames)} frames")
 
-    seen_hashes: List = []
     unique_paths: List = []
     dublicate_count: int = 0
 
-    for img_file in sorted(frames):
-        try:
-            img = Image.open(img_file)
-            phash = imagehash.phash(img, hash_size=hash_size)
-        except Exception as e:
-            logging.warning(f"Skipping {img_file.name}: cannot compute hash ({e})")
-            continue
-
-        is_duplicate = any(phash - h <= threshold for h in seen_hashes)
-
+    for img_file, is_duplicate in iter_unique_frames(
+        sorted(frames),
+        hash_size=hash_size,
+        threshold=threshold,
+        window=window,
+        window_seconds=window_seconds,
+        fps=fps,
+        cache=cache,
+        store=store,
+    ):
         if not is_duplicate:
-            seen_hashes.append(phash)
-            dest = output_dir / img_file.name
-            if not dest.exists():
-                shutil.copy2(img_file, dest)
+            dest = transfer_file(img_file, output_dir, transfer)
             unique_paths.append(dest)
         else:
             logging.debug(f"Duplicate frame detected: {img_file.name}")
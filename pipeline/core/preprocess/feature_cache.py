@@ -0,0 +1,89 @@
+from typing import Dict, Iterable, Tuple
+from pipeline.core.preprocess.hash_index import hash_bits
+from pipeline.utils.digest_cache import DigestCache
+
+FEATURE_CACHE_NAME = "feature_cache.sqlite"
+
+# Bump when blur scoring or hashing changes so stale features are dropped
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blur_scores (
+    digest TEXT NOT NULL,
+    reduction INTEGER NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (digest, reduction)
+);
+CREATE TABLE IF NOT EXISTS phashes (
+    digest TEXT NOT NULL,
+    hash_size INTEGER NOT NULL,
+    reduction INTEGER NOT NULL,
+    phash BLOB NOT NULL,
+    PRIMARY KEY (digest, hash_size, reduction)
+);
+"""
+
+
+class FeatureCache(DigestCache):
+    """
+    Persistent SQLite store of per-frame blur scores and perceptual hashes.
+
+    Features are keyed by the content digest of the frame file plus the
+    parameters they depend on (`reduction` for blur scores, `hash_size` and
+    the decode `reduction` for hashes, since a hash of a reduced decode
+    differs from the full-size one), so re-running preprocessing with
+    different thresholds only re-applies the thresholds. Digests are
+    memoized as described in `DigestCache`.
+    """
+
+    kind = "feature cache"
+    schema_version = SCHEMA_VERSION
+    schema = _SCHEMA
+    tables = ("blur_scores", "phashes")
+
+    def get_blur_scores(
+        self, digests: Iterable[str], reduction: int
+    ) -> Dict[str, float]:
+        """Cached blur scores for the given digests, by digest."""
+        rows = self._select(
+            f"SELECT digest, score FROM blur_scores WHERE reduction = {int(reduction)} "
+            "AND digest IN",
+            list(digests),
+        )
+        return dict(rows)
+
+    def put_blur_scores(
+        self, items: Iterable[Tuple[str, float]], reduction: int
+    ) -> None:
+        """Store (digest, score) pairs computed at `reduction`."""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO blur_scores VALUES (?, ?, ?)",
+            [(digest, reduction, float(score)) for digest, score in items],
+        )
+        self._conn.commit()
+
+    def get_hashes(
+        self, digests: Iterable[str], hash_size: int, reduction: int = 1
+    ) -> Dict[str, int]:
+        """Cached packed perceptual hashes for the given digests, by digest."""
+        rows = self._select(
+            f"SELECT digest, phash FROM phashes WHERE hash_size = {int(hash_size)} "
+            f"AND reduction = {int(reduction)} AND digest IN",
+            list(digests),
+        )
+        return {digest: int.from_bytes(blob, "big") for digest, blob in rows}
+
+    def put_hashes(
+        self, items: Iterable[Tuple[str, int]], hash_size: int, reduction: int = 1
+    ) -> None:
+        """Store (digest, packed hash) pairs computed with `hash_size` from a
+        decode at 1/`reduction` size."""
+        nbytes = hash_bits(hash_size) // 8
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO phashes VALUES (?, ?, ?, ?)",
+            [
+                (digest, hash_size, reduction, packed.to_bytes(nbytes, "big"))
+                for digest, packed in items
+            ],
+        )
+        self._conn.commit()
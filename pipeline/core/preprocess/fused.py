@@ -0,0 +1,261 @@
+import os
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+from pipeline.core.extract.extractor import frame_index
+from pipeline.core.preprocess.blur_detector import (
+    _GRAYSCALE_FLAGS,
+    variance_of_laplacian,
+)
+from pipeline.core.preprocess.deduplicator import duplicate_filter
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.core.preprocess.hash_store import HashStore
+from pipeline.core.preprocess.phash import batch_phash, packed_to_int, phash_input
+from pipeline.utils.paths import transfer_file
+from pipeline.utils.timing import StepMetrics, timed_step
+
+
+class FrameAnalysis:
+    """Blur scores and packed perceptual hashes of a list of frames."""
+
+    def __init__(self, scores: np.ndarray, hashes: List[Optional[int]]):
+        self.scores = scores
+        self.hashes = hashes
+        self.blur_seconds = 0.0
+        self.hash_seconds = 0.0
+
+
+def _analyze_chunk(
+    paths: Sequence[Path], flag: int, hash_size: int
+) -> Tuple[np.ndarray, List[Optional[int]], float, float]:
+    scores = np.full(len(paths), np.nan)
+    inputs, readable = [], []
+    blur_seconds = hash_seconds = 0.0
+    for i, path in enumerate(paths):
+        t0 = time.perf_counter()
+        gray = cv2.imread(str(path), flag)
+        if gray is None:
+            continue
+        scores[i] = variance_of_laplacian(gray)
+        t1 = time.perf_counter()
+        inputs.append(phash_input(gray, hash_size))
+        readable.append(i)
+        blur_seconds += t1 - t0
+        hash_seconds += time.perf_counter() - t1
+
+    t0 = time.perf_counter()
+    hashes: List[Optional[int]] = [None] * len(paths)
+    if inputs:
+        packed = batch_phash(np.stack(inputs), hash_size)
+        for i, row in zip(readable, packed):
+            hashes[i] = packed_to_int(row)
+    hash_seconds += time.perf_counter() - t0
+    return scores, hashes, blur_seconds, hash_seconds
+
+
+def analyze_frames(
+    frames: Sequence[Path],
+    hash_size: int = 8,
+    reduction: int = 1,
+    chunk_size: int = 64,
+    workers: Optional[int] = None,
+    cache: Optional[FeatureCache] = None,
+) -> FrameAnalysis:
+    """
+    Decode every frame once and compute its blur score and perceptual hash.
+
+    Each image is decoded straight to grayscale (optionally at reduced size);
+    the Laplacian variance and the hash input are both taken from that one
+    buffer. Chunks run on a thread pool like `compute_blur_scores`. At full
+    size, hashes of JPEG frames match those of `dedupe_frames`; hashes of a
+    reduced decode differ from them by a few bits.
+
+    Args:
+        frames: Image file paths.
+        hash_size: Size of perceptual hash.
+        reduction: Decode at 1/reduction size (1, 2, 4 or 8).
+        chunk_size: Number of images analyzed per task.
+        workers: Number of threads; defaults to the CPU count.
+        cache: Feature cache; only frames missing a cached score or hash
+            are decoded.
+
+    Returns:
+        FrameAnalysis indexed like `frames`; unreadable images have a NaN
+        score and a None hash. `blur_seconds` / `hash_seconds` hold the
+        CPU time spent on each, decoding counted as blur.
+    """
+    if reduction not in _GRAYSCALE_FLAGS:
+        raise ValueError(
+            f"reduction must be one of {sorted(_GRAYSCALE_FLAGS)}, got {reduction}"
+        )
+    if not frames:
+        return FrameAnalysis(np.empty(0), [])
+
+    if cache is not None:
+        return _analyze_cached(frames, hash_size, reduction, chunk_size, workers, cache)
+
+    flag = _GRAYSCALE_FLAGS[reduction]
+    chunks = [frames[i : i + chunk_size] for i in range(0, len(frames), chunk_size)]
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(
+            pool.map(lambda chunk: _analyze_chunk(chunk, flag, hash_size), chunks)
+        )
+
+    analysis = FrameAnalysis(
+        np.concatenate([r[0] for r in results]),
+        [h for r in results for h in r[1]],
+    )
+    analysis.blur_seconds = sum(r[2] for r in results)
+    analysis.hash_seconds = sum(r[3] for r in results)
+    return analysis
+
+
+def _analyze_cached(
+    frames: Sequence[Path],
+    hash_size: int,
+    reduction: int,
+    chunk_size: int,
+    workers: Optional[int],
+    cache: FeatureCache,
+) -> FrameAnalysis:
+    digests = cache.digests(frames)
+    scores = cache.get_blur_scores(digests, reduction)
+    hashes = cache.get_hashes(digests, hash_size, reduction)
+    missing = [i for i, d in enumerate(digests) if d not in scores or d not in hashes]
+    logging.info(f"Feature cache: {len(frames) - len(missing)} hits")
+
+    analysis = FrameAnalysis(
+        np.array([scores.get(d, np.nan) for d in digests]),
+        [hashes.get(d) for d in digests],
+    )
+    if missing:
+        fresh = analyze_frames(
+            [frames[i] for i in missing], hash_size, reduction, chunk_size, workers
+        )
+        computed = [
+            (digests[i], score, packed)
+            for i, score, packed in zip(missing, fresh.scores, fresh.hashes)
+            if packed is not None
+        ]
+        cache.put_blur_scores([(d, score) for d, score, _ in computed], reduction)
+        cache.put_hashes(
+            [(d, packed) for d, _, packed in computed], hash_size, reduction
+        )
+        analysis.scores[missing] = fresh.scores
+        for i, packed in zip(missing, fresh.hashes):
+            analysis.hashes[i] = packed
+        analysis.blur_seconds = fresh.blur_seconds
+        analysis.hash_seconds = fresh.hash_seconds
+    return analysis
+
+
+@timed_step("fused_preprocessing", flat=True)
+def fused_preprocess(
+    frames: List[Path],
+    output_dir: Path,
+    blur_threshold: Optional[float] = None,
+    dedup_threshold: Optional[int] = None,
+    hash_size: int = 8,
+    reduction: int = 1,
+    window: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    fps: Optional[float] = None,
+    chunk_size: int = 64,
+    workers: Optional[int] = None,
+    transfer: str = "link",
+    cache: Optional[FeatureCache] = None,
+    store: Optional[HashStore] = None,
+) -> Tuple[List[Path], int, int, StepMetrics]:
+    """
+    Apply blur filtering and deduplication in one decode pass.
+
+    Frames are processed in order: blurry frames are dropped first, then
+    the remaining ones are checked for near-duplicates exactly as in
+    `dedupe_frames`. Only the surviving frames are handed on, once.
+
+    The wall time of the pass is split between `blur_detection` and
+    `dedublication` in the timing dict in proportion to the time spent
+    scoring and hashing.
+
+    Args:
+        frames: List of input image file paths.
+        output_dir: Directory where surviving frames will be saved.
+        blur_threshold: Laplacian variance threshold; None disables blur filtering.
+        dedup_threshold: Hamming distance threshold; None disables deduplication.
+        hash_size: Size of perceptual hash.
+        reduction: Decode at 1/reduction size (1, 2, 4 or 8). Blur thresholds
+            must be tuned per reduction.
+        window: Only compare against this many recently kept frames.
+        window_seconds: Only compare against frames kept within this many
+            seconds of video.
+        fps: Video frame rate, required with `window_seconds`.
+        chunk_size: Number of images analyzed per worker task.
+        workers: Number of analysis threads; defaults to the CPU count.
+        transfer: How surviving frames are handed on: "link" (hardlink, copy
+            as fallback), "copy" or "manifest" (left in place).
+        cache: Feature cache for blur scores and hashes.
+        store: Persistent hash store of frames kept by earlier runs.
+
+    Returns:
+        Tuple of (surviving paths, blurry count, duplicate count).
+    """
+    if window_seconds is not None and not fps:
+        raise ValueError("fps is required with window_seconds")
+    logging.info(f"Starting fused preprocessing on {len(frames)} frames")
+    t0 = time.perf_counter()
+
+    frames = sorted(frames)
+    analysis = analyze_frames(
+        frames,
+        hash_size=hash_size,
+        reduction=reduction,
+        chunk_size=chunk_size,
+        workers=workers,
+        cache=cache,
+    )
+    frame_seconds = 1.0 / fps if window_seconds is not None and fps else 0.0
+    is_duplicate = None
+    if dedup_threshold is not None:
+        is_duplicate = duplicate_filter(
+            hash_size, dedup_threshold, window, window_seconds, store=store
+        )
+
+    kept: List[Path] = []
+    blurry_count = 0
+    duplicate_count = 0
+    for image_path, score, packed in zip(frames, analysis.scores, analysis.hashes):
+        if packed is None:
+            logging.warning(f"Unreadable image: {image_path}")
+            continue
+        if blur_threshold is not None and score < blur_threshold:
+            logging.info(
+                f"Skipping blurry frame: {image_path.name} (score={score:.2f})"
+            )
+            blurry_count += 1
+            continue
+        if is_duplicate is not None:
+            seconds = frame_index(image_path) * frame_seconds if frame_seconds else 0.0
+            if is_duplicate(packed, seconds):
+                logging.debug(f"Duplicate frame detected: {image_path.name}")
+                duplicate_count += 1
+                continue
+        dest = transfer_file(image_path, output_dir, transfer)
+        kept.append(dest)
+
+    elapsed = time.perf_counter() - t0
+    work = analysis.blur_seconds + analysis.hash_seconds
+    blur_share = analysis.blur_seconds / work if work > 0 else 0.5
+    logging.info(f"Fused preprocessing complete: {len(kept)} frames kept")
+    return (
+        kept,
+        blurry_count,
+        duplicate_count,
+        StepMetrics(
+            blur_detection=elapsed * blur_share,
+            dedublication=elapsed * (1 - blur_share),
+        ),
+    )
@@ -0,0 +1,178 @@
+from collections import deque
+from itertools import combinations
+from typing import Deque, Dict, List, Optional, Tuple
+import imagehash
+import numpy as np
+
+
+def hash_to_int(phash: imagehash.ImageHash) -> int:
+    """Pack an ImageHash's bits (row-major, MSB first) into a Python int."""
+    return int.from_bytes(np.packbits(phash.hash.flatten()).tobytes(), "big")
+
+
+def hash_bits(hash_size: int) -> int:
+    """Number of bits in a packed hash of the given `hash_size` (byte aligned)."""
+    return -(-hash_size * hash_size // 8) * 8
+
+
+def hamming(a: int, b: int) -> int:
+    """Hamming distance between two packed hashes."""
+    return (a ^ b).bit_count()
+
+
+# Narrower chunks make buckets hold ~n / 2**width hashes, which turns lookups
+# back into scans as the index grows
+_MIN_CHUNK_BITS = 20
+# Probing a chunk within s bits costs sum(C(width, k) for k <= s) lookups
+_MAX_CHUNK_RADIUS = 2
+
+
+def _chunk_layout(bits: int, radius: int) -> Tuple[int, int]:
+    """
+    (number of chunks, per-chunk probe radius) for an index of `radius`.
+
+    With m chunks, hashes within `radius` bits differ in at most
+    `radius // m` bits of some chunk. The smallest probe radius whose
+    chunks are at least `_MIN_CHUNK_BITS` wide is used.
+    """
+    for chunk_radius in range(_MAX_CHUNK_RADIUS + 1):
+        chunks = min(radius // (chunk_radius + 1) + 1, bits)
+        if bits // chunks >= _MIN_CHUNK_BITS:
+            break
+    return chunks, radius // chunks
+
+
+def _flip_masks(width: int, radius: int) -> List[int]:
+    """Every mask of at most `radius` set bits among `width` bits."""
+    return [
+        sum(1 << bit for bit in flipped)
+        for k in range(radius + 1)
+        for flipped in combinations(range(width), k)
+    ]
+
+
+class MultiIndexHashIndex:
+    """
+    Near-duplicate index over packed integer hashes under Hamming distance.
+
+    Hashes are split into m disjoint bit chunks, each indexed in its own
+    hash table. Two hashes within `radius` bits of each other differ in at
+    most `radius // m` bits of at least one chunk (pigeonhole principle),
+    so a query only looks up the keys within that many bits of each of its
+    chunks and verifies the stored hashes found there, instead of scanning
+    all of them. Chunks are kept wide (see `_chunk_layout`) so buckets stay
+    small as the index grows. Results are exact: the same decisions as a
+    linear scan.
+    """
+
+    def __init__(self, bits: int, radius: int):
+        if radius < 0:
+            raise ValueError(f"radius must be non-negative, got {radius}")
+        self.bits = bits
+        self.radius = radius
+        chunks, chunk_radius = _chunk_layout(bits, radius)
+        bounds = [bits * i // chunks for i in range(chunks + 1)]
+        self._chunks = [
+            (bounds[i], (1 << (bounds[i + 1] - bounds[i])) - 1) for i in range(chunks)
+        ]
+        self._probes = [
+            _flip_masks(bounds[i + 1] - bounds[i], chunk_radius) for i in range(chunks)
+        ]
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._chunks]
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int) -> None:
+        """Insert a packed hash."""
+        for (shift, mask), table in zip(self._chunks, self._tables):
+            table.setdefault((value >> shift) & mask, []).append(value)
+        self._size += 1
+
+    def query(
+        self, value: int, radius: Optional[int] = None, first_only: bool = False
+    ) -> List[Tuple[int, int]]:
+        """
+        Find stored hashes within `radius` of `value`.
+
+        Args:
+            value: Query hash.
+            radius: Maximum Hamming distance (inclusive), at most the radius
+                the index was built for. Defaults to that radius.
+            first_only: Stop at the first match.
+
+        Returns:
+            List of distinct (hash, distance) pairs.
+        """
+        radius = self.radius if radius is None else radius
+        if radius > self.radius:
+            raise ValueError(
+                f"Index built for radius {self.radius}, cannot query radius {radius}"
+            )
+
+        matches: List[Tuple[int, int]] = []
+        checked = set()
+        for (shift, mask), probes, table in zip(
+            self._chunks, self._probes, self._tables
+        ):
+            key = (value >> shift) & mask
+            for flip in probes:
+                for candidate in table.get(key ^ flip, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+                    distance = hamming(value, candidate)
+                    if distance <= radius:
+                        matches.append((candidate, distance))
+                        if first_only:
+                            return matches
+        return matches
+
+    def contains_within(self, value: int, radius: Optional[int] = None) -> bool:
+        """Whether any stored hash is within `radius` of `value`."""
+        return bool(self.query(value, radius, first_only=True))
+
+
+class RecentHashWindow:
+    """
+    Hashes of the most recently kept frames, for temporally ordered input.
+
+    Only the last `max_items` hashes, and/or those added at most `max_age`
+    time units before the query, are compared against. Each lookup is a
+    linear scan of the window, so memory and per-frame cost stay bounded
+    regardless of how many frames have been seen.
+    """
+
+    def __init__(
+        self,
+        radius: int,
+        max_items: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        if max_items is None and max_age is None:
+            raise ValueError("Either max_items or max_age must be given")
+        if max_items is not None and max_items <= 0:
+            raise ValueError(f"max_items must be positive, got {max_items}")
+        self.radius = radius
+        self.max_age = max_age
+        self._entries: Deque[Tuple[float, int]] = deque(maxlen=max_items)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, at: float) -> None:
+        if self.max_age is None:
+            return
+        while self._entries and at - self._entries[0][0] > self.max_age:
+            self._entries.popleft()
+
+    def add(self, value: int, at: float = 0.0) -> None:
+        """Insert a packed hash kept at time `at`."""
+        self._expire(at)
+        self._entries.append((at, value))
+
+    def contains_within(self, value: int, at: float = 0.0) -> bool:
+        """Whether a hash in the window at time `at` is within `radius` of `value`."""
+        self._expire(at)
+        return any(hamming(value, h) <= self.radius for _, h in self._entries)
@@ -0,0 +1,242 @@
+import os
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+import numpy as np
+from pipeline.core.preprocess.hash_index import MultiIndexHashIndex, hash_bits
+from pipeline.core.preprocess.phash import hamming_distances
+
+HASHES_NAME = "hashes.bin"
+SOURCES_NAME = "sources.bin"
+META_NAME = "meta.json"
+
+# Rows converted to chunk keys at a time while building the index
+_BUILD_BLOCK = 1 << 20
+# Candidates verified per vectorized popcount call during a lookup
+_VERIFY_BLOCK = 4096
+
+
+def _chunk_bounds(bits: int, radius: int) -> List[Tuple[int, int]]:
+    chunks = min(radius + 1, bits)
+    bounds = [bits * i // chunks for i in range(chunks + 1)]
+    return [(bounds[i], bounds[i + 1]) for i in range(chunks)]
+
+
+def _chunk_keys(packed: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """uint64 key of bits [lo, hi) of each packed row (its first 64 bits if wider)."""
+    bits = np.unpackbits(packed, axis=1)[:, lo : min(hi, lo + 64)]
+    padded = np.zeros((len(packed), 64), dtype=np.uint8)
+    padded[:, 64 - bits.shape[1] :] = bits
+    return np.packbits(padded, axis=1).view(">u8").ravel().astype(np.uint64)
+
+
+def _int_chunk_key(packed: int, bits: int, lo: int, hi: int) -> int:
+    """`_chunk_keys` for a single hash held as an int."""
+    width = min(hi - lo, 64)
+    return (packed >> (bits - lo - width)) & ((1 << width) - 1)
+
+
+def source_id(source: str) -> int:
+    """Non-zero 64-bit id stored next to each hash for its source (e.g. video)."""
+    digest = hashlib.blake2b(source.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class HashStore:
+    """
+    On-disk, append-only store of kept frame hashes, shared across runs.
+
+    Each partition (e.g. one camera or site) is a directory holding the
+    packed hashes as fixed-size rows in `hashes.bin`, memory-mapped on open.
+    Lookups use multi-index hashing like `MultiIndexHashIndex`, but with
+    sorted numpy key arrays per bit chunk: candidates sharing a chunk are
+    found with `searchsorted` and verified with a vectorized XOR-popcount
+    against the mapped rows. Hashes added during a run are kept in memory
+    and appended to the file by `flush`, so several runs can extend the
+    same partition over time.
+
+    Each row also records the id of the `source` that kept it, in
+    `sources.bin`. Lookups skip rows of the store's own source, so
+    re-running a video (after a failed run, or with other thresholds) does
+    not drop its frames as duplicates of themselves; re-committing a hash
+    the source already stored is a no-op.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        partition: str = "default",
+        hash_size: int = 8,
+        radius: int = 5,
+        source: Optional[str] = None,
+    ):
+        self.path = Path(root) / partition
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.hash_size = hash_size
+        self.radius = radius
+        self.bits = hash_bits(hash_size)
+        self.row_bytes = self.bits // 8
+        self.source_id = source_id(source) if source is not None else 0
+        self._check_meta()
+
+        self._rows = self._map_rows()
+        self._sources = self._read_sources(len(self._rows))
+        self._own: Set[int] = set()
+        if self.source_id:
+            self._own = {
+                int.from_bytes(row.tobytes(), "big")
+                for row in self._rows[self._sources == self.source_id]
+            }
+        self._chunks = _chunk_bounds(self.bits, radius)
+        self._keys: List[np.ndarray] = []
+        self._order: List[np.ndarray] = []
+        for lo, hi in self._chunks:
+            keys = np.concatenate(
+                [np.empty(0, dtype=np.uint64)]
+                + [
+                    _chunk_keys(self._rows[i : i + _BUILD_BLOCK], lo, hi)
+                    for i in range(0, len(self._rows), _BUILD_BLOCK)
+                ]
+            )
+            order = np.argsort(keys, kind="stable")
+            self._keys.append(keys[order])
+            self._order.append(order)
+
+        self._pending = MultiIndexHashIndex(self.bits, radius)
+        self._pending_rows: List[int] = []
+        logging.info(f"Opened hash store {self.path} with {len(self._rows)} hashes")
+
+    def _check_meta(self) -> None:
+        meta_path = self.path / META_NAME
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta.get("hash_size") != self.hash_size:
+                raise ValueError(
+                    f"Hash store {self.path} holds hash_size {meta.get('hash_size')} "
+                    f"hashes, not {self.hash_size}"
+                )
+        else:
+            meta_path.write_text(json.dumps({"hash_size": self.hash_size}))
+
+    def _repair(self) -> int:
+        """
+        Cut a torn final row left by an interrupted append, and pad or cut
+        `sources.bin` to one id per row, so later appends stay aligned.
+
+        Returns:
+            The number of whole rows.
+        """
+        data_path = self.path / HASHES_NAME
+        size = data_path.stat().st_size if data_path.exists() else 0
+        count = size // self.row_bytes
+        if size != count * self.row_bytes:
+            logging.warning(f"Dropping a torn hash row from {data_path}")
+            os.truncate(data_path, count * self.row_bytes)
+
+        sources_path = self.path / SOURCES_NAME
+        stored = sources_path.stat().st_size if sources_path.exists() else 0
+        keep = min(stored // 8, count) * 8
+        if stored != keep:
+            os.truncate(sources_path, keep)
+        if keep < count * 8:
+            # Rows whose source id was never written get id 0 (unknown)
+            self._append(SOURCES_NAME, bytes(count * 8 - keep))
+        return count
+
+    def _map_rows(self) -> np.ndarray:
+        data_path = self.path / HASHES_NAME
+        count = self._repair()
+        if count == 0:
+            return np.empty((0, self.row_bytes), dtype=np.uint8)
+        rows = np.memmap(
+            data_path, dtype=np.uint8, mode="r", shape=(count, self.row_bytes)
+        )
+        # A plain ndarray view of the mapping skips memmap's per-index overhead
+        return np.asarray(rows)
+
+    def _read_sources(self, count: int) -> np.ndarray:
+        if count == 0:
+            return np.empty(0, dtype=np.uint64)
+        # `_repair` left exactly one id per row
+        return np.fromfile(self.path / SOURCES_NAME, dtype="<u8").astype(np.uint64)
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pending)
+
+    def _to_row(self, packed: int) -> np.ndarray:
+        return np.frombuffer(packed.to_bytes(self.row_bytes, "big"), dtype=np.uint8)
+
+    def contains_within(self, packed: int, pending: bool = True) -> bool:
+        """
+        Whether a stored hash is within `radius` bits of `packed`.
+
+        Args:
+            packed: Query hash.
+            pending: Also match hashes added since the store was opened.
+        """
+        if pending and self._pending.contains_within(packed):
+            return True
+        if len(self._rows) == 0:
+            return False
+
+        query = self._to_row(packed)[np.newaxis]
+        for (lo, hi), keys, order in zip(self._chunks, self._keys, self._order):
+            key = np.uint64(_int_chunk_key(packed, self.bits, lo, hi))
+            start = np.searchsorted(keys, key, side="left")
+            end = np.searchsorted(keys, key, side="right")
+            for block in range(start, end, _VERIFY_BLOCK):
+                rows = order[block : min(end, block + _VERIFY_BLOCK)]
+                if self.source_id:
+                    rows = rows[self._sources[rows] != self.source_id]
+                    if len(rows) == 0:
+                        continue
+                if hamming_distances(query[0], self._rows[rows]).min() <= self.radius:
+                    return True
+        return False
+
+    def add(self, packed: int) -> None:
+        """Record a kept hash; it is written to disk by `flush`."""
+        self._pending.add(packed)
+        self._pending_rows.append(packed)
+
+    def _append(self, name: str, data: bytes) -> None:
+        fd = os.open(self.path / name, os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    def flush(self) -> None:
+        """Append the hashes added since the last flush to the partition file."""
+        new = [p for p in self._pending_rows if p not in self._own]
+        self._pending_rows = []
+        if not new:
+            return
+        # Hashes first: a crash in between leaves rows without a source id,
+        # never source ids without rows
+        self._append(
+            HASHES_NAME, b"".join(p.to_bytes(self.row_bytes, "big") for p in new)
+        )
+        self._append(
+            SOURCES_NAME, np.full(len(new), self.source_id, dtype="<u8").tobytes()
+        )
+        self._own.update(new)
+        logging.info(f"Added {len(new)} hashes to {self.path}")
+
+    def close(self) -> None:
+        """Release the mapped rows; hashes not yet flushed are discarded."""
+        self._rows = np.empty((0, self.row_bytes), dtype=np.uint8)
+        self._sources = np.empty(0, dtype=np.uint64)
+        self._keys = []
+        self._order = []
+        self._pending_rows = []
+
+    def __enter__(self) -> "HashStore":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.flush()
+        self.close()
@@ -0,0 +1,97 @@
+from typing import Sequence, Union
+import numpy as np
+import scipy.fftpack
+from PIL import Image
+
+# Same oversampling as imagehash.phash: the DCT runs on a (4 * hash_size)^2 image
+HIGHFREQ_FACTOR = 4
+
+# Number of set bits in every byte value, for vectorized popcount
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def phash_input(
+    image: Union[np.ndarray, Image.Image], hash_size: int = 8
+) -> np.ndarray:
+    """
+    Shrink an image to the square grayscale input of `batch_phash`.
+
+    Converts and resizes exactly like `imagehash.phash` (PIL grayscale
+    conversion, Lanczos resampling), so hashes are bit-identical with it
+    for the same pixels.
+
+    Args:
+        image: PIL image, or a BGR or grayscale numpy frame.
+        hash_size: Hash side length.
+    """
+    if isinstance(image, np.ndarray):
+        if image.ndim == 3:
+            image = np.ascontiguousarray(image[..., ::-1])
+        image = Image.fromarray(image)
+    side = hash_size * HIGHFREQ_FACTOR
+    gray = image.convert("L").resize((side, side), Image.Resampling.LANCZOS)
+    return np.asarray(gray)
+
+
+def batch_phash(stack: np.ndarray, hash_size: int = 8) -> np.ndarray:
+    """
+    Compute perceptual hashes for a stack of pre-resized grayscale images.
+
+    Follows `imagehash.phash`: a 2D DCT-II of each image, the top-left
+    `hash_size` x `hash_size` coefficients compared against their median.
+    The DCT runs over the whole batch in one call.
+
+    Args:
+        stack: Array of shape (N, 4 * hash_size, 4 * hash_size), see `phash_input`.
+        hash_size: Hash side length; hashes have hash_size**2 bits.
+
+    Returns:
+        uint8 array of shape (N, ceil(hash_size**2 / 8)) holding the hash bits
+        packed row-major, MSB first (the byte layout of `hash_to_int`).
+    """
+    side = hash_size * HIGHFREQ_FACTOR
+    if stack.ndim != 3 or stack.shape[1:] != (side, side):
+        raise ValueError(
+            f"Expected a stack of shape (N, {side}, {side}), got {stack.shape}"
+        )
+    # The same DCT routine as imagehash, so coefficients match to the last bit
+    coeffs = scipy.fftpack.dct(scipy.fftpack.dct(stack, axis=1), axis=2)
+    low = coeffs[:, :hash_size, :hash_size].reshape(len(stack), -1)
+    bits = low > np.median(low, axis=1, keepdims=True)
+    return np.packbits(bits, axis=1)
+
+
+def frame_phash(image: np.ndarray, hash_size: int = 8) -> int:
+    """Perceptual hash of one in-memory BGR or grayscale frame, as a packed int."""
+    packed = batch_phash(phash_input(image, hash_size)[np.newaxis], hash_size)
+    return packed_to_int(packed[0])
+
+
+def phash_frames(images: Sequence[np.ndarray], hash_size: int = 8) -> np.ndarray:
+    """Resize in-memory frames and hash them as one batch."""
+    if not images:
+        return np.empty((0, -(-hash_size * hash_size // 8)), dtype=np.uint8)
+    stack = np.stack([phash_input(image, hash_size) for image in images])
+    return batch_phash(stack, hash_size)
+
+
+def packed_to_int(packed: np.ndarray) -> int:
+    """Convert one row of `batch_phash` output to a Python int."""
+    return int.from_bytes(packed.tobytes(), "big")
+
+
+def hamming_distances(query: np.ndarray, packed: np.ndarray) -> np.ndarray:
+    """
+    Hamming distances between packed hashes with a vectorized XOR-popcount.
+
+    Args:
+        query: One packed hash of shape (B,), or several of shape (N, B).
+        packed: Packed hashes of shape (M, B).
+
+    Returns:
+        Distances of shape (M,) for a single query, (N, M) otherwise.
+    """
+    if query.ndim == 1:
+        return _POPCOUNT[np.bitwise_xor(packed, query)].sum(axis=1, dtype=np.int64)
+    xor = np.bitwise_xor(query[:, np.newaxis, :], packed[np.newaxis, :, :])
+    return _POPCOUNT[xor].sum(axis=2, dtype=np.int64)
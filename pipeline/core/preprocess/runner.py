@@ -1,8 +1,14 @@
 from pathlib import Path
+from typing import List, Optional
 import typer
 from pipeline.core.preprocess.blur_detector import clean_blurry_frames
 from pipeline.core.preprocess.deduplicator import dedupe_frames
-from pipeline.utils.paths import ensure_dir
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.core.preprocess.fused import fused_preprocess
+from pipeline.core.preprocess.hash_store import HashStore
+from pipeline.utils.paths import TRANSFER_MODES, ensure_dir, write_selection
+
+SELECTION_NAME = "selected_frames.txt"
 
 
 class VideoPreprocessor:
@@ -13,12 +19,38 @@ class VideoPreprocessor:
         blur_threshold: float = 100.0,
         dedub_threshold: int = 5,
         hash_size: int = 16,
+        blur_reduction: int = 1,
+        workers: Optional[int] = None,
+        dedup_window: Optional[int] = None,
+        dedup_window_seconds: Optional[float] = None,
+        fps: Optional[float] = None,
+        fused: bool = False,
+        transfer: str = "link",
+        feature_cache: Optional[Path] = None,
+        hash_store: Optional[Path] = None,
+        hash_partition: str = "default",
+        hash_source: Optional[str] = None,
     ):
+        if transfer not in TRANSFER_MODES:
+            raise ValueError(
+                f"transfer must be one of {TRANSFER_MODES}, got {transfer}"
+            )
         self.enable_blur_detection = enable_blur_detection
         self.enable_deduplication = enable_deduplication
         self.blur_threshold = blur_threshold
         self.dedub_threshold = dedub_threshold
         self.hash_size = hash_size
+        self.blur_reduction = blur_reduction
+        self.workers = workers
+        self.dedup_window = dedup_window
+        self.dedup_window_seconds = dedup_window_seconds
+        self.fps = fps
+        self.fused = fused
+        self.transfer = transfer
+        self.feature_cache = feature_cache
+        self.hash_store = hash_store
+        self.hash_partition = hash_partition
+        self.hash_source = hash_source
 
         self.cleaned_count = 0
         self.deduped_count = 0
@@ -47,12 +79,29 @@ class VideoPreprocessor:
         - Blur removal
         - Deduplication
 
+        Surviving frames are hardlinked into each stage directory by default
+        (copied where links are not possible). With `transfer="manifest"`
+        no frames are written at all; the selection is recorded in
+        `selected_frames.txt` instead, which `run_detection_to_coco` reads.
+
+        With `feature_cache`, blur scores and hashes are stored in (and read
+        back from) a `FeatureCache`, so re-running with other thresholds
+        does not decode the frames again.
+
+        With `hash_store`, deduplication also drops frames close to frames
+        kept by earlier runs in the same `hash_partition` (e.g. the same
+        camera), and records the newly kept frames there once the run
+        succeeds. Frames stored for the same `hash_source` (by default the
+        input directory) are not matched, so re-running a video keeps its
+        frames.
+
         Args:
             input_dir (Path): Directory containing extracted frames.
             output_dir (Path): Final directory to save cleaned/deduplicated frames.
 
         Returns:
-            Path to the final directory with preprocessed frames.
+            Path to the final directory with preprocessed frames, or to the
+            selection manifest.
         """
         # If no preprocessing is enabled, return original frames
         if not self.enable_blur_detection and not self.enable_deduplication:
@@ -60,11 +109,52 @@ class VideoPreprocessor:
 
         frames = sorted(input_dir.glob("*.jpg"))
 
+        cache = None
+        if self.feature_cache is not None:
+            cache = FeatureCache(self.feature_cache)
+        store = None
+        if self.hash_store is not None and self.enable_deduplication:
+            store = HashStore(
+                self.hash_store,
+                self.hash_partition,
+                hash_size=self.hash_size,
+                radius=self.dedub_threshold,
+                source=self.hash_source or str(input_dir.resolve()),
+            )
+        try:
+            if self.fused:
+                result = self._run_fused(frames, output_dir, cache, store)
+            else:
+                result = self._run_stages(frames, input_dir, output_dir, cache, store)
+            if store is not None:
+                store.flush()
+        finally:
+            if cache is not None:
+                cache.close()
+            if store is not None:
+                store.close()
+        return result
+
+    def _run_stages(
+        self,
+        frames: List[Path],
+        input_dir: Path,
+        output_dir: Path,
+        cache: Optional[FeatureCache],
+        store: Optional[HashStore],
+    ) -> Path:
+        """Run blur detection and deduplication one after the other."""
         if self.enable_blur_detection:
             typer.secho("🔍 Removing blurry frames...", fg=typer.colors.BRIGHT_CYAN)
-            output_dir_tmp = ensure_dir(output_dir / "cleaned_frames")
+            output_dir_tmp = self._stage_dir(output_dir / "cleaned_frames")
             frames, blur_frames_count, blur_timing = clean_blurry_frames(
-                frames, output_dir_tmp, threshold=self.blur_threshold
+                frames,
+                output_dir_tmp,
+                threshold=self.blur_threshold,
+                reduction=self.blur_reduction,
+                workers=self.workers,
+                transfer=self.transfer,
+                cache=cache,
             )
             self.blur_timing = blur_timing
             self.cleaned_count = blur_frames_count
@@ -72,15 +162,72 @@ class VideoPreprocessor:
 
         if self.enable_deduplication:
             typer.secho("🔁 Deduplicating frames...", fg=typer.colors.BRIGHT_CYAN)
-            output_dir_tmp = ensure_dir(output_dir / "deduplicated_frames")
+            output_dir_tmp = self._stage_dir(output_dir / "deduplicated_frames")
             frames, dublicate_count, dedub_timing = dedupe_frames(
                 frames,
                 output_dir_tmp,
                 hash_size=self.hash_size,
                 threshold=self.dedub_threshold,
+                window=self.dedup_window,
+                window_seconds=self.dedup_window_seconds,
+                fps=self.fps,
+                transfer=self.transfer,
+                cache=cache,
+                store=store,
             )
             self.dedup_timing = dedub_timing
             self.deduped_count = dublicate_count
             input_dir = output_dir_tmp
 
-        return input_dir
+        return self._result(frames, input_dir, output_dir)
+
+    def _run_fused(
+        self,
+        frames: List[Path],
+        output_dir: Path,
+        cache: Optional[FeatureCache],
+        store: Optional[HashStore],
+    ) -> Path:
+        """Decode each frame once and apply both filters in a single sweep."""
+        typer.secho(
+            "🔍 Removing blurry and duplicate frames in one pass...",
+            fg=typer.colors.BRIGHT_CYAN,
+        )
+        output_dir_tmp = self._stage_dir(output_dir / "filtered_frames")
+        frames, blur_frames_count, dublicate_count, timing = fused_preprocess(
+            frames,
+            output_dir_tmp,
+            blur_threshold=self.blur_threshold if self.enable_blur_detection else None,
+            dedup_threshold=self.dedub_threshold if self.enable_deduplication else None,
+            hash_size=self.hash_size,
+            reduction=self.blur_reduction,
+            window=self.dedup_window,
+            window_seconds=self.dedup_window_seconds,
+            fps=self.fps,
+            workers=self.workers,
+            transfer=self.transfer,
+            cache=cache,
+            store=store,
+        )
+        if self.enable_blur_detection:
+            self.blur_timing = {"blur_detection": timing["blur_detection"]}
+            self.cleaned_count = blur_frames_count
+        if self.enable_deduplication:
+            self.dedup_timing = {"dedublication": timing["dedublication"]}
+            self.deduped_count = dublicate_count
+        return self._result(frames, output_dir_tmp, output_dir)
+
+    def _stage_dir(self, path: Path) -> Path:
+        # Manifest mode leaves frames in place, so stages need no directories
+        if self.transfer == "manifest":
+            return path
+        # Later stages read the whole directory, so frames kept by an
+        # earlier run must not survive into this one
+        for stale in path.glob("*.jpg"):
+            stale.unlink()
+        return ensure_dir(path)
+
+    def _result(self, frames: List[Path], stage_dir: Path, output_dir: Path) -> Path:
+        if self.transfer == "manifest":
+            return write_selection(frames, ensure_dir(output_dir) / SELECTION_NAME)
+        return stage_dir
@@ -0,0 +1,158 @@
+import csv
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.core.preprocess.fused import analyze_frames
+from pipeline.core.preprocess.hash_index import MultiIndexHashIndex, hash_bits
+from pipeline.utils.timing import timed_step
+
+
+def parse_grid(spec: str) -> List[float]:
+    """
+    Parse a threshold grid given as "a,b,c" or as "start:stop:step" (inclusive).
+
+    Args:
+        spec: Grid specification.
+
+    Returns:
+        Sorted, unique threshold values.
+    """
+    if ":" in spec:
+        try:
+            start, stop, step = (float(part) for part in spec.split(":"))
+        except ValueError:
+            raise ValueError(f"Invalid grid '{spec}', expected start:stop:step")
+        if step <= 0:
+            raise ValueError(f"Grid step must be positive, got {step}")
+        values = np.arange(start, stop + step / 2, step).round(6).tolist()
+    else:
+        try:
+            values = [float(part) for part in spec.split(",") if part.strip()]
+        except ValueError:
+            raise ValueError(f"Invalid grid '{spec}', expected comma-separated numbers")
+    if not values:
+        raise ValueError(f"Empty grid '{spec}'")
+    return sorted(set(values))
+
+
+def count_unique(hashes: Sequence[int], bits: int, threshold: int) -> int:
+    """Number of frames `dedupe_frames` would keep from these ordered hashes."""
+    index = MultiIndexHashIndex(bits, threshold)
+    for packed in hashes:
+        if not index.contains_within(packed):
+            index.add(packed)
+    return len(index)
+
+
+def sweep_thresholds(
+    scores: np.ndarray,
+    hashes: Sequence[int],
+    clean_thresholds: Sequence[float],
+    dedub_thresholds: Sequence[int],
+    hash_size: int = 8,
+) -> List[Dict]:
+    """
+    Count the frames every threshold combination keeps, from precomputed features.
+
+    Blur counts for the whole grid come from one `searchsorted` over the
+    sorted scores. For each blur threshold, the surviving hashes are
+    deduplicated with a `MultiIndexHashIndex` per dedup threshold, which
+    reproduces the keep/drop decisions of `dedupe_frames` without decoding
+    a single frame.
+
+    Args:
+        scores: Blur scores of the readable frames, in frame order.
+        hashes: Packed perceptual hashes of the same frames.
+        clean_thresholds: Blur (Laplacian variance) thresholds to evaluate.
+        dedub_thresholds: Hamming distance thresholds to evaluate.
+        hash_size: Size of the perceptual hashes.
+
+    Returns:
+        One row per combination with the blurry, duplicate and kept counts.
+    """
+    bits = hash_bits(hash_size)
+    blur_grid = np.asarray(sorted(clean_thresholds), dtype=np.float64)
+    blurry = np.searchsorted(np.sort(scores), blur_grid, side="left")
+
+    hash_array = np.asarray(hashes, dtype=object)
+    rows = []
+    for clean_threshold, blurry_count in zip(blur_grid, blurry):
+        survivors = hash_array[scores >= clean_threshold]
+        for dedub_threshold in sorted(dedub_thresholds):
+            kept = count_unique(survivors, bits, int(dedub_threshold))
+            rows.append(
+                {
+                    "clean_threshold": float(clean_threshold),
+                    "dedub_threshold": int(dedub_threshold),
+                    "blurry": int(blurry_count),
+                    "duplicates": len(survivors) - kept,
+                    "kept": kept,
+                }
+            )
+    return rows
+
+
+@timed_step("threshold_sweep", flat=True)
+def run_threshold_sweep(
+    frames: List[Path],
+    clean_thresholds: Sequence[float],
+    dedub_thresholds: Sequence[int],
+    hash_size: int = 8,
+    reduction: int = 1,
+    workers: Optional[int] = None,
+    cache: Optional[FeatureCache] = None,
+) -> List[Dict]:
+    """
+    Compute blur scores and hashes once, then evaluate a grid of thresholds.
+
+    Args:
+        frames: Extracted frame paths.
+        clean_thresholds: Blur thresholds to evaluate.
+        dedub_thresholds: Hamming distance thresholds to evaluate.
+        hash_size: Size of perceptual hash.
+        reduction: Decode at 1/reduction size for blur scoring (1, 2, 4 or 8).
+        workers: Number of analysis threads; defaults to the CPU count.
+        cache: Feature cache, so later sweeps and runs skip decoding.
+
+    Returns:
+        Rows as returned by `sweep_thresholds`.
+    """
+    logging.info(f"Analyzing {len(frames)} frames for threshold sweep")
+    analysis = analyze_frames(
+        sorted(frames),
+        hash_size=hash_size,
+        reduction=reduction,
+        workers=workers,
+        cache=cache,
+    )
+    readable = [i for i, packed in enumerate(analysis.hashes) if packed is not None]
+    hashes = [packed for packed in analysis.hashes if packed is not None]
+    if len(readable) < len(frames):
+        logging.warning(f"Skipping {len(frames) - len(readable)} unreadable frames")
+    return sweep_thresholds(
+        analysis.scores[readable],
+        hashes,
+        clean_thresholds,
+        dedub_thresholds,
+        hash_size=hash_size,
+    )
+
+
+def save_sweep_csv(rows: List[Dict], path: Path) -> None:
+    """Write sweep rows as CSV."""
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(
+            f,
+            fieldnames=[
+                "clean_threshold",
+                "dedub_threshold",
+                "blurry",
+                "duplicates",
+                "kept",
+            ],
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+    logging.info(f"Saved threshold sweep to {path}")
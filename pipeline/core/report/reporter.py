@@ -1,7 +1,7 @@
 import json
 from collections import defaultdict
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from pipeline.core.report.comet_logger import CometLogger
 
 
@@ -15,6 +15,7 @@ def generate_report(
     timings: Optional[Dict] = None,
     cleaned_frames: Optional[int] = None,
     deduped_frames: Optional[int] = None,
+    write_errors: int = 0,
 ):
     """
     Generate a Markdown report of dataset generation metrics.
@@ -26,12 +27,15 @@ def generate_report(
         coco_path: Path to COCO detection output.
         out_path: File to write the report.
         timings: Optional dict of step durations (in seconds).
+        write_errors: Number of extracted frames that failed to write.
     """
     report_lines = []
     report_lines.append("# Dataset Generation Report\n")
     report_lines.append(f"**Input Video:** `{video_path}`")
     report_lines.append(f"**Total Video Frames:** {total_frames}")
     report_lines.append(f"**Frames Extracted:** {extracted_frame_count}")
+    if write_errors:
+        report_lines.append(f"**Frames Failed to Write:** {write_errors}")
     report_lines.append(
         f"**Frame Drop Ratio:** {1 - extracted_frame_count / total_frames:.2%}\n"
     )
@@ -75,3 +79,64 @@ def generate_report(
                 "pipeline_summary.md": out_path,
             }
         )
+
+
+def generate_batch_report(
+    results: List[Dict],
+    out_path: str = "batch_report.md",
+    timings: Optional[Dict] = None,
+):
+    """
+    Generate a Markdown report aggregating the per-video results of a batch.
+
+    Args:
+        results: Summary dicts returned by the batch scheduler, one per video.
+        out_path: File to write the report.
+        timings: Optional dict of batch-level step durations (in seconds).
+    """
+    totals: Dict = defaultdict(int)
+    succeeded = [r for r in results if r.get("status") == "ok"]
+    for r in succeeded:
+        for key in (
+            "extracted",
+            "write_errors",
+            "cleaned",
+            "deduped",
+            "images_tagged",
+            "annotations",
+        ):
+            totals[key] += r.get(key, 0)
+
+    report_lines = []
+    report_lines.append("# Batch Dataset Generation Report\n")
+    report_lines.append(f"**Videos Processed:** {len(succeeded)}/{len(results)}")
+    report_lines.append(f"**Frames Extracted:** {totals['extracted']}")
+    if totals["write_errors"]:
+        report_lines.append(f"**Frames Failed to Write:** {totals['write_errors']}")
+    report_lines.append(f"**Blury Frames Removed:** {totals['cleaned']}")
+    report_lines.append(f"**Dublicate Frames Removed:** {totals['deduped']}")
+    report_lines.append(f"**Images Tagged:** {totals['images_tagged']}")
+    report_lines.append(f"**Total Detections:** {totals['annotations']}\n")
+
+    report_lines.append("## Videos:")
+    report_lines.append(
+        "| Video | Status | Extracted | Blurry | Duplicates | Tagged | Detections |"
+    )
+    report_lines.append("| --- | --- | --- | --- | --- | --- | --- |")
+    for r in results:
+        if r.get("status") == "ok":
+            report_lines.append(
+                f"| `{r['video']}` | ok | {r['extracted']} | {r['cleaned']} "
+                f"| {r['deduped']} | {r['images_tagged']} | {r['annotations']} |"
+            )
+        else:
+            report_lines.append(
+                f"| `{r['video']}` | failed: {r.get('error', '')} | - | - | - | - | - |"
+            )
+
+    if timings:
+        report_lines.append("\n## Time Breakdown:")
+        for step, duration in timings.items():
+            report_lines.append(f"- {step}: {duration:.2f} sec")
+
+    Path(out_path).write_text("\n".join(report_lines))
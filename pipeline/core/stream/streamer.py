@@ -0,0 +1,239 @@
+import os
+import logging
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+import cv2
+import numpy as np
+from pipeline.core.detect.detector import CocoBuilder
+from pipeline.core.extract.extractor import frame_filename, iter_frames
+from pipeline.core.extract.scene import SceneChangeSelector
+from pipeline.core.preprocess.blur_detector import variance_of_laplacian
+from pipeline.core.preprocess.deduplicator import duplicate_filter
+from pipeline.core.preprocess.phash import frame_phash
+from pipeline.models.base import BaseModelRunner
+from pipeline.utils.image import downscale
+from pipeline.utils.queues import prefetch
+from pipeline.utils.timing import timed_step
+
+
+class StreamFrame:
+    """
+    A decoded frame travelling through the streaming pipeline.
+
+    Preprocessing stages work on `gray`, a grayscale analysis copy that is
+    optionally downscaled to `analysis_side`; `image` is what gets saved and
+    passed to the detector.
+    """
+
+    __slots__ = ("index", "image", "analysis_side", "_gray")
+
+    def __init__(
+        self, index: int, image: np.ndarray, analysis_side: Optional[int] = None
+    ):
+        self.index = index
+        self.image = image
+        self.analysis_side = analysis_side
+        self._gray: Optional[np.ndarray] = None
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Grayscale analysis copy, converted once and shared by all stages."""
+        if self._gray is None:
+            small = downscale(self.image, max_side=self.analysis_side)
+            self._gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+
+class StreamStats:
+    """Per-stage frame counts collected while the stream is consumed."""
+
+    def __init__(self):
+        self.extracted = 0
+        self.blurry = 0
+        self.duplicates = 0
+        self.saved = 0
+        self.write_errors = 0
+        self.images_tagged = 0
+        self.annotations = 0
+
+
+def _count_extracted(
+    frames: Iterator[StreamFrame], stats: StreamStats
+) -> Iterator[StreamFrame]:
+    for frame in frames:
+        stats.extracted += 1
+        yield frame
+
+
+def drop_blurry_frames(
+    frames: Iterator[StreamFrame], threshold: float, stats: StreamStats
+) -> Iterator[StreamFrame]:
+    """Yield only frames whose Laplacian variance reaches `threshold`."""
+    for frame in frames:
+        var = variance_of_laplacian(frame.gray)
+        if var >= threshold:
+            yield frame
+        else:
+            logging.debug(f"Skipping blurry frame {frame.index} (score={var:.2f})")
+            stats.blurry += 1
+
+
+def drop_duplicate_frames(
+    frames: Iterator[StreamFrame],
+    hash_size: int,
+    threshold: int,
+    stats: StreamStats,
+    window: Optional[int] = None,
+    window_seconds: Optional[float] = None,
+    fps: Optional[float] = None,
+) -> Iterator[StreamFrame]:
+    """
+    Yield only frames that are not near-duplicates of an earlier kept frame.
+
+    With `window` / `window_seconds`, only recently kept frames are compared
+    against; see `duplicate_filter`.
+    """
+    if window_seconds is not None and not fps:
+        raise ValueError("fps is required with window_seconds")
+    is_duplicate = duplicate_filter(hash_size, threshold, window, window_seconds)
+    for frame in frames:
+        phash = frame_phash(frame.gray, hash_size=hash_size)
+        seconds = frame.index / fps if fps else 0.0
+        if is_duplicate(phash, seconds):
+            logging.debug(f"Duplicate frame detected: {frame.index}")
+            stats.duplicates += 1
+            continue
+        yield frame
+
+
+@timed_step("streaming_pipeline", flat=True)
+def run_streaming_pipeline(
+    cap: cv2.VideoCapture,
+    output_dir: Path,
+    skip_frequency: int = 1,
+    every_seconds: Optional[float] = None,
+    max_frames: Optional[int] = None,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None,
+    analysis_side: Optional[int] = None,
+    scene_threshold: Optional[float] = None,
+    max_gap: Optional[int] = None,
+    blur_threshold: Optional[float] = None,
+    dedup_threshold: Optional[int] = None,
+    hash_size: int = 8,
+    dedup_window: Optional[int] = None,
+    dedup_window_seconds: Optional[float] = None,
+    model: Optional[BaseModelRunner] = None,
+    coco_output_path: Optional[Path] = None,
+    conf_threshold: float = 0.25,
+    batch_size: int = 1,
+    queue_size: int = 32,
+) -> StreamStats:
+    """
+    Run extraction, preprocessing and detection on in-memory frames.
+
+    Frames are decoded on a background thread into a bounded queue and pass
+    through blur filtering, deduplication and detection as numpy arrays.
+    Only the frames that survive every filter are encoded to JPEG, once,
+    and reach the detector in batches of `batch_size`.
+
+    Args:
+        cap: OpenCV VideoCapture instance (already opened).
+        output_dir: Directory where surviving frames will be saved.
+        skip_frequency: Keep every nth decoded frame.
+        every_seconds: Keep one frame every N seconds of video.
+        max_frames: Keep exactly this many frames, spread evenly over the video.
+        max_side: Maximum length of the longest side of saved frames.
+        size: Exact (width, height) of saved frames; overrides `max_side`.
+        analysis_side: Longest side of the in-memory copy used for blur scoring
+            and hashing. Laplacian variance depends on resolution, so the blur
+            threshold should be tuned for this size.
+        scene_threshold: Minimum mean thumbnail difference (0-255) to keep a
+            decoded frame; None keeps every sampled frame.
+        max_gap: With `scene_threshold`, keep at least one frame every
+            `max_gap` frames.
+        blur_threshold: Laplacian variance threshold; None disables blur filtering.
+        dedup_threshold: Hamming distance threshold; None disables deduplication.
+        hash_size: Size of perceptual hash used for deduplication.
+        dedup_window: Only compare against this many recently kept frames.
+        dedup_window_seconds: Only compare against frames kept within this
+            many seconds of video.
+        model: Detection model; when None no pre-tagging is done.
+        coco_output_path: Path to write COCO-format JSON when `model` is set.
+        conf_threshold: Detection confidence threshold.
+        batch_size: Number of saved frames per detection forward pass.
+        queue_size: Maximum number of decoded frames buffered ahead of processing.
+
+    Returns:
+        StreamStats with per-stage frame counts.
+    """
+    logging.info("Starting streaming pipeline")
+    os.makedirs(output_dir, exist_ok=True)
+
+    stats = StreamStats()
+    select = None
+    if scene_threshold is not None:
+        select = SceneChangeSelector(scene_threshold, max_gap=max_gap)
+    decoded = iter_frames(
+        cap,
+        skip_frequency,
+        every_seconds=every_seconds,
+        max_frames=max_frames,
+        select=select,
+    )
+    frames: Iterator[StreamFrame] = prefetch(
+        (
+            StreamFrame(idx, downscale(image, max_side, size), analysis_side)
+            for idx, image in decoded
+        ),
+        depth=queue_size,
+    )
+    frames = _count_extracted(frames, stats)
+    if blur_threshold is not None:
+        frames = drop_blurry_frames(frames, blur_threshold, stats)
+    if dedup_threshold is not None:
+        frames = drop_duplicate_frames(
+            frames,
+            hash_size,
+            dedup_threshold,
+            stats,
+            window=dedup_window,
+            window_seconds=dedup_window_seconds,
+            fps=cap.get(cv2.CAP_PROP_FPS),
+        )
+
+    coco = CocoBuilder(conf_threshold) if model is not None else None
+    batch_size = max(1, batch_size)
+    pending: List[StreamFrame] = []
+
+    def tag_pending() -> None:
+        if coco is None or model is None or not pending:
+            return
+        images = [frame.image for frame in pending]
+        for frame, result in zip(pending, model.predict_batch(images, batch_size)):
+            coco.add(frame_filename(frame.index), result)
+        pending.clear()
+
+    for frame in frames:
+        filepath = os.path.join(output_dir, frame_filename(frame.index))
+        if not cv2.imwrite(filepath, frame.image):
+            logging.warning(f"Failed to write frame {filepath}")
+            stats.write_errors += 1
+            continue
+        stats.saved += 1
+        if coco is not None:
+            pending.append(frame)
+            if len(pending) >= batch_size:
+                tag_pending()
+    tag_pending()
+
+    if coco is not None:
+        stats.images_tagged = coco.image_count
+        stats.annotations = coco.annotation_count
+        if coco_output_path is not None:
+            coco.save(str(coco_output_path))
+
+    logging.info(
+        f"Streaming pipeline complete: {stats.saved} of {stats.extracted} frames kept"
+    )
+    return stats
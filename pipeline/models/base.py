@@ -1,21 +1,244 @@
+import hashlib
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, List, Dict
+from typing import TYPE_CHECKING, Any, List, Dict, Optional, Sequence, Union
+import numpy as np
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+CHANNEL_ORDERS = ("bgr", "rgb")
+
+# A path to an image file, a decoded numpy frame or a PIL image
+ImageInput = Union[Path, str, np.ndarray, "Image.Image"]
+
+
+def weights_digest(weights: Path) -> str:
+    """Short BLAKE2b digest of a weights file, used to key exports and caches."""
+    h = hashlib.blake2b(digest_size=8)
+    with open(weights, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def check_channel_order(channel_order: str) -> None:
+    if channel_order not in CHANNEL_ORDERS:
+        raise ValueError(
+            f"channel_order must be one of {CHANNEL_ORDERS}, got {channel_order}"
+        )
+
+
+def to_bgr_source(image: ImageInput, channel_order: str = "bgr"):
+    """
+    Normalize an input for OpenCV-style consumers.
+
+    Paths are returned as strings and PIL images unchanged (both carry their
+    own color handling); numpy frames in `channel_order` are returned as BGR.
+    """
+    check_channel_order(channel_order)
+    if isinstance(image, (str, Path)):
+        return str(image)
+    if isinstance(image, np.ndarray):
+        if channel_order == "rgb" and image.ndim == 3:
+            return np.ascontiguousarray(image[..., ::-1])
+        return image
+    return image
+
+
+def to_pil_image(image: ImageInput, channel_order: str = "bgr"):
+    """
+    Normalize an input to a PIL image without decoding files twice.
+
+    Files are opened lazily, so their pixels are decoded once by whoever
+    consumes the image; numpy frames in `channel_order` are converted to RGB.
+
+    Raises:
+        FileNotFoundError: If an image path does not exist.
+        ValueError: If an image file cannot be opened.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    check_channel_order(channel_order)
+    if isinstance(image, (str, Path)):
+        image_path = Path(image)
+        if not image_path.exists():
+            raise FileNotFoundError(f"Image not found: {image_path}")
+        try:
+            return Image.open(image_path)
+        except UnidentifiedImageError as e:
+            raise ValueError(f"Unable to open image: {image_path}") from e
+    if isinstance(image, np.ndarray):
+        if channel_order == "bgr" and image.ndim == 3:
+            image = image[..., ::-1]
+        return Image.fromarray(np.ascontiguousarray(image))
+    return image
+
+
+def labels_for(class_ids: np.ndarray, names: Dict[int, str]) -> np.ndarray:
+    """Label of every class id, looking each distinct class up only once."""
+    unique, inverse = np.unique(class_ids, return_inverse=True)
+    lookup = np.array([names.get(int(c), str(c)) for c in unique], dtype=object)
+    return lookup[inverse.reshape(-1)]
 
 
 class DetectionResult:
-    def __init__(self, boxes: List[Dict[str, Any]], width: int, height: int):
-        self.boxes = boxes  # List of dicts with x1, y1, x2, y2, conf, label
+    """
+    Detections of one image, stored as parallel numpy arrays.
+
+    `xyxy` is an (N, 4) float array of x1, y1, x2, y2 in image pixels,
+    `conf` and `class_ids` hold each box's confidence and class index
+    (-1 when unknown) and `labels` its class name. Thresholding and the
+    COCO xywh/area conversion are vectorized. `boxes` still presents the
+    detections as one dict per box (x1, y1, x2, y2, conf, label, class_id)
+    for code that expects that layout, and the constructor accepts it.
+    """
+
+    __slots__ = ("xyxy", "conf", "class_ids", "labels", "width", "height")
+
+    def __init__(
+        self,
+        boxes: Sequence[Dict[str, Any]] = (),
+        width: int = 0,
+        height: int = 0,
+    ):
+        self.xyxy = np.array(
+            [[b["x1"], b["y1"], b["x2"], b["y2"]] for b in boxes],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        self.conf = np.array([b["conf"] for b in boxes], dtype=np.float64)
+        self.class_ids = np.array(
+            [_class_index(b.get("class_id")) for b in boxes], dtype=np.int64
+        )
+        self.labels = np.array([b["label"] for b in boxes], dtype=object)
         self.width = width
         self.height = height
 
+    @classmethod
+    def from_arrays(
+        cls,
+        xyxy: np.ndarray,
+        conf: np.ndarray,
+        class_ids: np.ndarray,
+        labels: np.ndarray,
+        width: int,
+        height: int,
+    ) -> "DetectionResult":
+        """Build a result directly from per-box arrays, without any dicts."""
+        result = cls(width=width, height=height)
+        result.xyxy = np.asarray(xyxy, dtype=np.float64).reshape(-1, 4)
+        result.conf = np.asarray(conf, dtype=np.float64).reshape(-1)
+        result.class_ids = np.asarray(class_ids, dtype=np.int64).reshape(-1)
+        result.labels = np.asarray(labels, dtype=object).reshape(-1)
+        return result
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+    @property
+    def boxes(self) -> List[Dict[str, Any]]:
+        """Detections as one dict per box, built on access."""
+        return [
+            {
+                "x1": x1,
+                "y1": y1,
+                "x2": x2,
+                "y2": y2,
+                "conf": conf,
+                "label": label,
+                "class_id": class_id,
+            }
+            for (x1, y1, x2, y2), conf, label, class_id in zip(
+                self.xyxy.tolist(),
+                self.conf.tolist(),
+                self.labels.tolist(),
+                self.class_ids.tolist(),
+            )
+        ]
+
+    @property
+    def xywh(self) -> np.ndarray:
+        """(N, 4) boxes as COCO x, y, width, height."""
+        xywh = self.xyxy.copy()
+        xywh[:, 2:] -= xywh[:, :2]
+        return xywh
+
+    @property
+    def areas(self) -> np.ndarray:
+        """Box areas."""
+        return (self.xyxy[:, 2] - self.xyxy[:, 0]) * (self.xyxy[:, 3] - self.xyxy[:, 1])
+
+    def above(self, conf_threshold: float) -> "DetectionResult":
+        """Detections with a confidence of at least `conf_threshold`."""
+        keep = self.conf >= conf_threshold
+        if keep.all():
+            return self
+        return DetectionResult.from_arrays(
+            self.xyxy[keep],
+            self.conf[keep],
+            self.class_ids[keep],
+            self.labels[keep],
+            self.width,
+            self.height,
+        )
+
+
+def _class_index(class_id: Any) -> int:
+    try:
+        return int(class_id)
+    except (TypeError, ValueError):
+        return -1
+
 
 class BaseModelRunner(ABC):
+    """
+    Common interface of detection models.
+
+    Runners accept image paths, PIL images and numpy frames. Numpy frames
+    are read in `channel_order`: "bgr" (the default) for frames decoded by
+    OpenCV, "rgb" for frames from other decoders. Detections scoring below
+    `min_confidence` are discarded by the model itself; callers apply their
+    own, higher, confidence threshold to the results.
+    """
+
+    channel_order: str = "bgr"
+    min_confidence: float = 0.0
+
     @abstractmethod
-    def predict(self, image_path: Path) -> DetectionResult:
+    def predict(self, image: ImageInput) -> DetectionResult:
         """Run inference and return parsed results."""
         pass
 
+    def predict_batch(
+        self, images: Sequence[ImageInput], batch_size: int = 1
+    ) -> List[DetectionResult]:
+        """
+        Run inference on several images, `batch_size` at a time.
+
+        Runners that can batch forward passes override this; the default
+        falls back to one `predict` call per image.
+
+        Args:
+            images: Input images (paths, PIL images or numpy frames).
+            batch_size: Number of images per forward pass.
+
+        Returns:
+            One DetectionResult per image, in input order.
+        """
+        return [self.predict(image) for image in images]
+
+    @property
+    def cache_key(self) -> Optional[str]:
+        """
+        Identity of the model weights and inference settings.
+
+        Results are cached under this key together with `min_confidence`
+        (see `DetectionCache`), so it should not include the confidence
+        floor itself; None, the default, means the runner's results are
+        not cached.
+        """
+        return None
+
     @property
     @abstractmethod
     def class_names(self) -> Dict[int, str]:
@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+from pipeline.models.base import BaseModelRunner
+
+BACKENDS = ("torch", "onnx")
+
+
+def build_model_runner(
+    model_cfg: Dict,
+    threads: Optional[int] = None,
+    calibration_frames: Optional[Sequence[Path]] = None,
+) -> BaseModelRunner:
+    """
+    Create the detection runner selected by the `model` config section.
+
+    Args:
+        model_cfg: The `model` section of the config YAML. `backend` picks
+            "torch" (ultralytics, the default) or "onnx" (ONNX Runtime);
+            the onnx backend also reads `input_size` and `export_dir`, and
+            `quantize` ("dynamic" or "static") with `calibration_size` to
+            run an INT8 model instead. `min_confidence` sets the score below
+            which the model discards detections (default 0.25).
+        threads: Optional cap on inference threads: torch's intra-op
+            threads, or the ONNX Runtime session's `intra_op_num_threads`.
+        calibration_frames: Preprocessed frames of the run, sampled to
+            calibrate a model quantized for the first time.
+
+    Returns:
+        The model runner.
+    """
+    backend = model_cfg.get("backend", "torch")
+    model_path = model_cfg.get("path", "yolov8n.pt")
+    quantize = model_cfg.get("quantize")
+    min_confidence = model_cfg.get("min_confidence", 0.25)
+    if quantize and backend != "onnx":
+        raise ValueError("model.quantize requires model.backend: onnx")
+    if backend == "torch":
+        from pipeline.models.yolo import YOLOv8Runner
+
+        if threads:
+            import torch
+
+            torch.set_num_threads(threads)
+        return YOLOv8Runner(model_path, min_confidence=min_confidence)
+    if backend == "onnx":
+        from pipeline.models.onnx import DEFAULT_EXPORT_DIR, ONNXRunner
+
+        input_size = model_cfg.get("input_size", 640)
+        export_dir = Path(model_cfg.get("export_dir") or DEFAULT_EXPORT_DIR)
+        if quantize:
+            from pipeline.models.quantize import build_quantized_runner
+
+            return build_quantized_runner(
+                model_path,
+                quantize,
+                calibration_frames=calibration_frames,
+                calibration_size=model_cfg.get("calibration_size", 64),
+                input_size=input_size,
+                export_dir=export_dir,
+                batch_size=model_cfg.get("batch_size", 8),
+                threads=threads,
+                min_confidence=min_confidence,
+            )
+        return ONNXRunner(
+            model_path,
+            input_size=input_size,
+            export_dir=export_dir,
+            min_confidence=min_confidence,
+            threads=threads,
+        )
+    raise ValueError(f"model.backend must be one of {BACKENDS}, got {backend}")
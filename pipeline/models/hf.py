@@ -1,9 +1,22 @@
+from contextlib import ExitStack
 from pathlib import Path
-from typing import List, Dict, Any
-from pipeline.models.base import BaseModelRunner, DetectionResult
+from typing import List, Dict, Any, Optional, Sequence
+import numpy as np
+from pipeline.models.base import (
+    BaseModelRunner,
+    DetectionResult,
+    ImageInput,
+    check_channel_order,
+    to_pil_image,
+    weights_digest,
+)
 from transformers import pipeline
 
 
+def _describe(image: ImageInput) -> str:
+    return str(image) if isinstance(image, (str, Path)) else type(image).__name__
+
+
 class HuggingFaceRunner(BaseModelRunner):
     """
     Model runner using a HuggingFace object detection pipeline.
@@ -94,64 +107,126 @@ class HuggingFaceRunner(BaseModelRunner):
         "toothbrush",
     ]
 
-    def __init__(self, model_name: str = "facebook/detr-resnet-50") -> None:
+    def __init__(
+        self,
+        model_name: str = "facebook/detr-resnet-50",
+        channel_order: str = "bgr",
+        min_confidence: float = 0.5,
+        revision: Optional[str] = None,
+    ) -> None:
         """
         Initialize the HuggingFace detection pipeline.
 
         Args:
             model_name: HuggingFace model identifier for object detection.
+            channel_order: Channel order of numpy frames, "bgr" or "rgb".
+            min_confidence: Score below which the pipeline drops detections.
+            revision: Hub branch, tag or commit of the model to load.
         """
+        check_channel_order(channel_order)
+        self.channel_order = channel_order
+        self.model_name = model_name
+        self.min_confidence = min_confidence
+        self._class_index = {name: i for i, name in enumerate(self._coco_classes)}
         try:
-            self.detector = pipeline("object-detection", model=model_name)
+            self.detector = pipeline(
+                "object-detection", model=model_name, revision=revision
+            )
         except Exception as e:
             raise RuntimeError(f"Failed to load HuggingFace model: {e}") from e
 
-    def predict(self, image_path: Path) -> DetectionResult:
+    def predict(self, image: ImageInput) -> DetectionResult:
         """
         Run object detection on an image and return DetectionResult.
 
         Args:
-            image_path: Path to the input image.
+            image: Path to the input image, PIL image or numpy frame.
 
         Returns:
             DetectionResult: structured result with bounding boxes, class names, and image size.
         """
-        from PIL import Image, UnidentifiedImageError
-
-        if not image_path.exists():
-            raise FileNotFoundError(f"Image not found: {image_path}")
+        # The pipeline decodes the lazily opened image itself, so files are read once
+        with ExitStack() as stack:
+            img = self._open(image, stack)
+            try:
+                results = self.detector(img, threshold=self.min_confidence)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Model prediction failed on {_describe(image)}"
+                ) from e
+            return self._to_result(results, img)
+
+    def predict_batch(
+        self, images: Sequence[ImageInput], batch_size: int = 8
+    ) -> List[DetectionResult]:
+        """
+        Run object detection on several images through the pipeline's batching.
 
-        try:
-            img = Image.open(image_path)
-        except UnidentifiedImageError as e:
-            raise ValueError(f"Unable to open image: {image_path}") from e
+        Args:
+            images: Paths to the input images, PIL images or numpy frames.
+            batch_size: Number of images per forward pass.
 
-        try:
-            results = self.detector(str(image_path))
-        except Exception as e:
-            raise RuntimeError(f"Model prediction failed on {image_path}") from e
-
-        boxes: List[Dict[str, Any]] = []
-
-        for r in results:
-            box = r["box"]
-            x1 = box["xmin"]
-            y1 = box["ymin"]
-            x2 = box["xmax"]
-            y2 = box["ymax"]
-            boxes.append(
-                {
-                    "x1": x1,
-                    "y1": y1,
-                    "x2": x2,
-                    "y2": y2,
-                    "conf": r["score"],
-                    "label": r["label"],
-                    "class_id": r["label"],  # Consider mapping label to ID
-                }
-            )
+        Returns:
+            One DetectionResult per image, in input order.
+        """
+        if not images:
+            return []
+
+        with ExitStack() as stack:
+            pil_images = [self._open(image, stack) for image in images]
+            try:
+                results = self.detector(
+                    pil_images,
+                    batch_size=max(1, batch_size),
+                    threshold=self.min_confidence,
+                )
+            except Exception as e:
+                raise RuntimeError(
+                    f"Model prediction failed on batch starting at {_describe(images[0])}"
+                ) from e
+            return [self._to_result(r, img) for r, img in zip(results, pil_images)]
+
+    def _open(self, image: ImageInput, stack: ExitStack):
+        """PIL image for `image`; files opened here are closed when `stack` exits."""
+        img = to_pil_image(image, self.channel_order)
+        if isinstance(image, (str, Path)):
+            stack.enter_context(img)
+        return img
+
+    def _to_result(self, results: List[Dict[str, Any]], img) -> DetectionResult:
+        xyxy = np.array(
+            [
+                [r["box"]["xmin"], r["box"]["ymin"], r["box"]["xmax"], r["box"]["ymax"]]
+                for r in results
+            ],
+            dtype=np.float64,
+        )
+        labels = np.array([r["label"] for r in results], dtype=object)
+        return DetectionResult.from_arrays(
+            xyxy=xyxy,
+            conf=np.array([r["score"] for r in results], dtype=np.float64),
+            class_ids=np.array(
+                [self._class_index.get(label, -1) for label in labels], dtype=np.int64
+            ),
+            labels=labels,
+            width=img.width,
+            height=img.height,
+        )
 
-        return DetectionResult(boxes, width=img.width, height=img.height)
+    @property
+    def cache_key(self) -> Optional[str]:
+        # The hub commit the weights were loaded from; local models are hashed
+        revision = getattr(self.detector.model.config, "_commit_hash", None)
+        if isinstance(revision, str):
+            return f"hf:{self.model_name}@{revision}"
+        weights = sorted(
+            p
+            for pattern in ("*.safetensors", "*.bin")
+            for p in Path(self.model_name).glob(pattern)
+        )
+        if not weights:
+            return None
+        return f"hf:{':'.join(weights_digest(p) for p in weights)}"
 
     @property
     def class_names(self) -> Dict[int, str]:
@@ -0,0 +1,301 @@
+import os
+import ast
+import shutil
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+
+from pipeline.models.base import (
+    BaseModelRunner,
+    DetectionResult,
+    ImageInput,
+    check_channel_order,
+    labels_for,
+    to_bgr_source,
+    weights_digest,
+)
+from pipeline.utils.image import letterbox
+
+DEFAULT_EXPORT_DIR = Path("data/models/exported")
+
+# Offset added per class so one NMS pass never suppresses across classes
+_CLASS_OFFSET = 7680.0
+
+
+def export_path(weights: Path, input_size: int, export_dir: Path) -> Path:
+    """Cache location of the ONNX export of `weights` at `input_size`."""
+    return (
+        Path(export_dir)
+        / f"{Path(weights).stem}-{weights_digest(weights)}-{input_size}.onnx"
+    )
+
+
+def resolve_weights(weights: Path) -> Path:
+    """
+    Local path of `weights`, downloading known ultralytics assets such as
+    `yolov8n.pt` the way `YOLO(...)` would when they are not on disk.
+    """
+    if Path(weights).is_file():
+        return Path(weights)
+    from ultralytics.utils.downloads import attempt_download_asset
+
+    return Path(attempt_download_asset(weights))
+
+
+def export_onnx(
+    weights: Path, input_size: int = 640, export_dir: Path = DEFAULT_EXPORT_DIR
+) -> Path:
+    """
+    Export YOLO weights to ONNX once and reuse the cached file afterwards.
+
+    The export is keyed by the weights' content digest and the input size,
+    so retrained weights or a different input size trigger a new export.
+
+    Args:
+        weights: Path to the ultralytics `.pt` weights, or the name of an
+            ultralytics release asset to download.
+        input_size: Square input side the model is exported for.
+        export_dir: Directory holding exported models.
+
+    Returns:
+        Path to the cached ONNX model.
+    """
+    weights = resolve_weights(weights)
+    target = export_path(weights, input_size, export_dir)
+    if target.exists():
+        logging.info(f"Using cached ONNX export {target}")
+        return target
+
+    from ultralytics import YOLO
+
+    logging.info(f"Exporting {weights} to ONNX at {input_size}px")
+    exported = YOLO(str(weights)).export(format="onnx", imgsz=input_size, dynamic=True)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Move next to the target first (the export may be on another filesystem),
+    # then rename into place so concurrent workers never load a partial file
+    tmp = target.with_suffix(f".{os.getpid()}.tmp")
+    shutil.move(exported, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Each step keeps the best remaining box and drops, in one vectorized
+    comparison, every remaining box overlapping it by more than
+    `iou_threshold`.
+
+    Args:
+        boxes: (N, 4) boxes as x1, y1, x2, y2.
+        scores: (N,) confidences.
+        iou_threshold: IoU above which the lower-scoring box is dropped.
+
+    Returns:
+        Indices of the kept boxes, by decreasing score.
+    """
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        best, rest = order[0], order[1:]
+        keep.append(best)
+        w = (np.minimum(x2[best], x2[rest]) - np.maximum(x1[best], x1[rest])).clip(0)
+        h = (np.minimum(y2[best], y2[rest]) - np.maximum(y1[best], y1[rest])).clip(0)
+        inter = w * h
+        iou = inter / (areas[best] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def postprocess(
+    output: np.ndarray,
+    conf_threshold: float = 0.25,
+    iou_threshold: float = 0.7,
+    max_det: int = 300,
+) -> np.ndarray:
+    """
+    Decode one image's raw YOLOv8 head output into detections.
+
+    Args:
+        output: (4 + classes, anchors) array of cx, cy, w, h and class scores.
+        conf_threshold: Minimum class score.
+        iou_threshold: Per-class NMS IoU threshold.
+        max_det: Maximum detections kept.
+
+    Returns:
+        (K, 6) array of x1, y1, x2, y2, conf, class_id in input pixels.
+    """
+    preds = output.T
+    scores = preds[:, 4:]
+    class_ids = scores.argmax(axis=1)
+    conf = scores[np.arange(len(preds)), class_ids]
+    mask = conf > conf_threshold
+    if not mask.any():
+        return np.empty((0, 6), dtype=np.float32)
+
+    cx, cy, w, h = preds[mask, :4].T
+    boxes = np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+    conf, class_ids = conf[mask], class_ids[mask]
+    keep = nms(boxes + class_ids[:, None] * _CLASS_OFFSET, conf, iou_threshold)
+    keep = keep[:max_det]
+    return np.concatenate(
+        [boxes[keep], conf[keep, None], class_ids[keep, None]], axis=1
+    ).astype(np.float32)
+
+
+def prepare_input(
+    image: ImageInput, input_size: int, channel_order: str = "bgr"
+) -> Tuple[np.ndarray, Tuple[int, int], float, Tuple[int, int]]:
+    """
+    Turn an image into a YOLOv8 input tensor.
+
+    Args:
+        image: Image path, PIL image or numpy frame in `channel_order`.
+        input_size: Square model input side.
+        channel_order: Channel order of numpy frames.
+
+    Returns:
+        Tuple of (3 x input_size x input_size float32 RGB tensor in [0, 1],
+        original (height, width), letterbox scale, letterbox padding).
+    """
+    source = to_bgr_source(image, channel_order)
+    if isinstance(source, str):
+        bgr = cv2.imread(source)
+        if bgr is None:
+            raise ValueError(f"Unable to open image: {source}")
+    elif isinstance(source, np.ndarray):
+        bgr = source if source.ndim == 3 else cv2.cvtColor(source, cv2.COLOR_GRAY2BGR)
+    else:
+        bgr = np.asarray(source.convert("RGB"))[..., ::-1]
+
+    boxed, scale, pad = letterbox(bgr, input_size)
+    blob = boxed[..., ::-1].transpose(2, 0, 1).astype(np.float32) / 255.0
+    return blob, bgr.shape[:2], scale, pad
+
+
+class ONNXRunner(BaseModelRunner):
+    """
+    YOLOv8 runner on ONNX Runtime, for CPU-only hosts.
+
+    The ultralytics weights are exported to ONNX on first use (see
+    `export_onnx`). Images are letterboxed to `input_size` and run in
+    batches; decoding and NMS are done here in numpy, so neither torch nor
+    ultralytics is needed once the export is cached. The OpenVINO execution
+    provider is used when the installed ONNX Runtime offers it.
+    """
+
+    def __init__(
+        self,
+        model_path: str = "yolov8n.pt",
+        input_size: int = 640,
+        export_dir: Path = DEFAULT_EXPORT_DIR,
+        min_confidence: float = 0.25,
+        iou_threshold: float = 0.7,
+        threads: Optional[int] = None,
+        channel_order: str = "bgr",
+    ):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError(
+                "The onnx backend requires onnxruntime "
+                "(pip install onnxruntime, or onnxruntime-openvino)"
+            ) from e
+
+        check_channel_order(channel_order)
+        self.channel_order = channel_order
+        self.input_size = input_size
+        self.min_confidence = min_confidence
+        self.iou_threshold = iou_threshold
+
+        path = Path(model_path)
+        if path.suffix != ".onnx":
+            path = export_onnx(path, input_size, export_dir)
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        providers = [
+            p
+            for p in ("OpenVINOExecutionProvider", "CPUExecutionProvider")
+            if p in ort.get_available_providers()
+        ]
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=providers
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.model_path = path
+        names = self.session.get_modelmeta().custom_metadata_map.get("names", "{}")
+        self._names: Dict[int, str] = ast.literal_eval(names)
+        # Set by `build_quantized_runner` when the model is an INT8 variant
+        self.quantization_report: Optional[Dict] = None
+        logging.info(f"Loaded ONNX model {path} on {self.session.get_providers()}")
+
+    def predict(self, image: ImageInput) -> DetectionResult:
+        return self.predict_batch([image], batch_size=1)[0]
+
+    def predict_batch(
+        self, images: Sequence[ImageInput], batch_size: int = 8
+    ) -> List[DetectionResult]:
+        """
+        Run one session call per `batch_size` images.
+
+        Args:
+            images: Image paths, PIL images or numpy frames.
+            batch_size: Number of images per session call.
+
+        Returns:
+            One DetectionResult per image, in input order.
+        """
+        results: List[DetectionResult] = []
+        batch_size = max(1, batch_size)
+        for i in range(0, len(images), batch_size):
+            prepared = [
+                prepare_input(image, self.input_size, self.channel_order)
+                for image in images[i : i + batch_size]
+            ]
+            blob = np.stack([p[0] for p in prepared])
+            (outputs,) = self.session.run(None, {self.input_name: blob})
+            for output, (_, shape, scale, pad) in zip(outputs, prepared):
+                detections = postprocess(
+                    output, self.min_confidence, self.iou_threshold
+                )
+                results.append(self._to_result(detections, shape, scale, pad))
+        return results
+
+    def _to_result(
+        self,
+        detections: np.ndarray,
+        shape: Tuple[int, int],
+        scale: float,
+        pad: Tuple[int, int],
+    ) -> DetectionResult:
+        height, width = shape
+        xyxy = detections[:, :4].astype(np.float64)
+        xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - pad[0]) / scale).clip(0, width)
+        xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - pad[1]) / scale).clip(0, height)
+        class_ids = detections[:, 5].astype(np.int64)
+        return DetectionResult.from_arrays(
+            xyxy=xyxy,
+            conf=detections[:, 4],
+            class_ids=class_ids,
+            labels=labels_for(class_ids, self._names),
+            width=width,
+            height=height,
+        )
+
+    @property
+    def cache_key(self) -> str:
+        return (
+            f"onnx:{weights_digest(self.model_path)}:{self.input_size}:"
+            f"iou={self.iou_threshold}"
+        )
+
+    @property
+    def class_names(self) -> Dict[int, str]:
+        return self._names
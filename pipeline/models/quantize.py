@@ -0,0 +1,278 @@
+import json
+import time
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from pipeline.models.base import DetectionResult
+from pipeline.models.onnx import (
+    DEFAULT_EXPORT_DIR,
+    ONNXRunner,
+    export_onnx,
+    prepare_input,
+)
+
+QUANTIZE_MODES = ("dynamic", "static")
+
+
+def quantized_path(fp32_path: Path, mode: str) -> Path:
+    """Cache location of the INT8 variant of an exported FP32 model."""
+    return fp32_path.with_name(f"{fp32_path.stem}-int8-{mode}.onnx")
+
+
+def report_path(model_path: Path) -> Path:
+    """Location of the accuracy report written next to a quantized model."""
+    return model_path.with_suffix(".report.json")
+
+
+def sample_frames(frames: Sequence[Path], count: int) -> List[Path]:
+    """Pick up to `count` frames spread evenly over the sequence."""
+    if len(frames) <= count:
+        return list(frames)
+    picks = np.linspace(0, len(frames) - 1, count).round().astype(int)
+    return [frames[i] for i in picks]
+
+
+class CalibrationReader:
+    """
+    Feed calibration frames to ONNX Runtime's static quantizer, one at a time.
+
+    Implements the `get_next` protocol of
+    `onnxruntime.quantization.CalibrationDataReader`.
+    """
+
+    def __init__(self, frames: Sequence[Path], input_name: str, input_size: int):
+        self.frames = iter(frames)
+        self.input_name = input_name
+        self.input_size = input_size
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        frame = next(self.frames, None)
+        if frame is None:
+            return None
+        blob = prepare_input(frame, self.input_size)[0]
+        return {self.input_name: blob[np.newaxis]}
+
+
+def quantize_onnx(
+    fp32_path: Path,
+    mode: str = "dynamic",
+    calibration_frames: Optional[Sequence[Path]] = None,
+    input_size: int = 640,
+) -> Path:
+    """
+    Write an INT8 variant of an ONNX model, unless it is already cached.
+
+    Dynamic quantization stores INT8 weights and quantizes activations on
+    the fly. Static quantization also fixes activation ranges, measured on
+    `calibration_frames`, which is faster on CPU but needs that sample.
+
+    Args:
+        fp32_path: Exported FP32 ONNX model.
+        mode: "dynamic" or "static".
+        calibration_frames: Frames to calibrate activation ranges on
+            (required for static quantization).
+        input_size: Square model input side.
+
+    Returns:
+        Path to the quantized model.
+    """
+    if mode not in QUANTIZE_MODES:
+        raise ValueError(f"quantize must be one of {QUANTIZE_MODES}, got {mode}")
+    target = quantized_path(fp32_path, mode)
+    if target.exists():
+        logging.info(f"Using cached INT8 model {target}")
+        return target
+    frames = list(calibration_frames or [])
+    if mode == "static" and not frames:
+        raise ValueError(
+            f"Static quantization of {fp32_path} needs calibration frames; "
+            "run pre-tagging once on preprocessed frames or use dynamic mode"
+        )
+
+    import onnx
+    from onnxruntime.quantization import (
+        QuantFormat,
+        QuantType,
+        quantize_dynamic,
+        quantize_static,
+    )
+
+    tmp = target.with_suffix(".tmp.onnx")
+    if mode == "dynamic":
+        quantize_dynamic(str(fp32_path), str(tmp), weight_type=QuantType.QInt8)
+    else:
+        graph = onnx.load(str(fp32_path), load_external_data=False).graph
+        reader = CalibrationReader(frames, graph.input[0].name, input_size)
+        logging.info(f"Calibrating INT8 model on {len(frames)} frames")
+        quantize_static(
+            str(fp32_path),
+            str(tmp),
+            reader,
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+
+    # Keep the class names stored by the export in the quantized model
+    source, quantized = onnx.load(str(fp32_path)), onnx.load(str(tmp))
+    if not quantized.metadata_props:
+        quantized.metadata_props.extend(source.metadata_props)
+        onnx.save(quantized, str(tmp))
+    tmp.replace(target)
+    return target
+
+
+def _iou(box: np.ndarray, others: np.ndarray) -> np.ndarray:
+    w = (np.minimum(box[2], others[:, 2]) - np.maximum(box[0], others[:, 0])).clip(0)
+    h = (np.minimum(box[3], others[:, 3]) - np.maximum(box[1], others[:, 1])).clip(0)
+    inter = w * h
+    union = (box[2] - box[0]) * (box[3] - box[1]) + (others[:, 2] - others[:, 0]) * (
+        others[:, 3] - others[:, 1]
+    )
+    return inter / np.maximum(union - inter, 1e-9)
+
+
+def match_detections(
+    reference: DetectionResult, candidate: DetectionResult, iou_threshold: float = 0.5
+) -> Tuple[int, List[float]]:
+    """
+    Greedily match candidate boxes to reference boxes of the same label.
+
+    Returns:
+        Tuple of (matched count, IoU of each match).
+    """
+    unmatched = np.ones(len(reference), dtype=bool)
+    ious = []
+    for i in np.argsort(-candidate.conf, kind="stable"):
+        same_label = np.flatnonzero(
+            unmatched & (reference.labels == candidate.labels[i])
+        )
+        if not same_label.size:
+            continue
+        overlaps = _iou(candidate.xyxy[i], reference.xyxy[same_label])
+        best = int(overlaps.argmax())
+        if overlaps[best] >= iou_threshold:
+            ious.append(float(overlaps[best]))
+            unmatched[same_label[best]] = False
+    return len(ious), ious
+
+
+def compare_runners(
+    reference: ONNXRunner,
+    candidate: ONNXRunner,
+    frames: Sequence[Path],
+    batch_size: int = 8,
+    iou_threshold: float = 0.5,
+) -> Dict:
+    """
+    Measure how far a quantized model's detections drift from the FP32 model's.
+
+    The FP32 detections serve as ground truth, so precision and recall are
+    the share of INT8 boxes that match an FP32 box and vice versa; there
+    are no labels to compute mAP against.
+
+    Returns:
+        Report dict with agreement metrics and per-image inference times.
+    """
+    t0 = time.perf_counter()
+    expected = reference.predict_batch(frames, batch_size)
+    t1 = time.perf_counter()
+    actual = candidate.predict_batch(frames, batch_size)
+    t2 = time.perf_counter()
+
+    reference_boxes = sum(len(r) for r in expected)
+    candidate_boxes = sum(len(r) for r in actual)
+    matched, ious = 0, []
+    for ref, cand in zip(expected, actual):
+        count, pair_ious = match_detections(ref, cand, iou_threshold)
+        matched += count
+        ious.extend(pair_ious)
+
+    precision = matched / candidate_boxes if candidate_boxes else 1.0
+    recall = matched / reference_boxes if reference_boxes else 1.0
+    images = max(1, len(frames))
+    return {
+        "images": len(frames),
+        "fp32_boxes": reference_boxes,
+        "int8_boxes": candidate_boxes,
+        "precision": precision,
+        "recall": recall,
+        "f1": (
+            2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        ),
+        "mean_iou": float(np.mean(ious)) if ious else 0.0,
+        "fp32_seconds_per_image": (t1 - t0) / images,
+        "int8_seconds_per_image": (t2 - t1) / images,
+        "speedup": (t1 - t0) / (t2 - t1) if t2 > t1 else 0.0,
+    }
+
+
+def build_quantized_runner(
+    model_path: str,
+    mode: str = "dynamic",
+    calibration_frames: Optional[Sequence[Path]] = None,
+    calibration_size: int = 64,
+    input_size: int = 640,
+    export_dir: Path = DEFAULT_EXPORT_DIR,
+    batch_size: int = 8,
+    threads: Optional[int] = None,
+    min_confidence: float = 0.25,
+) -> ONNXRunner:
+    """
+    Load (producing and caching on first use) an INT8 ONNX runner.
+
+    When the quantized model is created, a sample of `calibration_frames`
+    calibrates it (static mode) and both models are run on that sample to
+    report the accuracy delta, saved as JSON next to the quantized model and
+    exposed as `quantization_report` (reloaded from disk on later runs).
+
+    Args:
+        model_path: Ultralytics weights or an exported FP32 ONNX model.
+        mode: "dynamic" or "static".
+        calibration_frames: The run's preprocessed frames.
+        calibration_size: Number of frames sampled for calibration and the
+            accuracy comparison.
+        input_size: Square model input side.
+        export_dir: Directory holding exported models.
+        batch_size: Batch size of the comparison runs.
+        threads: Optional cap on inference threads.
+        min_confidence: Confidence below which detections are discarded.
+
+    Returns:
+        Runner over the quantized model.
+    """
+    fp32_path = Path(model_path)
+    if fp32_path.suffix != ".onnx":
+        fp32_path = export_onnx(fp32_path, input_size, export_dir)
+
+    target = quantized_path(fp32_path, mode)
+    created = not target.exists()
+    sample = sample_frames(list(calibration_frames or []), calibration_size)
+    quantize_onnx(fp32_path, mode, sample, input_size)
+    runner = ONNXRunner(
+        str(target),
+        input_size=input_size,
+        min_confidence=min_confidence,
+        threads=threads,
+    )
+
+    report_file = report_path(target)
+    if created and sample:
+        reference = ONNXRunner(
+            str(fp32_path),
+            input_size=input_size,
+            min_confidence=min_confidence,
+            threads=threads,
+        )
+        report = compare_runners(reference, runner, sample, batch_size)
+        report.update(mode=mode, model=str(target))
+        report_file.write_text(json.dumps(report, indent=2))
+        logging.info(
+            f"INT8 ({mode}) vs FP32 on {report['images']} frames: "
+            f"F1 {report['f1']:.3f}, {report['speedup']:.2f}x faster"
+        )
+    if report_file.exists():
+        runner.quantization_report = json.loads(report_file.read_text())
+    return runner
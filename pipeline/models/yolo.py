@@ -1,34 +1,86 @@
 from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
 from ultralytics import YOLO
 
-from pipeline.models.base import BaseModelRunner, DetectionResult
+from pipeline.models.base import (
+    BaseModelRunner,
+    DetectionResult,
+    ImageInput,
+    check_channel_order,
+    labels_for,
+    to_bgr_source,
+    weights_digest,
+)
 
 
 class YOLOv8Runner(BaseModelRunner):
-    def __init__(self, model_path: str = "yolov8n.pt"):
+    def __init__(
+        self,
+        model_path: str = "yolov8n.pt",
+        channel_order: str = "bgr",
+        min_confidence: float = 0.25,
+    ):
+        check_channel_order(channel_order)
         self.model = YOLO(model_path)
+        self.model_path = model_path
+        self.channel_order = channel_order
+        self.min_confidence = min_confidence
 
-    def predict(self, image_path: Path, verbose: bool = False) -> DetectionResult:
-        result = self.model(str(image_path), verbose=verbose)[0]
-        boxes = []
-        for box in result.boxes.data.tolist():
-            x1, y1, x2, y2, conf, cls_id = box
-            boxes.append(
-                {
-                    "x1": x1,
-                    "y1": y1,
-                    "x2": x2,
-                    "y2": y2,
-                    "conf": conf,
-                    "label": self.model.names[int(cls_id)],
-                    "class_id": int(cls_id),
-                }
+    def predict(self, image: ImageInput, verbose: bool = False) -> DetectionResult:
+        # ultralytics expects numpy frames as BGR, as decoded by OpenCV
+        source = to_bgr_source(image, self.channel_order)
+        result = self.model(source, conf=self.min_confidence, verbose=verbose)[0]
+        return self._to_result(result)
+
+    def predict_batch(
+        self,
+        images: Sequence[ImageInput],
+        batch_size: int = 8,
+        verbose: bool = False,
+    ) -> List[DetectionResult]:
+        """
+        Run one forward pass per `batch_size` images.
+
+        Args:
+            images: Image paths, PIL images or numpy frames.
+            batch_size: Number of images passed to the model at once.
+            verbose: Let ultralytics log per-batch progress.
+
+        Returns:
+            One DetectionResult per image, in input order.
+        """
+        sources = [to_bgr_source(image, self.channel_order) for image in images]
+        results: List[DetectionResult] = []
+        for i in range(0, len(sources), max(1, batch_size)):
+            batch = sources[i : i + max(1, batch_size)]
+            results.extend(
+                self._to_result(r)
+                for r in self.model(batch, conf=self.min_confidence, verbose=verbose)
             )
+        return results
 
-        return DetectionResult(
-            boxes=boxes, width=result.orig_shape[1], height=result.orig_shape[0]
+    def _to_result(self, result) -> DetectionResult:
+        # One device-to-host copy of the (N, 6) x1, y1, x2, y2, conf, class table
+        data = np.asarray(result.boxes.data.cpu().numpy()).reshape(-1, 6)
+        class_ids = data[:, 5].astype(np.int64)
+        return DetectionResult.from_arrays(
+            xyxy=data[:, :4],
+            conf=data[:, 4],
+            class_ids=class_ids,
+            labels=labels_for(class_ids, self.model.names),
+            width=result.orig_shape[1],
+            height=result.orig_shape[0],
         )
 
+    @property
+    def cache_key(self) -> Optional[str]:
+        # ultralytics resolves bare names like "yolov8n.pt" to downloaded files
+        weights = Path(getattr(self.model, "ckpt_path", None) or self.model_path)
+        if not weights.is_file():
+            return None
+        return f"yolov8:{weights_digest(weights)}"
+
     @property
     def class_names(self):
         return self.model.names
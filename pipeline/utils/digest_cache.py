@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import hashlib
+import logging
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+_FILE_DIGESTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_digests (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+# Stay below SQLite's limit on bound parameters per statement
+_QUERY_CHUNK = 500
+
+
+def file_digest(path: Path) -> str:
+    """BLAKE2b digest of a file's contents."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class DigestCache:
+    """
+    Base of the SQLite caches keyed by the content digest of image files.
+
+    Digests are memoized per path, size and modification time in a
+    `file_digests` table, so unchanged files are not read again. Subclasses
+    declare their own tables in `schema`/`tables` and bump `schema_version`
+    when what they store changes; a cache written with another version is
+    dropped on open.
+    """
+
+    kind = "cache"
+    schema_version = 1
+    schema = ""
+    tables: Tuple[str, ...] = ()
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.schema_version:
+            if version:
+                logging.info(f"Discarding {self.kind} {self.path} (version {version})")
+            self._conn.executescript(
+                "".join(
+                    f"DROP TABLE IF EXISTS {table};"
+                    for table in ("file_digests", *self.tables)
+                )
+            )
+            self._conn.execute(f"PRAGMA user_version = {self.schema_version}")
+        self._conn.executescript(_FILE_DIGESTS_SCHEMA + self.schema)
+        self._conn.commit()
+
+    def digests(self, files: Sequence[Path]) -> List[str]:
+        """Content digests of `files`, hashing only new or modified files."""
+        stats = [os.stat(f) for f in files]
+        known = self._select(
+            "SELECT path, size, mtime_ns, digest FROM file_digests WHERE path IN",
+            [str(f) for f in files],
+        )
+        memo = {row[0]: row[1:] for row in known}
+
+        result, fresh = [], []
+        for file, st in zip(files, stats):
+            size, mtime_ns, digest = memo.get(str(file), (None, None, None))
+            if size != st.st_size or mtime_ns != st.st_mtime_ns:
+                digest = file_digest(file)
+                fresh.append((str(file), st.st_size, st.st_mtime_ns, digest))
+            result.append(digest)
+        if fresh:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO file_digests VALUES (?, ?, ?, ?)", fresh
+            )
+            self._conn.commit()
+        return result
+
+    def _select(
+        self, query: str, keys: List[str], params: Sequence = ()
+    ) -> List[tuple]:
+        """Run `query ... IN (keys)` in chunks, with `params` bound first."""
+        rows: List[tuple] = []
+        for i in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[i : i + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(
+                self._conn.execute(f"{query} ({placeholders})", [*params, *chunk])
+            )
+        return rows
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,77 @@
+from typing import Optional, Tuple
+import cv2
+import numpy as np
+
+
+def downscale(
+    image: np.ndarray,
+    max_side: Optional[int] = None,
+    size: Optional[Tuple[int, int]] = None,
+) -> np.ndarray:
+    """
+    Shrink an image with area interpolation. Images are never upscaled.
+
+    Args:
+        image: Input image (grayscale or BGR).
+        max_side: Maximum length of the longest side; aspect ratio is kept.
+        size: Exact target (width, height). Takes precedence over `max_side`.
+
+    Returns:
+        The resized image, or the input unchanged if it is already small enough.
+    """
+    height, width = image.shape[:2]
+    if size is not None:
+        target = size
+    elif max_side is not None and max(height, width) > max_side:
+        scale = max_side / max(height, width)
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+    else:
+        return image
+
+    if target[0] >= width and target[1] >= height:
+        return image
+    return cv2.resize(image, target, interpolation=cv2.INTER_AREA)
+
+
+def parse_resolution(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a `WIDTHxHEIGHT` string such as `1280x720`."""
+    if not value:
+        return None
+    try:
+        width, height = (int(v) for v in value.lower().split("x"))
+    except ValueError as e:
+        raise ValueError(f"Invalid resolution '{value}', expected WIDTHxHEIGHT") from e
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Invalid resolution '{value}', sides must be positive")
+    return width, height
+
+
+def letterbox(
+    image: np.ndarray, size: int, color: int = 114
+) -> Tuple[np.ndarray, float, Tuple[int, int]]:
+    """
+    Fit an image into a `size` x `size` square, keeping its aspect ratio.
+
+    The image is scaled so its longest side equals `size` and centred on a
+    padded canvas, the input layout YOLO-style detectors expect.
+
+    Args:
+        image: Input image (grayscale or BGR).
+        size: Side of the square output.
+        color: Padding value.
+
+    Returns:
+        Tuple of (letterboxed image, scale factor, (pad_x, pad_y)) where the
+        padding is the offset of the scaled image on the canvas.
+    """
+    height, width = image.shape[:2]
+    scale = size / max(height, width)
+    new_w, new_h = max(1, round(width * scale)), max(1, round(height * scale))
+    if (new_w, new_h) != (width, height):
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+        image = cv2.resize(image, (new_w, new_h), interpolation=interpolation)
+
+    pad_x, pad_y = (size - new_w) // 2, (size - new_h) // 2
+    canvas = np.full((size, size) + image.shape[2:], color, dtype=image.dtype)
+    canvas[pad_y : pad_y + new_h, pad_x : pad_x + new_w] = image
+    return canvas, scale, (pad_x, pad_y)
@@ -1,5 +1,10 @@
+import os
+import shutil
 from pathlib import Path
-from typing import List
+from typing import Iterable, List
+
+# How preprocessing stages hand surviving frames to the next stage
+TRANSFER_MODES = ("link", "copy", "manifest")
 
 
 def list_images(
@@ -50,3 +55,84 @@ def ensure_parent_dir(path: Path) -> Path:
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     return path
+
+
+def link_or_copy(src: Path, dest: Path) -> None:
+    """
+    Hardlink `src` to `dest`, copying only when linking is not possible.
+
+    Linking fails across filesystems or on filesystems without hardlink
+    support; the file is then copied with its metadata. An existing `dest`
+    is replaced.
+
+    Args:
+        src (Path): Existing file.
+        dest (Path): Path to create.
+    """
+    if dest.exists():
+        if os.path.samefile(src, dest):
+            return
+        dest.unlink()
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def transfer_file(src: Path, output_dir: Path, mode: str = "link") -> Path:
+    """
+    Hand a selected frame to the next stage.
+
+    Args:
+        src (Path): Selected frame.
+        output_dir (Path): Directory of the stage's output.
+        mode (str): "link" hardlinks into output_dir (copy as fallback),
+            "copy" copies, "manifest" leaves the file where it is.
+
+    Returns:
+        Path the next stage should read the frame from.
+    """
+    if mode == "manifest":
+        return src
+    dest = output_dir / src.name
+    if mode == "link":
+        link_or_copy(src, dest)
+    elif mode == "copy":
+        shutil.copy2(src, dest)
+    else:
+        raise ValueError(f"transfer mode must be one of {TRANSFER_MODES}, got {mode}")
+    return dest
+
+
+def write_selection(paths: Iterable[Path], manifest_path: Path) -> Path:
+    """
+    Write a selection manifest listing frames by absolute path, one per line.
+
+    Args:
+        paths (Iterable[Path]): Selected frames.
+        manifest_path (Path): Manifest file to write.
+
+    Returns:
+        The manifest path.
+    """
+    lines = [str(Path(p).resolve()) for p in paths]
+    manifest_path.write_text("".join(f"{line}\n" for line in lines))
+    return manifest_path
+
+
+def list_frames(source: Path) -> List[Path]:
+    """
+    List the frames of a stage output.
+
+    Args:
+        source (Path): Directory of JPEG frames, or a selection manifest
+            written by `write_selection`.
+
+    Returns:
+        Sorted frame paths.
+    """
+    if source.is_file():
+        return sorted(
+            Path(line) for line in source.read_text().splitlines() if line.strip()
+        )
+    return sorted(source.glob("*.jpg"))
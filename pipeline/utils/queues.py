@@ -0,0 +1,64 @@
+import queue
+import threading
+from typing import Generator, Iterable, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _ProducerError:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def prefetch(iterable: Iterable[T], depth: int = 8) -> Generator[T, None, None]:
+    """
+    Consume an iterable on a background thread through a bounded queue.
+
+    The producer blocks once `depth` items are waiting, which caps memory
+    while letting it run ahead of the consumer. Exceptions raised by the
+    producer are re-raised in the consuming thread.
+
+    Args:
+        iterable: Source of items (e.g. a frame decoding generator).
+        depth: Maximum number of items buffered ahead of the consumer.
+
+    Yields:
+        Items from `iterable`, in order.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, depth))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            _put(_ProducerError(e))
+            return
+        _put(_DONE)
+
+    producer = threading.Thread(target=_produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            if isinstance(item, _ProducerError):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+        producer.join()
@@ -3,6 +3,17 @@ from functools import wraps
 from typing import Any, Callable, Dict, Tuple
 
 
+class StepMetrics(dict):
+    """
+    Extra durations (in seconds) to report next to the step's own, e.g. the
+    share of a fused pass spent in each sub-stage.
+
+    A step decorated with `timed_step` may return one as the last element of
+    its result tuple; it is removed from the result and merged into the
+    timing dict.
+    """
+
+
 def timed_step(label: str, flat: bool = False):
     def decorator(func: Callable):
         @wraps(func)
@@ -11,6 +22,13 @@ def timed_step(label: str, flat: bool = False):
             result = func(*args, **kwargs)
             duration = time.time() - t0
             timing = {label: duration}
+            if (
+                isinstance(result, tuple)
+                and result
+                and isinstance(result[-1], StepMetrics)
+            ):
+                timing.update(result[-1])
+                result = result[:-1] if len(result) > 2 else result[0]
             if flat and isinstance(result, tuple):
                 return (*result, timing)
             else:
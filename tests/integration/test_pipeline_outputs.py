@@ -17,6 +17,7 @@ def test_pipeline_outputs(tmp_path: Path, create_test_video):
     result = runner.invoke(
         app,
         [
+            "run",
             "--video",
             str(video_path),
             "--output",
@@ -51,3 +52,60 @@ def test_pipeline_outputs(tmp_path: Path, create_test_video):
     assert "annotations" in data and isinstance(
         data["annotations"], list
     ), "Missing 'annotations' in COCO file."
+
+
+def test_stream_rejects_unsupported_flags(tmp_path: Path, create_test_video):
+    video_path = tmp_path / "sample.mp4"
+    create_test_video(video_path, num_frames=5, width=64, height=64)
+
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "--video",
+            str(video_path),
+            "--output",
+            str(tmp_path / "frames"),
+            "--coco_output",
+            str(tmp_path / "annotations.coco.json"),
+            "--reports_output",
+            str(tmp_path / "reports"),
+            "--stream",
+            "--workers",
+            "2",
+            "--resume",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "--stream cannot be combined with --workers, --resume" in result.stdout
+    assert not (tmp_path / "frames").exists()
+
+
+def test_stream_rejects_static_quantization(tmp_path: Path, create_test_video):
+    video_path = tmp_path / "sample.mp4"
+    create_test_video(video_path, num_frames=5, width=64, height=64)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("model:\n  backend: onnx\n  quantize: static\n")
+
+    result = runner.invoke(
+        app,
+        [
+            "run",
+            "--video",
+            str(video_path),
+            "--output",
+            str(tmp_path / "frames"),
+            "--coco_output",
+            str(tmp_path / "annotations.coco.json"),
+            "--reports_output",
+            str(tmp_path / "reports"),
+            "--config",
+            str(config_path),
+            "--stream",
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "--stream cannot calibrate model.quantize: static" in result.stdout
+    assert not (tmp_path / "annotations.coco.json").exists()
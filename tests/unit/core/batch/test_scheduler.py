@@ -0,0 +1,61 @@
+from pathlib import Path
+from pipeline.core.batch.scheduler import (
+    BatchSettings,
+    assign_namespaces,
+    discover_videos,
+    run_batch,
+)
+
+
+def test_discover_videos_from_directory_and_manifest(tmp_path: Path):
+    (tmp_path / "b.mp4").touch()
+    (tmp_path / "a.mov").touch()
+    (tmp_path / "notes.txt").touch()
+    assert [p.name for p in discover_videos(tmp_path)] == ["a.mov", "b.mp4"]
+
+    manifest = tmp_path / "videos.txt"
+    manifest.write_text("# nightly\nb.mp4\n\n/abs/site.mp4\n")
+    assert discover_videos(manifest) == [tmp_path / "b.mp4", Path("/abs/site.mp4")]
+
+
+def test_assign_namespaces_is_unique():
+    videos = [Path("x/cam.mp4"), Path("y/cam.mp4"), Path("z/other.mp4")]
+    assert assign_namespaces(videos) == ["cam", "cam_2", "other"]
+
+
+def test_run_batch_processes_each_video(create_test_video, tmp_path: Path):
+    videos = []
+    for name in ["site_a.mp4", "site_b.mp4"]:
+        create_test_video(tmp_path / name, num_frames=3, width=64, height=64)
+        videos.append(tmp_path / name)
+    videos.append(tmp_path / "missing.mp4")
+    output_root = tmp_path / "out"
+
+    results, timing = run_batch(videos, output_root, BatchSettings(), workers=2)
+
+    assert [r["status"] for r in results] == ["ok", "ok", "failed"]
+    assert results[0]["extracted"] == 3
+    assert len(list((output_root / "site_b" / "frames").glob("*.jpg"))) == 3
+    assert (output_root / "site_a" / "report.md").exists()
+    assert "batch" in timing
+
+
+def test_run_batch_reports_model_load_failure_per_video(
+    create_test_video, tmp_path: Path
+):
+    videos = []
+    for name in ["site_a.mp4", "site_b.mp4", "site_c.mp4"]:
+        create_test_video(tmp_path / name, num_frames=2, width=64, height=64)
+        videos.append(tmp_path / name)
+
+    results, _ = run_batch(
+        videos,
+        tmp_path / "out",
+        BatchSettings(pretag=True),
+        workers=2,
+        model_config={"backend": "bogus"},
+    )
+
+    assert [r["status"] for r in results] == ["failed"] * 3
+    assert all("model load failed" in r["error"] for r in results)
+    assert not (tmp_path / "out" / "site_a" / "frames").exists()
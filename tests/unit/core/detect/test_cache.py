@@ -0,0 +1,28 @@
+from pathlib import Path
+from pipeline.core.detect.cache import DetectionCache
+from pipeline.models.base import DetectionResult
+
+
+def make_result(conf: float) -> DetectionResult:
+    box = {"x1": 1, "y1": 2, "x2": 3, "y2": 4, "conf": conf, "label": "person"}
+    return DetectionResult([box], width=64, height=48)
+
+
+def test_detection_cache_round_trip_per_model(tmp_path: Path):
+    images = [tmp_path / "a.jpg", tmp_path / "b.jpg", tmp_path / "copy_of_a.jpg"]
+    images[0].write_bytes(b"image-a")
+    images[1].write_bytes(b"image-b")
+    images[2].write_bytes(b"image-a")
+
+    with DetectionCache(tmp_path / "cache.sqlite") as cache:
+        digests = cache.digests(images)
+        assert digests[0] == digests[2] != digests[1]
+        cache.put([(digests[0], make_result(0.1))], "model-v1")
+
+    with DetectionCache(tmp_path / "cache.sqlite") as cache:
+        hits = cache.get(cache.digests(images), "model-v1")
+        assert list(hits) == [digests[0]]
+        result = hits[digests[0]]
+        assert (result.width, result.height) == (64, 48)
+        assert result.boxes[0]["conf"] == 0.1
+        assert cache.get(digests, "model-v2") == {}
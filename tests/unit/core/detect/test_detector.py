@@ -2,12 +2,25 @@ import json
 import numpy as np
 import cv2
 from pathlib import Path
+from pipeline.core.detect.cache import DetectionCache
 from pipeline.core.detect.detector import run_detection_to_coco
-from pipeline.models.base import DetectionResult
+from pipeline.models.base import BaseModelRunner, DetectionResult, ImageInput
+from pipeline.utils.paths import write_selection
 
 
-class MockModel:
-    def predict(self, image_path: Path) -> DetectionResult:
+class MockModel(BaseModelRunner):
+    def __init__(self):
+        self.batches = []
+
+    def predict_batch(self, image_paths, batch_size=1):
+        self.batches.append(len(image_paths))
+        return super().predict_batch(image_paths, batch_size)
+
+    @property
+    def class_names(self):
+        return {0: "person"}
+
+    def predict(self, image: ImageInput) -> DetectionResult:
         return DetectionResult(
             boxes=[
                 {
@@ -39,7 +52,7 @@ def test_run_detection_to_coco(tmp_path: Path):
     create_dummy_images(image_dir)
 
     model = MockModel()
-    image_count, ann_count, func_exc_time = run_detection_to_coco(
+    image_count, ann_count, _, func_exc_time = run_detection_to_coco(
         model, image_dir, str(output_path)
     )
 
@@ -56,3 +69,98 @@ def test_run_detection_to_coco(tmp_path: Path):
     assert len(data["images"]) == 2
     assert len(data["annotations"]) == 2
     assert data["categories"][0]["name"] == "person"
+
+
+def test_run_detection_to_coco_reads_selection_manifest(tmp_path: Path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    create_dummy_images(image_dir, count=3)
+    selection = write_selection(
+        [image_dir / "img_1.jpg", image_dir / "img_3.jpg"], tmp_path / "selected.txt"
+    )
+    output_path = tmp_path / "annotations.coco.json"
+
+    image_count, _, _, _ = run_detection_to_coco(
+        MockModel(), selection, str(output_path)
+    )
+
+    assert image_count == 2
+    data = json.loads(output_path.read_text())
+    assert [img["file_name"] for img in data["images"]] == ["img_1.jpg", "img_3.jpg"]
+
+
+def test_run_detection_to_coco_batches_predictions(tmp_path: Path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    create_dummy_images(image_dir, count=5)
+    output_path = tmp_path / "annotations.coco.json"
+
+    model = MockModel()
+    image_count, ann_count, _, _ = run_detection_to_coco(
+        model, image_dir, str(output_path), batch_size=2
+    )
+
+    assert model.batches == [2, 2, 1]
+    assert (image_count, ann_count) == (5, 5)
+    data = json.loads(output_path.read_text())
+    assert [img["id"] for img in data["images"]] == [1, 2, 3, 4, 5]
+
+
+def test_run_detection_to_coco_prefetches_arrays(tmp_path: Path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    create_dummy_images(image_dir, count=3)
+    output_path = tmp_path / "annotations.coco.json"
+
+    class ArrayModel(MockModel):
+        def __init__(self):
+            super().__init__()
+            self.inputs = []
+
+        def predict(self, image):
+            self.inputs.append(image)
+            return super().predict(image)
+
+    model = ArrayModel()
+    image_count, ann_count, _, timing = run_detection_to_coco(
+        model, image_dir, str(output_path), batch_size=2, prefetch_depth=2
+    )
+
+    assert (image_count, ann_count) == (3, 3)
+    assert model.batches == [2, 1]
+    assert all(isinstance(img, np.ndarray) for img in model.inputs)
+    assert "detection_input_wait" in timing
+    data = json.loads(output_path.read_text())
+    assert (data["images"][0]["width"], data["images"][0]["height"]) == (100, 200)
+
+
+def test_run_detection_to_coco_reuses_cached_detections(tmp_path: Path):
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    create_dummy_images(image_dir, count=3)
+    output_path = tmp_path / "annotations.coco.json"
+
+    class CachedModel(MockModel):
+        cache_key = "mock-weights"
+
+    with DetectionCache(tmp_path / "detections.sqlite") as cache:
+        first = CachedModel()
+        run_detection_to_coco(first, image_dir, str(output_path), cache=cache)
+        assert sum(first.batches) == 3
+
+        (image_dir / "img_4.jpg").write_bytes((image_dir / "img_1.jpg").read_bytes())
+        rerun = CachedModel()
+        image_count, ann_count, cache_hits, _ = run_detection_to_coco(
+            rerun, image_dir, str(output_path), conf_threshold=0.95, cache=cache
+        )
+
+        # Results cut at another confidence floor are not reused
+        lower_floor = CachedModel()
+        lower_floor.min_confidence = 0.01
+        run_detection_to_coco(lower_floor, image_dir, str(output_path), cache=cache)
+
+    # Identical content is recognised too, and the stricter threshold drops all
+    assert rerun.batches == []
+    assert cache_hits == 4
+    assert (image_count, ann_count) == (4, 0)
+    assert sum(lower_floor.batches) == 4
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+from pathlib import Path
+from pipeline.core.detect.loader import PrefetchLoader, load_image, restore_boxes
+from pipeline.models.base import DetectionResult
+
+
+def write_images(dir: Path, count: int):
+    paths = []
+    for i in range(count):
+        path = dir / f"img_{i}.jpg"
+        cv2.imwrite(str(path), np.full((40, 80, 3), i * 10, dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def test_prefetch_loader_batches_in_order(tmp_path: Path):
+    paths = write_images(tmp_path, 5)
+
+    loader = PrefetchLoader(paths, batch_size=2, depth=1, workers=2)
+    batches = list(loader)
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [item.path for batch in batches for item in batch] == paths
+    assert batches[0][0].image.shape == (40, 80, 3)
+    assert loader.wait_seconds >= 0.0
+
+
+def test_prefetch_loader_skips_unreadable_images(tmp_path: Path):
+    paths = write_images(tmp_path, 2)
+    broken = tmp_path / "broken.jpg"
+    broken.write_text("not an image")
+
+    batches = list(PrefetchLoader([paths[0], broken, paths[1]], batch_size=8))
+
+    assert [item.path for item in batches[0]] == paths
+
+
+def test_restore_boxes_undoes_letterbox(tmp_path: Path):
+    (path,) = write_images(tmp_path, 1)
+    item = load_image(path, letterbox_size=64)
+    assert item is not None
+    assert item.image.shape == (64, 64, 3)
+    assert (item.width, item.height) == (80, 40)
+
+    # A box covering the whole letterboxed content maps to the full image
+    result = DetectionResult(
+        boxes=[{"x1": 0, "y1": 16, "x2": 64, "y2": 48, "conf": 0.9, "label": "a"}],
+        width=64,
+        height=64,
+    )
+    restored = restore_boxes(result, item)
+
+    assert (restored.width, restored.height) == (80, 40)
+    box = restored.boxes[0]
+    assert (box["x1"], box["y1"], box["x2"], box["y2"]) == (0, 0, 80, 40)
+    assert box["conf"] == 0.9
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+from pathlib import Path
+from pipeline.core.detect.cache import DetectionCache
+from pipeline.core.detect.detector import run_detection_to_coco
+from pipeline.core.detect import sharded
+from pipeline.core.detect.sharded import run_sharded_detection_to_coco, split_shards
+from pipeline.models.base import BaseModelRunner, DetectionResult, ImageInput
+
+
+class PerImageModel(BaseModelRunner):
+    """Detects a different box and label in every image."""
+
+    cache_key = "per-image"
+
+    def __init__(self, threads=None):
+        self.threads = threads
+
+    def predict(self, image: ImageInput) -> DetectionResult:
+        index = int(Path(str(image)).stem.split("_")[1])
+        return DetectionResult(
+            boxes=[
+                {
+                    "x1": index,
+                    "y1": 0,
+                    "x2": index + 10,
+                    "y2": 10,
+                    "conf": 0.9,
+                    "label": f"class_{index % 3}",
+                    "class_id": index % 3,
+                }
+            ],
+            width=32,
+            height=32,
+        )
+
+    @property
+    def class_names(self):
+        return {i: f"class_{i}" for i in range(3)}
+
+
+def create_images(image_dir: Path, count: int):
+    image_dir.mkdir()
+    for i in range(count):
+        image = np.full((32, 32, 3), i, dtype=np.uint8)
+        cv2.imwrite(str(image_dir / f"frame_{i:06d}.jpg"), image)
+
+
+def test_split_shards_is_contiguous_and_balanced():
+    items = [Path(str(i)) for i in range(7)]
+    shards = split_shards(items, 3)
+    assert [len(s) for s in shards] == [2, 2, 3]
+    assert [p for s in shards for p in s] == items
+    assert split_shards(items[:1], 4) == [items[:1]]
+
+
+def test_sharded_detection_matches_serial_output(tmp_path: Path):
+    image_dir = tmp_path / "images"
+    create_images(image_dir, 9)
+    serial_path = tmp_path / "serial.json"
+    sharded_path = tmp_path / "sharded.json"
+
+    serial = run_detection_to_coco(PerImageModel(), image_dir, str(serial_path))
+    with DetectionCache(tmp_path / "detections.sqlite") as cache:
+        sharded = run_sharded_detection_to_coco(
+            PerImageModel,
+            image_dir,
+            str(sharded_path),
+            shards=3,
+            threads_per_shard=1,
+            batch_size=2,
+            cache=cache,
+        )
+        rerun = run_sharded_detection_to_coco(
+            PerImageModel, image_dir, str(sharded_path), shards=3, cache=cache
+        )
+
+    assert serial[:2] == sharded[:2] == rerun[:2] == (9, 9)
+    assert serial_path.read_text() == sharded_path.read_text()
+    assert (sharded[2], rerun[2]) == (0, 9)
+
+
+def test_shard_worker_passes_thread_cap_to_model_factory(monkeypatch):
+    capped = []
+    monkeypatch.setattr(cv2, "setNumThreads", capped.append)
+    monkeypatch.setattr(sharded, "_shard_model", None)
+
+    sharded._init_shard_worker(PerImageModel, 2)
+
+    assert capped == [2]
+    assert isinstance(sharded._shard_model, PerImageModel)
+    assert sharded._shard_model.threads == 2
@@ -1,6 +1,7 @@
 import cv2
+import numpy as np
 from pathlib import Path
-from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.extract.extractor import extract_frames, iter_frames, sample_indices
 
 
 def test_extract_frames(create_test_video, tmp_path: Path):
@@ -11,7 +12,7 @@ def test_extract_frames(create_test_video, tmp_path: Path):
     cap = cv2.VideoCapture(str(video_path))
     assert cap.isOpened()
 
-    extracted_count, _ = extract_frames(cap, str(output_dir), skip_frequency=1)
+    extracted_count, _, _ = extract_frames(cap, str(output_dir), skip_frequency=1)
 
     output_files = list(output_dir.glob("*.jpg"))
     assert extracted_count == 5
@@ -19,3 +20,71 @@ def test_extract_frames(create_test_video, tmp_path: Path):
     for f in output_files:
         assert f.suffix == ".jpg"
         assert f.exists()
+
+
+def test_sample_indices_time_and_budget():
+    assert sample_indices(100, fps=10.0, every_seconds=2.0) == [0, 20, 40, 60, 80]
+    assert sample_indices(100, fps=10.0, max_frames=3) == [0, 50, 99]
+    assert sample_indices(2, fps=10.0, max_frames=5) == [0, 1]
+
+
+def test_iter_frames_sparse_decoding_matches_full_read(
+    create_test_video, tmp_path: Path
+):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=12)
+
+    cap = cv2.VideoCapture(str(video_path))
+    full = [frame for _, frame in iter_frames(cap, seek_threshold=None)]
+    cap.release()
+
+    cap = cv2.VideoCapture(str(video_path))
+    sparse = list(iter_frames(cap, skip_frequency=5, seek_threshold=3))
+    cap.release()
+
+    assert [idx for idx, _ in sparse] == [0, 5, 10]
+    for idx, frame in sparse:
+        assert np.array_equal(frame, full[idx])
+
+
+def test_extract_frames_with_frame_budget(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    output_dir = tmp_path / "frames"
+    create_test_video(video_path, num_frames=10)
+
+    cap = cv2.VideoCapture(str(video_path))
+    extracted_count, _, _ = extract_frames(cap, str(output_dir), max_frames=4)
+    cap.release()
+
+    assert extracted_count == 4
+    assert len(list(output_dir.glob("*.jpg"))) == 4
+
+
+def test_extract_frames_with_writer_threads(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    output_dir = tmp_path / "frames"
+    create_test_video(video_path, num_frames=6)
+
+    cap = cv2.VideoCapture(str(video_path))
+    extracted_count, write_errors, _ = extract_frames(
+        cap, str(output_dir), writer_threads=2, max_pending=2
+    )
+    cap.release()
+
+    assert extracted_count == 6
+    assert len(list(output_dir.glob("*.jpg"))) == 6
+    assert write_errors == 0
+
+
+def test_extract_frames_downscales(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    output_dir = tmp_path / "frames"
+    create_test_video(video_path, num_frames=2, width=320, height=240)
+
+    cap = cv2.VideoCapture(str(video_path))
+    extract_frames(cap, str(output_dir), max_side=160)
+    cap.release()
+
+    for f in output_dir.glob("*.jpg"):
+        frame = cv2.imread(str(f))
+        assert frame is not None and frame.shape == (120, 160, 3)
@@ -0,0 +1,60 @@
+import os
+import cv2
+from pathlib import Path
+from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.extract.manifest import MANIFEST_NAME, ExtractionManifest
+
+
+def test_manifest_resume_and_parameter_mismatch(tmp_path: Path):
+    with ExtractionManifest(str(tmp_path), {"skip_frequency": 1}) as manifest:
+        assert manifest.start(resume=True) == set()
+        manifest.commit(0)
+        manifest.commit(1)
+
+    # Simulate a torn append from a killed process
+    with open(tmp_path / MANIFEST_NAME, "a") as f:
+        f.write('{"fra')
+
+    with ExtractionManifest(str(tmp_path), {"skip_frequency": 1}) as manifest:
+        assert manifest.start(resume=True) == {0, 1}
+        manifest.commit(2)
+
+    with ExtractionManifest(str(tmp_path), {"skip_frequency": 1}) as manifest:
+        assert manifest.start(resume=True) == {0, 1, 2}
+
+    with ExtractionManifest(str(tmp_path), {"skip_frequency": 2}) as manifest:
+        assert manifest.start(resume=True) == set()
+
+
+def test_extract_frames_resumes_from_checkpoint(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    output_dir = tmp_path / "frames"
+    create_test_video(video_path, num_frames=8)
+
+    cap = cv2.VideoCapture(str(video_path))
+    extract_frames(cap, str(output_dir), skip_frequency=2)
+    cap.release()
+
+    # Pretend the run was preempted after its first two frames
+    manifest_path = output_dir / MANIFEST_NAME
+    lines = manifest_path.read_text().splitlines()
+    manifest_path.write_text("\n".join(lines[:3]) + "\n")
+    for name in ["frame_000004.jpg", "frame_000006.jpg"]:
+        (output_dir / name).unlink()
+    kept_mtime = os.path.getmtime(output_dir / "frame_000000.jpg")
+
+    cap = cv2.VideoCapture(str(video_path))
+    extracted_count, _, timing = extract_frames(
+        cap, str(output_dir), skip_frequency=2, resume=True
+    )
+    cap.release()
+
+    assert extracted_count == 4
+    assert sorted(p.name for p in output_dir.glob("*.jpg")) == [
+        "frame_000000.jpg",
+        "frame_000002.jpg",
+        "frame_000004.jpg",
+        "frame_000006.jpg",
+    ]
+    assert os.path.getmtime(output_dir / "frame_000000.jpg") == kept_mtime
+    assert len(manifest_path.read_text().splitlines()) == 5
@@ -0,0 +1,81 @@
+import cv2
+from pathlib import Path
+from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.extract.parallel import extract_frames_parallel, split_segments
+
+
+def test_split_segments_covers_range_contiguously():
+    segments = split_segments(10, 3)
+    assert segments == [(0, 3), (3, 6), (6, 10)]
+    assert split_segments(2, 8) == [(0, 1), (1, 2)]
+
+
+def _frame_indices(directory: Path):
+    return sorted(int(p.stem.split("_")[1]) for p in directory.glob("*.jpg"))
+
+
+def test_extract_frames_parallel_matches_serial(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=20)
+
+    serial_dir = tmp_path / "serial"
+    cap = cv2.VideoCapture(str(video_path))
+    serial_count, _, _ = extract_frames(cap, str(serial_dir), skip_frequency=3)
+    cap.release()
+
+    parallel_dir = tmp_path / "parallel"
+    parallel_count, _, timing = extract_frames_parallel(
+        str(video_path),
+        str(parallel_dir),
+        {"frame_count": 20, "fps": 1.0},
+        workers=3,
+        skip_frequency=3,
+    )
+
+    assert parallel_count == serial_count == 7
+    assert _frame_indices(parallel_dir) == _frame_indices(serial_dir)
+    assert "frame_extraction" in timing
+
+
+def test_extract_frames_parallel_with_writer_threads(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=12)
+    output_dir = tmp_path / "frames"
+    kwargs = dict(workers=2, skip_frequency=3, writer_threads=2)
+
+    saved, write_errors, _ = extract_frames_parallel(
+        str(video_path), str(output_dir), {"frame_count": 12, "fps": 1.0}, **kwargs
+    )
+    assert (saved, write_errors) == (4, 0)
+    assert _frame_indices(output_dir) == [0, 3, 6, 9]
+
+    # Frames written by the pools were committed, so a resumed run keeps them
+    resumed, _, _ = extract_frames_parallel(
+        str(video_path),
+        str(output_dir),
+        {"frame_count": 12, "fps": 1.0},
+        resume=True,
+        **kwargs,
+    )
+    assert resumed == 4
+
+
+def test_extract_frames_parallel_reports_write_errors(
+    create_test_video, tmp_path: Path
+):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=12)
+    output_dir = tmp_path / "frames"
+    # A directory in place of a frame file makes that frame's write fail
+    (output_dir / "frame_000009.jpg").mkdir(parents=True)
+
+    saved, write_errors, _ = extract_frames_parallel(
+        str(video_path),
+        str(output_dir),
+        {"frame_count": 12, "fps": 1.0},
+        workers=3,
+        skip_frequency=3,
+    )
+
+    assert write_errors == 1
+    assert saved == 3
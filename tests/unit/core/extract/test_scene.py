@@ -0,0 +1,78 @@
+import cv2
+import numpy as np
+from pathlib import Path
+from pipeline.core.extract.extractor import extract_frames
+from pipeline.core.extract.manifest import MANIFEST_NAME
+from pipeline.core.extract.parallel import extract_frames_parallel
+from pipeline.core.extract.scene import SceneChangeSelector
+
+
+def test_scene_change_selector_keeps_changes_and_enforces_max_gap():
+    static = np.full((120, 160, 3), 100, dtype=np.uint8)
+    changed = np.full((120, 160, 3), 200, dtype=np.uint8)
+    frames = [static] * 5 + [changed] + [changed] * 6
+
+    select = SceneChangeSelector(threshold=10.0, max_gap=4)
+    kept = [idx for idx, frame in enumerate(frames) if select(idx, frame)]
+
+    # first frame, forced by max_gap at 4, scene change at 5, forced again at 9
+    assert kept == [0, 4, 5, 9]
+
+
+def test_scene_change_selector_without_max_gap():
+    static = np.zeros((32, 32), dtype=np.uint8)
+    select = SceneChangeSelector(threshold=1.0)
+    assert [select(i, static) for i in range(4)] == [True, False, False, False]
+
+
+def create_scene_video(video_path: Path, num_frames: int = 60):
+    """Video whose content changes every 10 frames and is static in between."""
+    out = cv2.VideoWriter(
+        str(video_path), cv2.VideoWriter.fourcc(*"mp4v"), 1.0, (64, 64)
+    )
+    for i in range(num_frames):
+        out.write(np.full((64, 64, 3), 40 * (i // 10) + 20, dtype=np.uint8))
+    out.release()
+
+
+def test_scene_extraction_resume_matches_uninterrupted_run(tmp_path: Path):
+    video_path = tmp_path / "scenes.mp4"
+    create_scene_video(video_path)
+    output_dir = tmp_path / "frames"
+
+    cap = cv2.VideoCapture(str(video_path))
+    extract_frames(cap, str(output_dir), scene_threshold=20.0)
+    cap.release()
+    full_run = sorted(p.name for p in output_dir.glob("*.jpg"))
+    assert full_run == [f"frame_{i:06d}.jpg" for i in range(0, 60, 10)]
+
+    # Pretend the run was preempted after its first two frames
+    manifest_path = output_dir / MANIFEST_NAME
+    lines = manifest_path.read_text().splitlines()
+    manifest_path.write_text("\n".join(lines[:3]) + "\n")
+    for name in full_run[2:]:
+        (output_dir / name).unlink()
+
+    cap = cv2.VideoCapture(str(video_path))
+    saved, _, _ = extract_frames(
+        cap, str(output_dir), scene_threshold=20.0, resume=True
+    )
+    cap.release()
+
+    assert saved == 6
+    assert sorted(p.name for p in output_dir.glob("*.jpg")) == full_run
+
+    for name in full_run[2:]:
+        (output_dir / name).unlink()
+    manifest_path.write_text("\n".join(lines[:3]) + "\n")
+    saved, _, _ = extract_frames_parallel(
+        str(video_path),
+        str(output_dir),
+        {"frame_count": 60, "fps": 1.0},
+        workers=2,
+        scene_threshold=20.0,
+        resume=True,
+    )
+
+    assert saved == 6
+    assert sorted(p.name for p in output_dir.glob("*.jpg")) == full_run
@@ -0,0 +1,38 @@
+import numpy as np
+from pathlib import Path
+from pipeline.core.extract.writer import FrameWriterPool
+
+
+def test_writer_pool_writes_and_reports_errors(tmp_path: Path):
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    missing_dir = tmp_path / "missing" / "frame_bad.jpg"
+
+    with FrameWriterPool(threads=2, max_pending=2) as writer:
+        for i in range(5):
+            writer.submit(str(tmp_path / f"frame_{i}.jpg"), frame)
+        writer.submit(str(missing_dir), frame)
+
+    assert writer.written == 5
+    assert len(list(tmp_path.glob("*.jpg"))) == 5
+    assert [path for path, _ in writer.errors] == [str(missing_dir)]
+
+
+def test_writer_pool_survives_failing_callback(tmp_path: Path):
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    committed = []
+
+    def on_written(frame_idx: int) -> None:
+        if frame_idx == 1:
+            raise OSError("manifest is read-only")
+        committed.append(frame_idx)
+
+    # One thread and one slot: a dead worker would block the next submit
+    with FrameWriterPool(threads=1, max_pending=1, on_written=on_written) as writer:
+        for i in range(4):
+            writer.submit(str(tmp_path / f"frame_{i}.jpg"), frame, i)
+
+    assert sorted(committed) == [0, 2, 3]
+    assert writer.written == 3
+    assert writer.errors == [
+        (str(tmp_path / "frame_1.jpg"), "on_written failed: manifest is read-only")
+    ]
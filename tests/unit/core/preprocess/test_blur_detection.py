@@ -1,4 +1,8 @@
-from pipeline.core.preprocess.blur_detector import clean_blurry_frames
+import numpy as np
+from pipeline.core.preprocess.blur_detector import (
+    clean_blurry_frames,
+    compute_blur_scores,
+)
 
 
 def test_clean_blurry_frames(create_blurry_test_images, tmp_path):
@@ -15,3 +19,18 @@ def test_clean_blurry_frames(create_blurry_test_images, tmp_path):
     assert blurred_count == 1
     assert (output_dir / "clear.jpg").exists()
     assert not (output_dir / "blurry.jpg").exists()
+
+
+def test_compute_blur_scores_chunks_and_unreadable(create_blurry_test_images, tmp_path):
+    clear, blurry = create_blurry_test_images()
+    broken = tmp_path / "broken.jpg"
+    broken.write_text("not an image")
+    frames = [clear, blurry, broken, clear]
+
+    scores = compute_blur_scores(frames, chunk_size=1, workers=2)
+
+    assert scores.shape == (4,)
+    assert scores[0] == scores[3] > scores[1]
+    assert np.isnan(scores[2])
+    reduced = compute_blur_scores(frames[:2], reduction=2)
+    assert reduced.shape == (2,)
@@ -1,4 +1,8 @@
-from pipeline.core.preprocess.deduplicator import dedupe_frames
+import cv2
+import numpy as np
+import pytest
+from pipeline.core.extract.extractor import frame_filename
+from pipeline.core.preprocess.deduplicator import dedupe_frames, iter_unique_frames
 
 
 def test_dedupe_frames(create_duplicate_test_images, tmp_path):
@@ -19,3 +23,45 @@ def test_dedupe_frames(create_duplicate_test_images, tmp_path):
     assert "img_1.jpg" in deduped_names
     assert "img_3.jpg" in deduped_names
     assert not (output_dir / "img_2.jpg").exists()
+
+
+def _write_frames(tmp_path, colors):
+    paths = []
+    for idx, color in enumerate(colors):
+        path = tmp_path / frame_filename(idx)
+        img = np.zeros((64, 64, 3), dtype=np.uint8)
+        img[: 32 if color else 0] = 255
+        cv2.imwrite(str(path), img)
+        paths.append(path)
+    return paths
+
+
+def test_windowed_dedupe_only_compares_recent_frames(tmp_path):
+    # Scene A, scene B, then scene A again after B
+    frames = _write_frames(tmp_path, [1, 1, 0, 0, 1])
+    output_dir = tmp_path / "deduped"
+    output_dir.mkdir()
+
+    deduped, dup_count, _ = dedupe_frames(frames, output_dir, threshold=0)
+    assert dup_count == 3
+
+    for p in output_dir.iterdir():
+        p.unlink()
+    deduped, dup_count, _ = dedupe_frames(frames, output_dir, threshold=0, window=1)
+    assert dup_count == 2
+    assert [p.name for p in deduped] == [frame_filename(i) for i in (0, 2, 4)]
+
+
+def test_iter_unique_frames_windows_by_seconds(tmp_path):
+    frames = _write_frames(tmp_path, [1, 1, 0, 0, 1])
+
+    results = list(
+        iter_unique_frames(
+            iter(frames), threshold=0, window_seconds=1.0, fps=2.0, batch_size=2
+        )
+    )
+    # Frame 4 (t=2s) is more than 1s after frame 0 (t=0s), the last kept A
+    assert [dup for _, dup in results] == [False, True, False, True, False]
+
+    with pytest.raises(ValueError):
+        list(iter_unique_frames(frames, window_seconds=1.0))
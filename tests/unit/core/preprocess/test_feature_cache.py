@@ -0,0 +1,105 @@
+import cv2
+import imagehash
+import numpy as np
+from PIL import Image
+from pipeline.core.preprocess import blur_detector, deduplicator, fused
+from pipeline.core.preprocess.blur_detector import compute_blur_scores
+from pipeline.core.preprocess.deduplicator import iter_file_hashes
+from pipeline.core.preprocess.feature_cache import FeatureCache
+from pipeline.core.preprocess.fused import analyze_frames
+from pipeline.core.preprocess.hash_index import hash_to_int
+from pipeline.core.preprocess.runner import VideoPreprocessor
+
+
+def _no_decode(monkeypatch):
+    def fail(*args):
+        raise AssertionError("frame decoded despite cached features")
+
+    for module in (blur_detector, fused):
+        monkeypatch.setattr(module.cv2, "imread", fail)
+    monkeypatch.setattr(deduplicator.Image, "open", fail)
+
+
+def test_digests_are_content_keyed(tmp_path):
+    a, b = tmp_path / "a.jpg", tmp_path / "b.jpg"
+    a.write_bytes(b"same")
+    b.write_bytes(b"same")
+
+    with FeatureCache(tmp_path / "cache.sqlite") as cache:
+        first = cache.digests([a, b])
+        assert first[0] == first[1]
+        b.write_bytes(b"changed")
+        assert cache.digests([a, b])[1] != first[1]
+
+
+def test_features_round_trip(tmp_path):
+    with FeatureCache(tmp_path / "cache.sqlite") as cache:
+        cache.put_blur_scores([("d1", 12.5)], reduction=2)
+        cache.put_hashes([("d1", 2**63 + 5)], hash_size=8)
+
+    with FeatureCache(tmp_path / "cache.sqlite") as cache:
+        assert cache.get_blur_scores(["d1", "d2"], reduction=2) == {"d1": 12.5}
+        assert cache.get_blur_scores(["d1"], reduction=1) == {}
+        assert cache.get_hashes(["d1"], hash_size=8) == {"d1": 2**63 + 5}
+        assert cache.get_hashes(["d1"], hash_size=8, reduction=8) == {}
+
+
+def test_cached_features_skip_decoding(create_test_images, tmp_path, monkeypatch):
+    frames = create_test_images(tmp_path)
+    with FeatureCache(tmp_path / "cache.sqlite") as cache:
+        scores = compute_blur_scores(frames, cache=cache)
+        hashes = list(iter_file_hashes(frames, cache=cache))
+        analysis = analyze_frames(frames, cache=cache)
+
+        _no_decode(monkeypatch)
+        np.testing.assert_array_equal(compute_blur_scores(frames, cache=cache), scores)
+        assert list(iter_file_hashes(frames, cache=cache)) == hashes
+        cached = analyze_frames(frames, cache=cache)
+        np.testing.assert_array_equal(cached.scores, analysis.scores)
+        assert cached.hashes == analysis.hashes
+
+
+def test_rerun_with_new_thresholds_uses_cache(
+    create_test_images, tmp_path, monkeypatch
+):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    create_test_images(input_dir)
+    cache_path = tmp_path / "cache.sqlite"
+
+    def run(output, blur_threshold, dedub_threshold, fused=False):
+        pre = VideoPreprocessor(
+            blur_threshold=blur_threshold,
+            dedub_threshold=dedub_threshold,
+            hash_size=8,
+            fused=fused,
+            feature_cache=cache_path,
+        )
+        pre.run(input_dir=input_dir, output_dir=tmp_path / output)
+        return pre.cleaned, pre.deduped
+
+    assert run("first", 100, 0) == (1, 1)
+    assert run("fused", 100, 0, fused=True) == (1, 1)
+
+    _no_decode(monkeypatch)
+    assert run("second", 100, 64) == (1, 1)
+    # With blur filtering off, the blurred copy hashes like the sharp frame
+    assert run("fused_again", 0, 0, fused=True) == (0, 2)
+
+
+def test_reduced_hashes_are_not_reused_at_full_size(tmp_path):
+    rng = np.random.default_rng(3)
+    frames = []
+    for i in range(4):
+        noise = rng.integers(0, 256, size=(240, 320, 3), dtype=np.uint8)
+        frames.append(tmp_path / f"frame_{i:06d}.jpg")
+        cv2.imwrite(str(frames[-1]), cv2.GaussianBlur(noise, (5, 5), 0))
+    full = [hash_to_int(imagehash.phash(Image.open(f))) for f in frames]
+
+    with FeatureCache(tmp_path / "cache.sqlite") as cache:
+        reduced = analyze_frames(frames, reduction=8, cache=cache).hashes
+        assert reduced != full
+
+        assert [h for _, h in iter_file_hashes(frames, cache=cache)] == full
+        assert analyze_frames(frames, reduction=8, cache=cache).hashes == reduced
+        assert analyze_frames(frames, reduction=1, cache=cache).hashes == full
@@ -0,0 +1,46 @@
+from pipeline.core.preprocess.fused import analyze_frames, fused_preprocess
+from pipeline.core.preprocess.runner import VideoPreprocessor
+
+
+def test_analyze_frames_marks_unreadable(create_test_images, tmp_path):
+    paths = create_test_images(tmp_path)
+    broken = tmp_path / "broken.jpg"
+    broken.write_bytes(b"not a jpeg")
+
+    analysis = analyze_frames(paths + [broken], chunk_size=2)
+
+    assert len(analysis.scores) == 4
+    assert analysis.hashes[0] == analysis.hashes[1]
+    assert analysis.hashes[3] is None
+
+
+def test_fused_preprocess_applies_both_filters(create_test_images, tmp_path):
+    paths = create_test_images(tmp_path)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    kept, blurry, duplicates, timing = fused_preprocess(
+        paths, output_dir, blur_threshold=100, dedup_threshold=0
+    )
+
+    assert [p.name for p in kept] == ["img_1.jpg"]
+    assert (blurry, duplicates) == (1, 1)
+    assert {"fused_preprocessing", "blur_detection", "dedublication"} <= set(timing)
+
+
+def test_video_preprocessor_fused_matches_two_pass(create_test_images, tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    create_test_images(input_dir)
+
+    results = []
+    for fused in (False, True):
+        pre = VideoPreprocessor(
+            blur_threshold=100, dedub_threshold=0, hash_size=8, fused=fused
+        )
+        final_dir = pre.run(input_dir=input_dir, output_dir=tmp_path / str(fused))
+        names = sorted(p.name for p in final_dir.glob("*.jpg"))
+        results.append((names, pre.cleaned, pre.deduped))
+        assert "blur_detection" in pre.blur_detection_timing
+
+    assert results[0] == results[1]
@@ -0,0 +1,97 @@
+import random
+import pytest
+import imagehash
+import numpy as np
+from pipeline.core.preprocess.hash_index import (
+    MultiIndexHashIndex,
+    RecentHashWindow,
+    hamming,
+    hash_bits,
+    hash_to_int,
+)
+
+
+def _clustered_hashes(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    bases = [rng.getrandbits(64) for _ in range(20)]
+    hashes = []
+    for _ in range(n):
+        h = rng.choice(bases)
+        for _ in range(rng.randint(0, 8)):
+            h ^= 1 << rng.randrange(64)
+        hashes.append(h)
+    return hashes
+
+
+def test_hash_to_int_preserves_hamming_distance():
+    rng = np.random.default_rng(0)
+    a = imagehash.ImageHash(rng.random((8, 8)) > 0.5)
+    b = imagehash.ImageHash(rng.random((8, 8)) > 0.5)
+    assert hamming(hash_to_int(a), hash_to_int(b)) == a - b
+
+
+def test_hash_bits_is_byte_aligned():
+    assert hash_bits(8) == 64
+    assert hash_bits(5) == 32
+
+
+def test_index_matches_linear_scan_decisions():
+    threshold = 5
+    index = MultiIndexHashIndex(64, threshold)
+    linear = []
+    for h in _clustered_hashes(2000):
+        expected = any(hamming(h, s) <= threshold for s in linear)
+        assert index.contains_within(h) == expected
+        if not expected:
+            index.add(h)
+            linear.append(h)
+    assert len(index) == len(linear)
+
+
+@pytest.mark.parametrize("bits", [32, 64, 256])
+@pytest.mark.parametrize("radius", [0, 1, 3, 5, 8, 12])
+def test_index_query_matches_brute_force(bits, radius):
+    rng = random.Random(bits * 100 + radius)
+    bases = [rng.getrandbits(bits) for _ in range(10)]
+    stored = []
+    for _ in range(300):
+        h = rng.choice(bases)
+        for _ in range(rng.randint(0, radius + 2)):
+            h ^= 1 << rng.randrange(bits)
+        stored.append(h)
+    index = MultiIndexHashIndex(bits, radius)
+    for h in set(stored):
+        index.add(h)
+    for query in stored[:50] + [rng.getrandbits(bits) for _ in range(10)]:
+        expected = sorted(
+            (h, hamming(query, h)) for h in set(stored) if hamming(query, h) <= radius
+        )
+        assert sorted(index.query(query)) == expected
+
+
+def test_index_query_returns_all_matches():
+    index = MultiIndexHashIndex(8, 2)
+    for h in [0b0000, 0b0001, 0b0011, 0b1111]:
+        index.add(h)
+    assert sorted(index.query(0b0000)) == [(0b0000, 0), (0b0001, 1), (0b0011, 2)]
+    assert index.query(0b0000, radius=0) == [(0b0000, 0)]
+
+
+def test_index_rejects_radius_above_build_radius():
+    index = MultiIndexHashIndex(64, 2)
+    with pytest.raises(ValueError):
+        index.query(0, radius=3)
+
+
+def test_recent_window_forgets_old_hashes():
+    window = RecentHashWindow(radius=0, max_items=2)
+    for h in [1, 2, 3]:
+        window.add(h)
+    assert len(window) == 2
+    assert not window.contains_within(1)
+    assert window.contains_within(3)
+
+    timed = RecentHashWindow(radius=0, max_age=10.0)
+    timed.add(1, at=0.0)
+    assert timed.contains_within(1, at=10.0)
+    assert not timed.contains_within(1, at=10.5)
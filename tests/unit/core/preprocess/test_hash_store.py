@@ -0,0 +1,123 @@
+import random
+import shutil
+import numpy as np
+import pytest
+from pipeline.core.preprocess.hash_store import (
+    HASHES_NAME,
+    SOURCES_NAME,
+    HashStore,
+    _chunk_keys,
+    _int_chunk_key,
+)
+from pipeline.core.preprocess.runner import VideoPreprocessor
+
+
+def test_int_and_array_chunk_keys_agree():
+    rng = random.Random(0)
+    for bits, lo, hi in [(64, 0, 11), (64, 53, 64), (256, 0, 86), (256, 200, 256)]:
+        value = rng.getrandbits(bits)
+        row = np.frombuffer(value.to_bytes(bits // 8, "big"), dtype=np.uint8)
+        assert _chunk_keys(row[np.newaxis], lo, hi)[0] == _int_chunk_key(
+            value, bits, lo, hi
+        )
+
+
+def test_store_persists_and_matches_brute_force(tmp_path):
+    rng = random.Random(1)
+    base = rng.getrandbits(64)
+    stored = [base ^ rng.getrandbits(64) if i % 3 else base for i in range(500)]
+    with HashStore(tmp_path, "cam", hash_size=8, radius=4) as store:
+        for h in stored:
+            store.add(h)
+    assert (tmp_path / "cam" / HASHES_NAME).stat().st_size == 500 * 8
+
+    store = HashStore(tmp_path, "cam", hash_size=8, radius=4)
+    assert len(store) == 500
+    for _ in range(300):
+        query = rng.choice(stored)
+        for _ in range(rng.randint(0, 8)):
+            query ^= 1 << rng.randrange(64)
+        expected = any((query ^ h).bit_count() <= 4 for h in stored)
+        assert store.contains_within(query) == expected
+
+
+def test_store_ignores_torn_row_and_checks_hash_size(tmp_path):
+    with HashStore(tmp_path, "cam", hash_size=8, radius=2) as store:
+        store.add(123)
+    with open(tmp_path / "cam" / HASHES_NAME, "ab") as f:
+        f.write(b"\x01\x02")
+
+    assert len(HashStore(tmp_path, "cam", hash_size=8, radius=2)) == 1
+    with pytest.raises(ValueError):
+        HashStore(tmp_path, "cam", hash_size=16, radius=2)
+
+
+def test_store_appends_stay_aligned_after_interrupted_append(tmp_path):
+    with HashStore(tmp_path, "cam", hash_size=8, radius=0, source="a") as store:
+        store.add(0x0F0F0F0F0F0F0F0F)
+    # A crash mid-append: half a hash row, and no source id for it
+    with open(tmp_path / "cam" / HASHES_NAME, "ab") as f:
+        f.write(b"\xff" * 3)
+
+    with HashStore(tmp_path, "cam", hash_size=8, radius=0, source="b") as store:
+        store.add(0x1234)
+    with HashStore(tmp_path, "cam", hash_size=8, radius=0, source="c") as store:
+        store.add(0x5678)
+    # Only the hash row of the next write lands: sources.bin is one id short
+    with open(tmp_path / "cam" / HASHES_NAME, "ab") as f:
+        f.write((0x9ABC).to_bytes(8, "big"))
+
+    store = HashStore(tmp_path, "cam", hash_size=8, radius=0, source="z")
+    assert len(store) == 4
+    for packed in (0x0F0F0F0F0F0F0F0F, 0x1234, 0x5678, 0x9ABC):
+        assert store.contains_within(packed)
+    assert (tmp_path / "cam" / SOURCES_NAME).stat().st_size == 4 * 8
+    # The rerun of "b" skips its own row but still sees the unknown-source one
+    rerun = HashStore(tmp_path, "cam", hash_size=8, radius=0, source="b")
+    assert not rerun.contains_within(0x1234)
+    assert rerun.contains_within(0x9ABC)
+
+
+def test_store_skips_own_source_and_discards_on_error(tmp_path):
+    with HashStore(tmp_path, "cam", hash_size=8, radius=2, source="a.mp4") as store:
+        store.add(0b1111)
+
+    other = HashStore(tmp_path, "cam", hash_size=8, radius=2, source="b.mp4")
+    assert other.contains_within(0b0111)
+    rerun = HashStore(tmp_path, "cam", hash_size=8, radius=2, source="a.mp4")
+    assert not rerun.contains_within(0b0111)
+    rerun.add(0b1111)
+    rerun.flush()
+    assert (tmp_path / "cam" / SOURCES_NAME).stat().st_size == 8
+    assert len(HashStore(tmp_path, "cam", hash_size=8, radius=2)) == 1
+
+    with pytest.raises(RuntimeError):
+        with HashStore(tmp_path, "cam", hash_size=8, radius=2, source="c.mp4") as s:
+            s.add(1 << 40)
+            raise RuntimeError("detection failed")
+    assert (tmp_path / "cam" / HASHES_NAME).stat().st_size == 8
+
+
+def test_second_run_drops_frames_kept_by_first(create_test_images, tmp_path):
+    first_video = tmp_path / "first_video"
+    first_video.mkdir()
+    create_test_images(first_video)
+    second_video = tmp_path / "second_video"
+    shutil.copytree(first_video, second_video)
+
+    def run(input_dir, output, partition):
+        pre = VideoPreprocessor(
+            enable_blur_detection=False,
+            dedub_threshold=0,
+            hash_size=8,
+            hash_store=tmp_path / "store",
+            hash_partition=partition,
+        )
+        final_dir = pre.run(input_dir=input_dir, output_dir=tmp_path / output)
+        return len(list(final_dir.glob("*.jpg")))
+
+    kept = run(first_video, "first", "cam1")
+    assert kept > 0
+    assert run(first_video, "rerun", "cam1") == kept
+    assert run(second_video, "second", "cam1") == 0
+    assert run(second_video, "other_camera", "cam2") == kept
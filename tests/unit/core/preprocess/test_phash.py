@@ -0,0 +1,66 @@
+import cv2
+import imagehash
+import numpy as np
+import pytest
+from pathlib import Path
+from PIL import Image
+from pipeline.core.preprocess.deduplicator import iter_file_hashes
+from pipeline.core.preprocess.fused import analyze_frames
+from pipeline.core.preprocess.hash_index import hash_to_int
+from pipeline.core.preprocess.phash import (
+    batch_phash,
+    frame_phash,
+    hamming_distances,
+    packed_to_int,
+    phash_frames,
+)
+
+
+def test_batch_phash_matches_imagehash_on_presized_input():
+    rng = np.random.default_rng(0)
+    stack = rng.integers(0, 256, size=(5, 32, 32), dtype=np.uint8)
+
+    packed = batch_phash(stack, hash_size=8)
+
+    assert packed.shape == (5, 8)
+    for image, row in zip(stack, packed):
+        expected = imagehash.phash(Image.fromarray(image), hash_size=8)
+        assert packed_to_int(row) == hash_to_int(expected)
+
+
+def test_batch_phash_rejects_wrong_input_size():
+    with pytest.raises(ValueError):
+        batch_phash(np.zeros((2, 16, 16), dtype=np.uint8), hash_size=8)
+
+
+def test_hamming_distances_match_python_popcount():
+    rng = np.random.default_rng(1)
+    frames = [rng.integers(0, 256, size=(48, 64, 3), dtype=np.uint8) for _ in range(6)]
+    packed = phash_frames(frames)
+    ints = [packed_to_int(row) for row in packed]
+
+    distances = hamming_distances(packed[0], packed)
+    assert distances.tolist() == [(ints[0] ^ h).bit_count() for h in ints]
+    assert hamming_distances(packed, packed)[2, 4] == (ints[2] ^ ints[4]).bit_count()
+    assert frame_phash(frames[3]) == ints[3]
+
+
+def _photo_like_frames(tmp_path: Path, count: int = 6):
+    rng = np.random.default_rng(2)
+    paths = []
+    for i in range(count):
+        noise = rng.integers(0, 256, size=(180, 240, 3), dtype=np.uint8)
+        path = tmp_path / f"frame_{i:06d}.jpg"
+        cv2.imwrite(str(path), cv2.GaussianBlur(noise, (9, 9), 0))
+        paths.append(path)
+    return paths
+
+
+def test_file_hashes_are_bit_identical_with_imagehash(tmp_path: Path):
+    paths = _photo_like_frames(tmp_path)
+    expected = [hash_to_int(imagehash.phash(Image.open(p))) for p in paths]
+
+    assert [h for _, h in iter_file_hashes(paths, batch_size=4)] == expected
+    assert analyze_frames(paths, reduction=1).hashes == expected
+    frames = [np.asarray(Image.open(p))[..., ::-1] for p in paths]
+    assert [frame_phash(frame) for frame in frames] == expected
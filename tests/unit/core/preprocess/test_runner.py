@@ -1,4 +1,5 @@
 from pipeline.core.preprocess.runner import VideoPreprocessor
+from pipeline.utils.paths import list_frames
 
 
 def test_video_preprocessor_end_to_end(create_test_images, tmp_path):
@@ -27,3 +28,39 @@ def test_video_preprocessor_end_to_end(create_test_images, tmp_path):
     assert pre.cleaned == 1  # 1 blurry image removed
     assert pre.deduped == 1  # 1 duplicate image removed
     assert final_dir.exists()
+
+
+def test_video_preprocessor_manifest_mode_writes_no_frames(
+    create_test_images, tmp_path
+):
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    create_test_images(input_dir)
+
+    pre = VideoPreprocessor(
+        blur_threshold=100, dedub_threshold=0, hash_size=8, transfer="manifest"
+    )
+    selection = pre.run(input_dir=input_dir, output_dir=output_dir)
+
+    assert selection.is_file()
+    assert list_frames(selection) == [(input_dir / "img_1.jpg").resolve()]
+    assert not list(output_dir.rglob("*.jpg"))
+    assert (pre.cleaned, pre.deduped) == (1, 1)
+
+
+def test_video_preprocessor_rerun_drops_frames_of_earlier_run(
+    create_test_images, tmp_path
+):
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+    input_dir.mkdir()
+    create_test_images(input_dir)
+
+    lenient = VideoPreprocessor(enable_deduplication=False, blur_threshold=0)
+    assert len(list_frames(lenient.run(input_dir, output_dir))) == 3
+
+    strict = VideoPreprocessor(enable_deduplication=False, blur_threshold=100)
+    final_dir = strict.run(input_dir, output_dir)
+
+    assert [f.name for f in list_frames(final_dir)] == ["img_1.jpg", "img_2.jpg"]
@@ -0,0 +1,54 @@
+import random
+import numpy as np
+import pytest
+from pipeline.core.preprocess.runner import VideoPreprocessor
+from pipeline.core.preprocess.sweep import (
+    parse_grid,
+    run_threshold_sweep,
+    sweep_thresholds,
+)
+
+
+def test_parse_grid():
+    assert parse_grid("100,50,100") == [50.0, 100.0]
+    assert parse_grid("0:10:5") == [0.0, 5.0, 10.0]
+    with pytest.raises(ValueError):
+        parse_grid("a,b")
+    with pytest.raises(ValueError):
+        parse_grid("0:10:0")
+
+
+def test_sweep_matches_sequential_filtering():
+    rng = random.Random(0)
+    scores = np.array([rng.uniform(0, 200) for _ in range(300)])
+    base = rng.getrandbits(64)
+    hashes = [
+        base ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64)) for _ in scores
+    ]
+
+    rows = sweep_thresholds(scores, hashes, [50, 150], [0, 2, 4])
+
+    for row in rows:
+        survivors = [h for h, s in zip(hashes, scores) if s >= row["clean_threshold"]]
+        kept = []
+        for h in survivors:
+            if all((h ^ k).bit_count() > row["dedub_threshold"] for k in kept):
+                kept.append(h)
+        assert row["blurry"] == len(scores) - len(survivors)
+        assert row["kept"] == len(kept)
+        assert row["duplicates"] == len(survivors) - len(kept)
+
+
+def test_run_threshold_sweep_agrees_with_preprocessor(create_test_images, tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    frames = create_test_images(input_dir)
+
+    rows, timing = run_threshold_sweep(frames, [100], [0], hash_size=8)
+
+    pre = VideoPreprocessor(blur_threshold=100, dedub_threshold=0, hash_size=8)
+    final_dir = pre.run(input_dir=input_dir, output_dir=tmp_path / "out")
+    assert rows[0]["blurry"] == pre.cleaned
+    assert rows[0]["duplicates"] == pre.deduped
+    assert rows[0]["kept"] == len(list(final_dir.glob("*.jpg")))
+    assert "threshold_sweep" in timing
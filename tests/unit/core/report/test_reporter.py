@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
-from pipeline.core.report.reporter import generate_report
+from typing import Dict, List
+from pipeline.core.report.reporter import generate_batch_report, generate_report
 
 
 def test_generate_report(tmp_path: Path):
@@ -49,3 +50,28 @@ def test_generate_report(tmp_path: Path):
     assert "- cat: 1" in content
     assert "- frame_extraction: 0.05 sec" in content
     assert "- preprocessing: 0.10 sec" in content
+
+
+def test_generate_batch_report(tmp_path: Path):
+    results: List[Dict] = [
+        {
+            "video": "a.mp4",
+            "status": "ok",
+            "extracted": 10,
+            "cleaned": 2,
+            "deduped": 3,
+            "images_tagged": 5,
+            "annotations": 7,
+        },
+        {"video": "b.mp4", "status": "failed", "error": "cannot open"},
+    ]
+    report_path = tmp_path / "batch_report.md"
+
+    generate_batch_report(results, out_path=str(report_path), timings={"batch": 1.5})
+
+    content = report_path.read_text()
+    assert "**Videos Processed:** 1/2" in content
+    assert "**Frames Extracted:** 10" in content
+    assert "| `a.mp4` | ok | 10 | 2 | 3 | 5 | 7 |" in content
+    assert "failed: cannot open" in content
+    assert "- batch: 1.50 sec" in content
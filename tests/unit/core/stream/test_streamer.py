@@ -0,0 +1,159 @@
+import json
+import cv2
+import numpy as np
+from pathlib import Path
+from pipeline.core.extract.extractor import frame_filename
+from pipeline.core.stream import streamer
+from pipeline.core.stream.streamer import run_streaming_pipeline
+from typing import Dict, List, Sequence
+from pipeline.models.base import BaseModelRunner, DetectionResult, ImageInput
+
+
+class MockArrayModel(BaseModelRunner):
+    def __init__(self):
+        self.inputs: List[ImageInput] = []
+        self.batches: List[int] = []
+
+    def predict_batch(
+        self, images: Sequence[ImageInput], batch_size: int = 1
+    ) -> List[DetectionResult]:
+        self.batches.append(len(images))
+        return super().predict_batch(images, batch_size)
+
+    def predict(self, image: ImageInput) -> DetectionResult:
+        assert isinstance(image, np.ndarray)
+        self.inputs.append(image)
+        return DetectionResult(
+            boxes=[
+                {
+                    "x1": 1,
+                    "y1": 2,
+                    "x2": 11,
+                    "y2": 22,
+                    "conf": 0.8,
+                    "label": "person",
+                    "class_id": 0,
+                }
+            ],
+            width=image.shape[1],
+            height=image.shape[0],
+        )
+
+    @property
+    def class_names(self) -> Dict[int, str]:
+        return {0: "person"}
+
+
+def create_static_video(video_path: Path, num_frames: int = 6):
+    """Video whose frames are all identical except one blurred frame."""
+    fourcc = cv2.VideoWriter.fourcc(*"mp4v")
+    out = cv2.VideoWriter(str(video_path), fourcc, 1.0, (64, 64))
+    sharp = np.zeros((64, 64, 3), dtype=np.uint8)
+    sharp[::4, :] = 255
+    sharp[:, ::4] = 255
+    for i in range(num_frames):
+        out.write(cv2.GaussianBlur(sharp, (15, 15), 0) if i == 2 else sharp)
+    out.release()
+
+
+def test_streaming_pipeline_filters_in_memory(tmp_path: Path):
+    video_path = tmp_path / "static.mp4"
+    create_static_video(video_path)
+    output_dir = tmp_path / "frames"
+    coco_path = tmp_path / "annotations.coco.json"
+    model = MockArrayModel()
+
+    cap = cv2.VideoCapture(str(video_path))
+    stats, timing = run_streaming_pipeline(
+        cap,
+        output_dir,
+        blur_threshold=100.0,
+        dedup_threshold=5,
+        hash_size=8,
+        model=model,
+        coco_output_path=coco_path,
+    )
+    cap.release()
+
+    assert stats.extracted == 6
+    assert stats.blurry == 1
+    assert stats.duplicates >= 3
+    assert stats.saved == stats.extracted - stats.blurry - stats.duplicates
+    assert len(list(output_dir.glob("*.jpg"))) == stats.saved
+    assert all(isinstance(img, np.ndarray) for img in model.inputs)
+    assert "streaming_pipeline" in timing
+
+    with open(coco_path) as f:
+        data = json.load(f)
+    assert len(data["images"]) == stats.saved
+    assert stats.annotations == len(data["annotations"]) == stats.saved
+
+
+def test_streaming_pipeline_without_filters(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=5)
+    output_dir = tmp_path / "frames"
+
+    cap = cv2.VideoCapture(str(video_path))
+    stats, _ = run_streaming_pipeline(cap, output_dir, skip_frequency=2)
+    cap.release()
+
+    assert stats.extracted == 3
+    assert stats.saved == 3
+    assert len(list(output_dir.glob("*.jpg"))) == 3
+
+
+def test_streaming_pipeline_batches_detection(create_test_video, tmp_path: Path):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=5)
+    coco_path = tmp_path / "annotations.coco.json"
+    model = MockArrayModel()
+
+    cap = cv2.VideoCapture(str(video_path))
+    stats, _ = run_streaming_pipeline(
+        cap,
+        tmp_path / "frames",
+        model=model,
+        coco_output_path=coco_path,
+        batch_size=2,
+    )
+    cap.release()
+
+    assert model.batches == [2, 2, 1]
+    with open(coco_path) as f:
+        data = json.load(f)
+    assert [img["file_name"] for img in data["images"]] == sorted(
+        p.name for p in (tmp_path / "frames").glob("*.jpg")
+    )
+    assert stats.images_tagged == 5
+
+
+def test_streaming_pipeline_skips_frames_that_fail_to_write(
+    create_test_video, tmp_path: Path, monkeypatch
+):
+    video_path = tmp_path / "test_video.mp4"
+    create_test_video(video_path, num_frames=4)
+    coco_path = tmp_path / "annotations.coco.json"
+    model = MockArrayModel()
+
+    real_imwrite = cv2.imwrite
+
+    def flaky_imwrite(filename, img, *args):
+        return not filename.endswith(frame_filename(1)) and real_imwrite(
+            filename, img, *args
+        )
+
+    monkeypatch.setattr(streamer.cv2, "imwrite", flaky_imwrite)
+    cap = cv2.VideoCapture(str(video_path))
+    stats, _ = run_streaming_pipeline(
+        cap, tmp_path / "frames", model=model, coco_output_path=coco_path
+    )
+    cap.release()
+
+    assert (stats.saved, stats.write_errors) == (3, 1)
+    with open(coco_path) as f:
+        data = json.load(f)
+    assert [img["file_name"] for img in data["images"]] == sorted(
+        p.name for p in (tmp_path / "frames").glob("*.jpg")
+    )
+    assert stats.images_tagged == 3
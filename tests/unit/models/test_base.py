@@ -0,0 +1,70 @@
+import numpy as np
+from pipeline.models.base import DetectionResult, labels_for
+
+
+def sample_result():
+    return DetectionResult(
+        [
+            {"x1": 10, "y1": 20, "x2": 50, "y2": 60, "conf": 0.9, "label": "person"},
+            {
+                "x1": 0,
+                "y1": 0,
+                "x2": 4,
+                "y2": 2,
+                "conf": 0.1,
+                "label": "dog",
+                "class_id": 16,
+            },
+        ],
+        width=320,
+        height=240,
+    )
+
+
+def test_detection_result_round_trips_box_dicts():
+    result = sample_result()
+
+    assert len(result) == 2
+    assert result.xyxy.shape == (2, 4)
+    assert result.class_ids.tolist() == [-1, 16]
+    assert result.boxes[1] == {
+        "x1": 0.0,
+        "y1": 0.0,
+        "x2": 4.0,
+        "y2": 2.0,
+        "conf": 0.1,
+        "label": "dog",
+        "class_id": 16,
+    }
+
+
+def test_detection_result_coco_geometry():
+    result = sample_result()
+
+    assert result.xywh.tolist() == [[10, 20, 40, 40], [0, 0, 4, 2]]
+    assert result.areas.tolist() == [1600, 8]
+
+
+def test_detection_result_above_filters_every_array():
+    result = sample_result()
+
+    kept = result.above(0.5)
+    assert kept.labels.tolist() == ["person"]
+    assert kept.xyxy.tolist() == [[10, 20, 50, 60]]
+    assert (kept.width, kept.height) == (320, 240)
+    assert result.above(0.0) is result
+    assert len(result.above(0.95)) == 0
+
+
+def test_from_arrays_and_labels_for():
+    class_ids = np.array([2, 0, 2, 7])
+
+    labels = labels_for(class_ids, {0: "person", 2: "car"})
+    result = DetectionResult.from_arrays(
+        np.zeros((4, 4)), np.ones(4), class_ids, labels, 64, 48
+    )
+
+    assert labels.tolist() == ["car", "person", "car", "7"]
+    assert [b["label"] for b in result.boxes] == ["car", "person", "car", "7"]
+    assert len(DetectionResult()) == 0
+    assert DetectionResult().boxes == []
@@ -0,0 +1,17 @@
+import pytest
+from unittest.mock import patch
+from pipeline.models.factory import build_model_runner
+from pipeline.models.yolo import YOLOv8Runner
+
+
+def test_build_model_runner_defaults_to_torch():
+    with patch("pipeline.models.yolo.YOLO") as MockYOLO:
+        runner = build_model_runner({"path": "weights.pt"})
+
+    assert isinstance(runner, YOLOv8Runner)
+    MockYOLO.assert_called_once_with("weights.pt")
+
+
+def test_build_model_runner_rejects_unknown_backend():
+    with pytest.raises(ValueError, match="backend"):
+        build_model_runner({"backend": "tensorrt"})
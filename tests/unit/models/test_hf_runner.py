@@ -1,3 +1,4 @@
+import numpy as np
 from unittest.mock import patch, MagicMock
 from pipeline.models.hf import HuggingFaceRunner
 from pipeline.models.base import DetectionResult
@@ -33,3 +34,70 @@ def test_huggingface_runner_predict(mock_open, mock_pipeline, tmp_path):
     assert len(result.boxes) == 1
     assert result.boxes[0]["label"] == "dog"
     assert result.boxes[0]["x1"] == 10
+
+
+@patch("pipeline.models.hf.pipeline")
+@patch("PIL.Image.open")
+def test_huggingface_runner_predict_batch(mock_open, mock_pipeline, tmp_path):
+    paths = [tmp_path / f"test_{i}.jpg" for i in range(3)]
+    for path in paths:
+        path.write_text("fake")
+
+    mock_img = MagicMock()
+    mock_img.width = 640
+    mock_img.height = 480
+    mock_open.return_value = mock_img
+
+    def detect(sources, batch_size, threshold):
+        return [
+            [
+                {
+                    "box": {"xmin": i, "ymin": 0, "xmax": 10, "ymax": 10},
+                    "score": 0.9,
+                    "label": "dog",
+                }
+            ]
+            for i, _ in enumerate(sources)
+        ]
+
+    mock_detector = MagicMock(side_effect=detect)
+    mock_pipeline.return_value = mock_detector
+
+    runner = HuggingFaceRunner("mock-model")
+    results = runner.predict_batch(paths, batch_size=2)
+
+    mock_detector.assert_called_once_with([mock_img] * 3, batch_size=2, threshold=0.5)
+    assert mock_open.call_count == 3
+    assert mock_img.__exit__.call_count == 3
+    assert [r.boxes[0]["x1"] for r in results] == [0, 1, 2]
+    assert all(r.width == 640 and r.height == 480 for r in results)
+
+
+@patch("pipeline.models.hf.pipeline")
+def test_huggingface_runner_predict_array_converts_bgr(mock_pipeline):
+    frame = np.zeros((48, 64, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # blue in OpenCV's BGR order
+    mock_detector = MagicMock(return_value=[])
+    mock_pipeline.return_value = mock_detector
+
+    result = HuggingFaceRunner("mock-model").predict(frame)
+
+    (pil_image,), _ = mock_detector.call_args
+    assert pil_image.getpixel((0, 0)) == (0, 0, 255)
+    assert (result.width, result.height) == (64, 48)
+    assert result.boxes == []
+
+
+@patch("pipeline.models.hf.pipeline")
+def test_huggingface_runner_cache_key_follows_revision(mock_pipeline, tmp_path):
+    mock_pipeline.return_value.model.config._commit_hash = "abc123"
+    assert HuggingFaceRunner("mock-model").cache_key == "hf:mock-model@abc123"
+
+    # Local checkpoints have no hub commit; their weights are hashed instead
+    mock_pipeline.return_value.model.config._commit_hash = None
+    local = HuggingFaceRunner(str(tmp_path))
+    assert local.cache_key is None
+    (tmp_path / "model.safetensors").write_bytes(b"v1")
+    first = local.cache_key
+    (tmp_path / "model.safetensors").write_bytes(b"v2")
+    assert first is not None and local.cache_key != first
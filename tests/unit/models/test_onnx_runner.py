@@ -0,0 +1,116 @@
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from pipeline.models.onnx import ONNXRunner, export_onnx, export_path, nms, postprocess
+
+
+def test_nms_drops_overlapping_boxes():
+    boxes = np.array(
+        [[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30]], dtype=np.float32
+    )
+    scores = np.array([0.8, 0.9, 0.7], dtype=np.float32)
+
+    assert nms(boxes, scores, iou_threshold=0.5).tolist() == [1, 2]
+    assert nms(boxes, scores, iou_threshold=0.9).tolist() == [1, 0, 2]
+
+
+def test_postprocess_decodes_and_keeps_classes_apart():
+    # Two overlapping boxes of different classes and one low-confidence box
+    output = np.array(
+        [
+            [50, 51, 200],  # cx
+            [50, 50, 200],  # cy
+            [20, 20, 10],  # w
+            [20, 20, 10],  # h
+            [0.9, 0.1, 0.1],  # class 0
+            [0.0, 0.8, 0.2],  # class 1
+        ],
+        dtype=np.float32,
+    )
+
+    detections = postprocess(output, conf_threshold=0.25)
+
+    assert detections.shape == (2, 6)
+    assert detections[0].tolist() == pytest.approx([40, 40, 60, 60, 0.9, 0])
+    assert detections[1, 5] == 1
+
+
+def test_export_onnx_is_cached_by_weights_and_size(tmp_path: Path):
+    weights = tmp_path / "model.pt"
+    weights.write_bytes(b"weights-v1")
+    exported = tmp_path / "model.onnx"
+
+    def fake_export(**kwargs):
+        exported.write_bytes(b"onnx")
+        return str(exported)
+
+    with patch("ultralytics.YOLO") as MockYOLO:
+        MockYOLO.return_value.export.side_effect = fake_export
+        first = export_onnx(weights, 320, tmp_path / "exported")
+        again = export_onnx(weights, 320, tmp_path / "exported")
+
+    assert first == again == export_path(weights, 320, tmp_path / "exported")
+    assert first.read_bytes() == b"onnx"
+    assert MockYOLO.return_value.export.call_count == 1
+
+    assert export_path(weights, 640, tmp_path) != export_path(weights, 320, tmp_path)
+    weights.write_bytes(b"weights-v2")
+    assert export_path(weights, 320, tmp_path / "exported") != first
+
+
+def test_export_onnx_downloads_missing_release_weights(tmp_path: Path):
+    downloaded = tmp_path / "cache" / "yolov8n.pt"
+    downloaded.parent.mkdir()
+    downloaded.write_bytes(b"weights")
+    exported = tmp_path / "yolov8n.onnx"
+
+    def fake_export(**kwargs):
+        exported.write_bytes(b"onnx")
+        return str(exported)
+
+    with patch(
+        "ultralytics.utils.downloads.attempt_download_asset",
+        return_value=str(downloaded),
+    ) as download, patch("ultralytics.YOLO") as MockYOLO:
+        MockYOLO.return_value.export.side_effect = fake_export
+        target = export_onnx(Path("yolov8n.pt"), 320, tmp_path / "exported")
+
+    download.assert_called_once_with(Path("yolov8n.pt"))
+    MockYOLO.assert_called_once_with(str(downloaded))
+    assert target == export_path(downloaded, 320, tmp_path / "exported")
+    assert target.read_bytes() == b"onnx" and not exported.exists()
+
+
+def test_onnx_runner_predict_batch_maps_boxes_back(tmp_path: Path):
+    model_path = tmp_path / "model.onnx"
+    model_path.write_bytes(b"onnx")
+
+    ort = MagicMock()
+    ort.get_available_providers.return_value = ["CPUExecutionProvider"]
+    session = ort.InferenceSession.return_value
+    session.get_inputs.return_value = [MagicMock()]
+    session.get_inputs.return_value[0].name = "images"
+    session.get_modelmeta.return_value.custom_metadata_map = {"names": "{0: 'person'}"}
+
+    # One box centred on the letterboxed content of each 64x32 frame
+    head = np.zeros((5, 3), dtype=np.float32)
+    head[:, 0] = [32, 32, 64, 32, 0.9]
+    session.run.side_effect = lambda _, feeds: [np.stack([head] * len(feeds["images"]))]
+
+    with patch.dict(sys.modules, {"onnxruntime": ort}):
+        runner = ONNXRunner(str(model_path), input_size=64)
+    frames = [np.zeros((32, 64, 3), dtype=np.uint8)] * 3
+    results = runner.predict_batch(frames, batch_size=2)
+
+    assert [call.args[1]["images"].shape for call in session.run.call_args_list] == [
+        (2, 3, 64, 64),
+        (1, 3, 64, 64),
+    ]
+    assert runner.class_names == {0: "person"}
+    box = results[2].boxes[0]
+    assert (results[2].width, results[2].height) == (64, 32)
+    assert (box["x1"], box["y1"], box["x2"], box["y2"]) == (0, 0, 64, 32)
+    assert box["label"] == "person"
+    assert box["conf"] == pytest.approx(0.9)
@@ -0,0 +1,92 @@
+import cv2
+import numpy as np
+import pytest
+from pathlib import Path
+from pipeline.models.base import DetectionResult
+from pipeline.models.factory import build_model_runner
+from pipeline.models.quantize import (
+    CalibrationReader,
+    compare_runners,
+    match_detections,
+    quantize_onnx,
+    quantized_path,
+    sample_frames,
+)
+
+
+def box(x1, y1, x2, y2, label="person", conf=0.9):
+    return {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "conf": conf, "label": label}
+
+
+class FixedRunner:
+    def __init__(self, results):
+        self.results = results
+
+    def predict_batch(self, images, batch_size=8):
+        return self.results[: len(images)]
+
+
+def test_sample_frames_spreads_picks():
+    frames = [Path(f"frame_{i}.jpg") for i in range(10)]
+    assert sample_frames(frames, 3) == [frames[0], frames[4], frames[9]]
+    assert sample_frames(frames[:2], 3) == frames[:2]
+
+
+def test_match_detections_requires_label_and_overlap():
+    reference = DetectionResult([box(0, 0, 10, 10), box(20, 20, 30, 30)], 64, 64)
+    candidate = DetectionResult(
+        [box(1, 0, 11, 10), box(20, 20, 30, 30, label="car"), box(40, 40, 50, 50)],
+        64,
+        64,
+    )
+
+    matched, ious = match_detections(reference, candidate)
+
+    assert matched == 1
+    assert ious[0] == pytest.approx(90 / 110)
+
+
+def test_compare_runners_reports_agreement():
+    reference = FixedRunner(
+        [DetectionResult([box(0, 0, 10, 10), box(20, 20, 30, 30)], 64, 64)]
+    )
+    candidate = FixedRunner([DetectionResult([box(0, 0, 10, 10)], 64, 64)])
+
+    report = compare_runners(reference, candidate, [Path("a.jpg")])
+
+    assert (report["fp32_boxes"], report["int8_boxes"]) == (2, 1)
+    assert report["precision"] == 1.0
+    assert report["recall"] == 0.5
+    assert report["f1"] == pytest.approx(2 / 3)
+    assert report["mean_iou"] == 1.0
+
+
+def test_quantize_onnx_reuses_cache_and_needs_frames_for_static(tmp_path: Path):
+    fp32 = tmp_path / "model-abc-640.onnx"
+    fp32.write_bytes(b"onnx")
+    cached = quantized_path(fp32, "dynamic")
+    cached.write_bytes(b"int8")
+
+    assert quantize_onnx(fp32, "dynamic") == cached
+    with pytest.raises(ValueError, match="calibration frames"):
+        quantize_onnx(fp32, "static")
+    with pytest.raises(ValueError, match="quantize"):
+        quantize_onnx(fp32, "int4")
+
+
+def test_calibration_reader_yields_model_inputs(tmp_path: Path):
+    frame = tmp_path / "frame_000001.jpg"
+    cv2.imwrite(str(frame), np.zeros((32, 64, 3), dtype=np.uint8))
+
+    reader = CalibrationReader([frame], "images", input_size=64)
+
+    feed = reader.get_next()
+    assert feed is not None
+    assert feed["images"].shape == (1, 3, 64, 64)
+    assert feed["images"].dtype == np.float32
+    assert reader.get_next() is None
+
+
+def test_quantize_requires_onnx_backend():
+    with pytest.raises(ValueError, match="backend"):
+        build_model_runner({"backend": "torch", "quantize": "dynamic"})
@@ -1,3 +1,5 @@
+from pathlib import Path
+import numpy as np
 from unittest.mock import MagicMock, patch
 from pipeline.models.yolo import YOLOv8Runner
 
@@ -7,9 +9,9 @@ def test_yolov8runner_predict_mock(tmp_path):
     image_path.write_text("fake-image-content")  # Placeholder content
 
     mock_result = MagicMock()
-    mock_result.boxes.data.tolist.return_value = [
-        [10, 20, 50, 60, 0.9, 0],  # x1, y1, x2, y2, conf, cls_id
-    ]
+    mock_result.boxes.data.cpu.return_value.numpy.return_value = np.array(
+        [[10, 20, 50, 60, 0.9, 0]]  # x1, y1, x2, y2, conf, cls_id
+    )
     mock_result.orig_shape = (240, 320)
 
     with patch("pipeline.models.yolo.YOLO") as MockYOLO:
@@ -37,3 +39,69 @@ def test_class_names_property():
 
         runner = YOLOv8Runner("fake-path.pt")
         assert runner.class_names == {0: "person", 1: "car"}
+
+
+def test_yolov8runner_predict_batch_splits_sources(tmp_path):
+    paths = [tmp_path / f"frame_{i}.jpg" for i in range(5)]
+
+    def make_result(i):
+        result = MagicMock()
+        result.boxes.data.cpu.return_value.numpy.return_value = np.array(
+            [[0, 0, 10, 10, 0.5 + i / 10, 0]]
+        )
+        result.orig_shape = (240, 320)
+        return result
+
+    with patch("pipeline.models.yolo.YOLO") as MockYOLO:
+        mock_model_instance = MagicMock()
+        mock_model_instance.names = {0: "person"}
+        mock_model_instance.side_effect = lambda sources, conf, verbose: [
+            make_result(int(Path(s).stem.split("_")[1])) for s in sources
+        ]
+        MockYOLO.return_value = mock_model_instance
+
+        runner = YOLOv8Runner("fake_model.pt", min_confidence=0.05)
+        results = runner.predict_batch(paths, batch_size=2)
+
+        calls = mock_model_instance.call_args_list
+        assert [len(c.args[0]) for c in calls] == [2, 2, 1]
+        assert all(c.kwargs["conf"] == 0.05 for c in calls)
+        assert calls[0].args[0] == [str(paths[0]), str(paths[1])]
+        assert [r.boxes[0]["conf"] for r in results] == [0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+def test_yolov8runner_converts_rgb_frames_to_bgr():
+    frame = np.zeros((24, 32, 3), dtype=np.uint8)
+    frame[..., 0] = 255  # red in RGB order
+
+    mock_result = MagicMock()
+    mock_result.boxes.data.cpu.return_value.numpy.return_value = np.empty((0, 6))
+    mock_result.orig_shape = (24, 32)
+
+    with patch("pipeline.models.yolo.YOLO") as MockYOLO:
+        mock_model_instance = MagicMock(return_value=[mock_result])
+        MockYOLO.return_value = mock_model_instance
+
+        runner = YOLOv8Runner("fake_model.pt", channel_order="rgb")
+        runner.predict(frame)
+
+        source = mock_model_instance.call_args.args[0]
+        assert source[0, 0].tolist() == [0, 0, 255]
+        assert frame[0, 0].tolist() == [255, 0, 0]
+
+
+def test_yolov8runner_cache_key_follows_weights(tmp_path):
+    weights = tmp_path / "weights.pt"
+    weights.write_bytes(b"v1")
+
+    with patch("pipeline.models.yolo.YOLO") as MockYOLO:
+        MockYOLO.return_value.ckpt_path = str(weights)
+        runner = YOLOv8Runner(str(weights))
+        first = runner.cache_key
+        weights.write_bytes(b"v2")
+
+        assert first.startswith("yolov8:")
+        assert runner.cache_key != first
+
+        MockYOLO.return_value.ckpt_path = None
+        assert YOLOv8Runner("missing.pt").cache_key is None
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from pipeline.utils.image import downscale, letterbox, parse_resolution
+
+
+def test_downscale_max_side_keeps_aspect_ratio():
+    image = np.zeros((2160, 3840, 3), dtype=np.uint8)
+    assert downscale(image, max_side=640).shape == (360, 640, 3)
+    assert downscale(image, size=(320, 240)).shape == (240, 320, 3)
+
+
+def test_downscale_never_upscales():
+    image = np.zeros((100, 200), dtype=np.uint8)
+    assert downscale(image, max_side=640) is image
+    assert downscale(image, size=(400, 200)) is image
+
+
+def test_parse_resolution():
+    assert parse_resolution("1280x720") == (1280, 720)
+    assert parse_resolution(None) is None
+    with pytest.raises(ValueError):
+        parse_resolution("wide")
+
+
+def test_letterbox_pads_to_square():
+    image = np.full((100, 200, 3), 255, dtype=np.uint8)
+    boxed, scale, pad = letterbox(image, 64)
+
+    assert boxed.shape == (64, 64, 3)
+    assert scale == 0.32
+    assert pad == (0, 16)
+    assert (boxed[16:48] == 255).all()
+    assert (boxed[:16] == 114).all() and (boxed[48:] == 114).all()
@@ -1,4 +1,14 @@
-from pipeline.utils.paths import list_images, ensure_dir, ensure_parent_dir
+import os
+import pytest
+from pipeline.utils.paths import (
+    ensure_dir,
+    ensure_parent_dir,
+    link_or_copy,
+    list_frames,
+    list_images,
+    transfer_file,
+    write_selection,
+)
 
 
 def test_list_images(tmp_path):
@@ -42,3 +52,52 @@ def test_ensure_parent_dir(tmp_path):
     result = ensure_parent_dir(file_path)
     assert file_path.parent.exists()
     assert result == file_path
+
+
+def test_link_or_copy_hardlinks(tmp_path):
+    src = tmp_path / "a.jpg"
+    src.write_text("frame")
+    dest = tmp_path / "out.jpg"
+    dest.write_text("stale")
+
+    link_or_copy(src, dest)
+    assert os.path.samefile(src, dest)
+
+    link_or_copy(src, src)
+    assert src.read_text() == "frame"
+
+
+def test_link_or_copy_falls_back_to_copy(tmp_path, monkeypatch):
+    def no_links(*args):
+        raise OSError("cross-device link")
+
+    monkeypatch.setattr(os, "link", no_links)
+    src = tmp_path / "a.jpg"
+    src.write_text("frame")
+    dest = tmp_path / "out.jpg"
+
+    link_or_copy(src, dest)
+    assert dest.read_text() == "frame"
+    assert not os.path.samefile(src, dest)
+
+
+def test_transfer_file_modes(tmp_path):
+    src = tmp_path / "a.jpg"
+    src.write_text("frame")
+    out = ensure_dir(tmp_path / "out")
+
+    assert transfer_file(src, out, "manifest") == src
+    assert not (out / "a.jpg").exists()
+    assert transfer_file(src, out, "copy") == out / "a.jpg"
+    with pytest.raises(ValueError):
+        transfer_file(src, out, "move")
+
+
+def test_selection_manifest_round_trip(tmp_path):
+    frames = [tmp_path / "b.jpg", tmp_path / "a.jpg"]
+    for f in frames:
+        f.write_text("x")
+    manifest = write_selection(frames, tmp_path / "selected.txt")
+
+    assert list_frames(manifest) == sorted(frames)
+    assert list_frames(tmp_path) == sorted(frames)
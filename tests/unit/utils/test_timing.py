@@ -0,0 +1,19 @@
+from pipeline.utils.timing import StepMetrics, timed_step
+
+
+def test_timed_step_merges_step_metrics():
+    @timed_step("step", flat=True)
+    def single():
+        return 3, StepMetrics(decode=0.5)
+
+    @timed_step("step", flat=True)
+    def pair():
+        return 1, 2, StepMetrics(decode=0.25)
+
+    count, timing = single()
+    assert count == 3
+    assert timing["decode"] == 0.5 and "step" in timing
+
+    a, b, timing = pair()
+    assert (a, b) == (1, 2)
+    assert timing["decode"] == 0.25